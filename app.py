@@ -6,31 +6,22 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.data.loaders import load_all_data
+from src.data.loaders import load_all_data, current_data_version
 from src.components.module_cards import render_module_card
 from src.utils.constants import TEXTS, DESCRIPTIONS, COLORS
+from src.utils.bootstrap import iniciar_pagina
 
-st.set_page_config(
-    page_title="CapacitIA - Plataforma Unificada",
-    page_icon="🚀",
-    layout="wide",
+# Home não tem gráficos: sem tema Plotly (e sem importar o Plotly)
+iniciar_pagina(
+    "CapacitIA - Plataforma Unificada", "🚀",
+    css=("main.css", "home.css"),
     initial_sidebar_state="expanded",   # ← sidebar aberta para o usuário ver as páginas
+    tema=False,
 )
 
-with open("styles/main.css", "r", encoding="utf-8") as f:
-    css_content = f.read()
-
-try:
-    with open("styles/home.css", "r", encoding="utf-8") as f:
-        home_css = f.read()
-except FileNotFoundError:
-    home_css = ""
-
-st.markdown(f"<style>{css_content}{home_css}</style>", unsafe_allow_html=True)
-
 
 @st.cache_data(show_spinner=False)
-def get_module_kpis():
+def get_module_kpis(data_version=None):
     all_data = load_all_data()
 
     kpis = {
@@ -87,7 +78,7 @@ def main():
     st.markdown("<br>", unsafe_allow_html=True)
 
     with st.spinner("Carregando dados..."):
-        kpis = get_module_kpis()
+        kpis = get_module_kpis(current_data_version())
 
     # ── Cards dos 3 módulos ───────────────────────────────────────────────
     col1, col2, col3 = st.columns(3)
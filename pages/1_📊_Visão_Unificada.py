@@ -8,31 +8,25 @@ import sys
 # Adicionar o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data.loaders import load_all_data
+from src.data.loaders import load_participacoes
 from src.components.kpi_cards import render_kpi_card
 from src.utils.constants import COLORS
+from src.utils.bootstrap import iniciar_pagina
 
 # =========================
-# CONFIG & THEME
+# CONFIG, THEME & CSS
 # =========================
-st.set_page_config(
-    page_title="Visão Unificada - CapacitIA",
-    page_icon="📊",
-    layout="wide",
-    initial_sidebar_state="collapsed",
-)
-
-# =========================
-# CSS GLOBAL
-# =========================
-with open("styles/main.css", "r", encoding="utf-8") as f:
-    css_content = f.read()
-st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
+iniciar_pagina("Visão Unificada - CapacitIA", "📊", tema=False)
 
 # =========================
 # CARREGAR DADOS
 # =========================
-all_data = load_all_data()
+# Tabela fato única: uma linha por participação, com 'modulo' e 'ano' tipados
+df_part = load_participacoes()
+
+if df_part is None:
+    st.error("Erro ao carregar dados. Execute `python src/process_all.py` para gerar participacoes.parquet.")
+    st.stop()
 
 # =========================
 # HEADER
@@ -42,10 +36,7 @@ st.markdown("Análise consolidada de todos os módulos do CapacitIA")
 
 
 # ── Filtro de Ano ────────────────────────────────────────────
-_df_srv_vu = all_data['servidores']['dados']
-_anos_vu: list = []
-if _df_srv_vu is not None and 'ano' in _df_srv_vu.columns:
-    _anos_vu = sorted(_df_srv_vu['ano'].dropna().unique().tolist())
+_anos_vu = sorted(int(a) for a in df_part['ano'].dropna().unique())
 
 if _anos_vu:
     _ano_opts_vu = ["Todos os Anos"] + _anos_vu
@@ -56,9 +47,8 @@ if _anos_vu:
         key="filtro_ano_vu",
         help="Filtra os KPIs consolidados pelo ano selecionado.",
     )
-    if ano_vu != "Todos os Anos" and _df_srv_vu is not None:
-        _df_srv_vu = _df_srv_vu[_df_srv_vu['ano'].astype(str) == str(ano_vu)]
-        all_data['servidores']['dados'] = _df_srv_vu
+    if ano_vu != "Todos os Anos":
+        df_part = df_part[df_part['ano'] == int(ano_vu)]
 else:
     ano_vu = "Todos os Anos"
 
@@ -67,27 +57,22 @@ else:
 # =========================
 st.markdown("## 📈 Indicadores Principais")
 
-# Calcular totais
-total_participantes = (
-    (len(all_data['servidores']['dados']) if all_data['servidores']['dados'] is not None else 0) +
-    (len(all_data['saude']['dados']) if all_data['saude']['dados'] is not None else 0) +
-    (len(all_data['autonomia_digital']['inscricoes']) if all_data['autonomia_digital']['inscricoes'] is not None else 0)
+# Um groupby por módulo alimenta todos os KPIs
+resumo_modulos = df_part.groupby('modulo', observed=False).agg(
+    participantes=('modulo', 'size'),
+    eventos=('evento', 'nunique'),
+    certificados=('certificado', 'sum'),
+    orgaos=('orgao', 'nunique'),
 )
 
-total_eventos_servidores = len(all_data['servidores']['visao']) - 1 if all_data['servidores']['visao'] is not None else 0
-total_lotes_saude = all_data['saude']['dados']['lote'].nunique() if all_data['saude']['dados'] is not None and 'lote' in all_data['saude']['dados'].columns else 0
-total_avaliacoes = len(all_data['autonomia_digital']['avaliacoes']) if all_data['autonomia_digital']['avaliacoes'] is not None else 0
-total_eventos = total_eventos_servidores + total_lotes_saude + total_avaliacoes
-
-secretarias_count = len(all_data['servidores']['secretarias']) if all_data['servidores']['secretarias'] is not None else 0
+total_participantes = int(resumo_modulos['participantes'].sum())
+# eventos (Servidores) + lotes (Saúde) + projetos (Autonomia Digital)
+total_eventos = int(resumo_modulos['eventos'].sum())
+secretarias_count = int(resumo_modulos.loc['servidores', 'orgaos'])
 
 # Taxa de certificação (apenas servidores)
-if all_data['servidores']['dados'] is not None:
-    df_dados = all_data['servidores']['dados']
-    certificados = (df_dados['certificado'] == 'Sim').sum() if 'certificado' in df_dados.columns else 0
-    taxa = (certificados / len(df_dados) * 100) if len(df_dados) > 0 else 0
-else:
-    taxa = 0
+_srv = resumo_modulos.loc['servidores']
+taxa = (_srv['certificados'] / _srv['participantes'] * 100) if _srv['participantes'] > 0 else 0
 
 col1, col2, col3, col4 = st.columns(4)
 
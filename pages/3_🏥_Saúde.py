@@ -4,7 +4,6 @@ import streamlit as st
 from pathlib import Path
 import pandas as pd
 import plotly.express as px
-import plotly.io as pio
 import sys
 from datetime import datetime
 
@@ -13,36 +12,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data.loaders import load_saude_data
 from src.utils.constants import DESCRIPTIONS, COLORS
+from src.utils.bootstrap import iniciar_pagina
+from src.utils.fig_cache import figura
 
 # =========================
-# CONFIG & THEME
+# CONFIG, THEME & CSS
 # =========================
-st.set_page_config(
-    page_title="CapacitIA Saúde",
-    page_icon="🏥",
-    layout="wide",
-    initial_sidebar_state="collapsed",
-)
-
-# Plotly theme
-pio.templates["capacit_dark"] = pio.templates["plotly_dark"]
-pio.templates["capacit_dark"].layout.font.family = "Inter, Segoe UI, Roboto, Arial"
-pio.templates["capacit_dark"].layout.colorway = [
-    "#7DD3FC", "#34D399", "#FBBF24", "#F472B6", "#60A5FA", "#A78BFA", "#F87171"
-]
-pio.templates["capacit_dark"].layout.paper_bgcolor = "#0f1220"
-pio.templates["capacit_dark"].layout.plot_bgcolor = "#11142a"
-pio.templates["capacit_dark"].layout.hoverlabel = dict(
-    bgcolor="#0f1220", font_size=12, font_family="Inter, Segoe UI, Roboto, Arial"
-)
-pio.templates.default = "capacit_dark"
-
-# =========================
-# CSS GLOBAL
-# =========================
-with open("styles/main.css", "r", encoding="utf-8") as f:
-    css_content = f.read()
-st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
+iniciar_pagina("CapacitIA Saúde", "🏥")
 
 # =========================
 # CARREGAR DADOS
@@ -54,7 +30,7 @@ if df_saude is None:
     st.stop()
 
 # Anos disponíveis
-_anos_saude = sorted(df_saude['ano'].dropna().unique().tolist()) if 'ano' in df_saude.columns else []
+_anos_saude = sorted(int(a) for a in df_saude['ano'].dropna().unique()) if 'ano' in df_saude.columns else []
 
 # =========================
 # HEADER
@@ -140,16 +116,19 @@ with col_f2:
         data_selecionada = "Todas"
 
 # Aplicar filtros
-df_saude_filtrado = df_saude.copy()
+df_saude_filtrado = df_saude
 if ano_selecionado_saude != "Todos os Anos" and 'ano' in df_saude_filtrado.columns:
     df_saude_filtrado = df_saude_filtrado[
-        df_saude_filtrado['ano'].astype(str) == str(ano_selecionado_saude)
+        df_saude_filtrado['ano'] == int(ano_selecionado_saude)
     ]
 if lote_selecionado != "Todos" and 'lote' in df_saude_filtrado.columns:
     df_saude_filtrado = df_saude_filtrado[df_saude_filtrado['lote'] == lote_selecionado]
 if data_selecionada != "Todas" and 'data' in df_saude_filtrado.columns:
     df_saude_filtrado = df_saude_filtrado[df_saude_filtrado['data'] == data_selecionada]
 
+# Chave do cache de figuras: tudo o que muda os gráficos além dos dados
+FILTROS_FIG = (ano_selecionado_saude, lote_selecionado, data_selecionada)
+
 st.markdown('<div class="sep"></div>', unsafe_allow_html=True)
 
 # =========================
@@ -168,22 +147,24 @@ with tab1:
             participantes_por_lote = participantes_por_lote.sort_values('Total', ascending=True)
             
             if not participantes_por_lote.empty:
-                fig = px.bar(
-                    participantes_por_lote, 
-                    x='Total', 
-                    y='lote', 
-                    orientation='h',
-                    title=None,
-                    text='Total'
-                )
-                fig.update_traces(texttemplate='%{text}', textposition='outside', cliponaxis=False)
-                fig.update_layout(
-                    height=400,
-                    margin=dict(l=10, r=10, t=10, b=10),
-                    xaxis_title=None,
-                    yaxis_title=None
-                )
-                st.plotly_chart(fig, use_container_width=True, key="saude_lote_bar")
+                def _fig():
+                    fig = px.bar(
+                        participantes_por_lote, 
+                        x='Total', 
+                        y='lote', 
+                        orientation='h',
+                        title=None,
+                        text='Total'
+                    )
+                    fig.update_traces(texttemplate='%{text}', textposition='outside', cliponaxis=False)
+                    fig.update_layout(
+                        height=400,
+                        margin=dict(l=10, r=10, t=10, b=10),
+                        xaxis_title=None,
+                        yaxis_title=None
+                    )
+                    return fig
+                st.plotly_chart(figura("saude_lote_bar", FILTROS_FIG, _fig), use_container_width=True, key="saude_lote_bar")
             else:
                 st.info("Sem dados para plotar.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -194,19 +175,21 @@ with tab1:
             distribuicao_lote = df_saude_filtrado['lote'].value_counts()
             
             if not distribuicao_lote.empty:
-                fig_pie = px.pie(
-                    values=distribuicao_lote.values,
-                    names=distribuicao_lote.index,
-                    hole=0.55,
-                    title=None
-                )
-                fig_pie.update_traces(textinfo='percent+label', textposition='inside')
-                fig_pie.update_layout(
-                    height=400,
-                    margin=dict(l=10, r=10, t=10, b=10),
-                    legend=dict(orientation="v", y=0.5, yanchor="middle", x=1.02)
-                )
-                st.plotly_chart(fig_pie, use_container_width=True, key="saude_lote_pie")
+                def _fig_pie():
+                    fig_pie = px.pie(
+                        values=distribuicao_lote.values,
+                        names=distribuicao_lote.index,
+                        hole=0.55,
+                        title=None
+                    )
+                    fig_pie.update_traces(textinfo='percent+label', textposition='inside')
+                    fig_pie.update_layout(
+                        height=400,
+                        margin=dict(l=10, r=10, t=10, b=10),
+                        legend=dict(orientation="v", y=0.5, yanchor="middle", x=1.02)
+                    )
+                    return fig_pie
+                st.plotly_chart(figura("saude_lote_pie", FILTROS_FIG, _fig_pie), use_container_width=True, key="saude_lote_pie")
             else:
                 st.info("Sem dados para plotar.")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -220,29 +203,31 @@ with tab1:
         
         if not timeline.empty:
             # Criar gráfico de barras agrupadas em vez de scatter (melhor para texto)
-            fig_timeline = px.bar(
-                timeline,
-                x='data',
-                y='Participantes',
-                color='lote',
-                title=None,
-                barmode='group',
-                text='Participantes'
-            )
-            fig_timeline.update_traces(texttemplate='%{text}', textposition='outside', cliponaxis=False)
-            fig_timeline.update_layout(
-                height=400,
-                margin=dict(l=10, r=10, t=10, b=10),
-                xaxis_title="Período de Capacitação",
-                yaxis_title="Participantes",
-                xaxis=dict(type='category'),  # Tratar como categoria, não data
-                plot_bgcolor='#11142a',
-                paper_bgcolor='#0f1220',
-                font_color='#e6e7ee'
-            )
-            # Rotacionar labels do eixo X para melhor leitura
-            fig_timeline.update_xaxes(tickangle=-45)
-            st.plotly_chart(fig_timeline, use_container_width=True, key="saude_timeline")
+            def _fig_timeline():
+                fig_timeline = px.bar(
+                    timeline,
+                    x='data',
+                    y='Participantes',
+                    color='lote',
+                    title=None,
+                    barmode='group',
+                    text='Participantes'
+                )
+                fig_timeline.update_traces(texttemplate='%{text}', textposition='outside', cliponaxis=False)
+                fig_timeline.update_layout(
+                    height=400,
+                    margin=dict(l=10, r=10, t=10, b=10),
+                    xaxis_title="Período de Capacitação",
+                    yaxis_title="Participantes",
+                    xaxis=dict(type='category'),  # Tratar como categoria, não data
+                    plot_bgcolor='#11142a',
+                    paper_bgcolor='#0f1220',
+                    font_color='#e6e7ee'
+                )
+                # Rotacionar labels do eixo X para melhor leitura
+                fig_timeline.update_xaxes(tickangle=-45)
+                return fig_timeline
+            st.plotly_chart(figura("saude_timeline", FILTROS_FIG, _fig_timeline), use_container_width=True, key="saude_timeline")
         else:
             st.info("Sem dados para visualização.")
     st.markdown('</div>', unsafe_allow_html=True)
@@ -283,20 +268,22 @@ with tab3:
             evolucao = evolucao.sort_values('data')
             
             if not evolucao.empty:
-                fig_evol = px.line(
-                    evolucao,
-                    x='data',
-                    y='Participantes',
-                    title="Evolução de Participantes ao Longo do Tempo",
-                    markers=True
-                )
-                fig_evol.update_layout(
-                    height=400,
-                    margin=dict(l=10, r=10, t=50, b=10),
-                    xaxis_title="Data",
-                    yaxis_title="Participantes"
-                )
-                st.plotly_chart(fig_evol, use_container_width=True, key="saude_evolucao")
+                def _fig_evol():
+                    fig_evol = px.line(
+                        evolucao,
+                        x='data',
+                        y='Participantes',
+                        title="Evolução de Participantes ao Longo do Tempo",
+                        markers=True
+                    )
+                    fig_evol.update_layout(
+                        height=400,
+                        margin=dict(l=10, r=10, t=50, b=10),
+                        xaxis_title="Data",
+                        yaxis_title="Participantes"
+                    )
+                    return fig_evol
+                st.plotly_chart(figura("saude_evolucao", FILTROS_FIG, _fig_evol), use_container_width=True, key="saude_evolucao")
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -307,19 +294,21 @@ with tab3:
         comparativo = comparativo.sort_values('Total', ascending=False)
         
         if not comparativo.empty:
-            fig_comp = px.bar(
-                comparativo,
-                x='lote',
-                y='Total',
-                title="Comparativo entre Lotes",
-                text='Total'
-            )
-            fig_comp.update_traces(texttemplate='%{text}', textposition='outside', cliponaxis=False)
-            fig_comp.update_layout(
-                height=400,
-                margin=dict(l=10, r=10, t=50, b=10),
-                xaxis_title="Lote",
-                yaxis_title="Total de Participantes"
-            )
-            st.plotly_chart(fig_comp, use_container_width=True, key="saude_comparativo")
+            def _fig_comp():
+                fig_comp = px.bar(
+                    comparativo,
+                    x='lote',
+                    y='Total',
+                    title="Comparativo entre Lotes",
+                    text='Total'
+                )
+                fig_comp.update_traces(texttemplate='%{text}', textposition='outside', cliponaxis=False)
+                fig_comp.update_layout(
+                    height=400,
+                    margin=dict(l=10, r=10, t=50, b=10),
+                    xaxis_title="Lote",
+                    yaxis_title="Total de Participantes"
+                )
+                return fig_comp
+            st.plotly_chart(figura("saude_comparativo", FILTROS_FIG, _fig_comp), use_container_width=True, key="saude_comparativo")
     st.markdown('</div>', unsafe_allow_html=True)
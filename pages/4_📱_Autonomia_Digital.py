@@ -4,76 +4,81 @@ import streamlit as st
 from pathlib import Path
 import pandas as pd
 import plotly.express as px
-import plotly.io as pio
 import numpy as np
 import sys
 from datetime import datetime
-import re
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 import io
+import re
 
 # Adicionar o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data.loaders import load_autonomia_digital_data
-from src.utils.constants import DESCRIPTIONS, COLORS
-
-# =========================
-# CONFIG & THEME
-# =========================
-st.set_page_config(
-    page_title="CapacitIA Autonomia Digital",
-    page_icon="📱",
-    layout="wide",
-    initial_sidebar_state="collapsed",
-)
-
-# Plotly theme
-pio.templates["capacit_dark"] = pio.templates["plotly_dark"]
-pio.templates["capacit_dark"].layout.font.family = "Inter, Segoe UI, Roboto, Arial"
-pio.templates["capacit_dark"].layout.colorway = [
-    "#7DD3FC", "#34D399", "#FBBF24", "#F472B6", "#60A5FA", "#A78BFA", "#F87171"
-]
-pio.templates["capacit_dark"].layout.paper_bgcolor = "#0f1220"
-pio.templates["capacit_dark"].layout.plot_bgcolor = "#11142a"
-pio.templates["capacit_dark"].layout.hoverlabel = dict(
-    bgcolor="#0f1220", font_size=12, font_family="Inter, Segoe UI, Roboto, Arial"
+from src.data.loaders import (
+    load_autonomia_digital_data, load_autonomia_vinculo, load_column_roles, load_dataset, load_pesquisa_cruzamentos,
 )
-pio.templates.default = "capacit_dark"
+from src.data.pesquisa import cruzamento, por_recorte
+from src.utils.helpers import FAIXAS_ETARIAS
+from src.utils.constants import DESCRIPTIONS, COLORS
+from src.utils.bootstrap import iniciar_pagina
 
 # =========================
-# CSS GLOBAL
+# CONFIG, THEME & CSS
 # =========================
-with open("styles/main.css", "r", encoding="utf-8") as f:
-    css_content = f.read()
-st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
+iniciar_pagina("CapacitIA Autonomia Digital", "📱")
 
 # =========================
 # CARREGAR DADOS
 # =========================
-df_inscricoes, df_avaliacoes = load_autonomia_digital_data()
+# Papéis → colunas (schema_manifest.json gerado no processamento)
+roles_insc = load_column_roles("autonomiadigital_inscricoes")
+roles_aval = load_column_roles("autonomiadigital_avaliacoes")
+
+# Só as colunas usadas pelas abas; textos livres (sugestões, aprendizados
+# extras) são lidos à parte, por load_dataset, onde as nuvens/treemaps os usam
+_ROLES_TEXTO_LIVRE = ("sugestao", "extras")
+_cols_insc = list(roles_insc.values()) or None
+_cols_aval = [c for r, c in roles_aval.items() if r not in _ROLES_TEXTO_LIVRE] or None
+df_inscricoes, df_avaliacoes = load_autonomia_digital_data(_cols_insc, _cols_aval)
 
 if df_inscricoes is None or df_avaliacoes is None:
     st.error("Erro ao carregar dados. Verifique se os arquivos Parquet foram gerados.")
     st.stop()
 
-# Anos disponíveis
-_data_col_ano = next(
-    (c for c in df_inscricoes.columns if 'data' in c.lower() or 'carimbo' in c.lower()),
-    None,
-)
-_anos_ad: list = []
-if 'ano' in df_inscricoes.columns:
-    _anos_ad = sorted(df_inscricoes['ano'].dropna().unique().tolist())
-elif _data_col_ano:
-    try:
-        _anos_ad = sorted(
-            pd.to_datetime(df_inscricoes[_data_col_ano], errors='coerce')
-            .dt.year.dropna().astype(int).unique().tolist()
-        )
-    except Exception:
-        _anos_ad = []
+# Inscrição → avaliação ligadas pelo cpf_id (None em snapshots antigos)
+df_vinculo = load_autonomia_vinculo()
+
+
+def _conta_sim(serie: pd.Series) -> int:
+    """Conta respostas afirmativas em colunas booleanas ou Sim/Não."""
+    if pd.api.types.is_bool_dtype(serie) or serie.dropna().isin([True, False]).all():
+        return int(serie.fillna(False).astype(bool).sum())
+    return int(serie.astype(str).str.contains('Sim', case=False, na=False).sum())
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def nuvem_de_palavras(frequencias: dict, colormap: str) -> bytes:
+    """PNG da nuvem de palavras (tema escuro); wordcloud só é importado aqui."""
+    from wordcloud import WordCloud
+
+    nuvem = WordCloud(
+        width=1200,
+        height=600,
+        background_color='#0f1220',
+        colormap=colormap,
+        max_words=100,
+        relative_scaling=0.5,
+        min_font_size=10,
+        max_font_size=80,
+        prefer_horizontal=0.7
+    ).generate_from_frequencies(frequencias)
+    buffer = io.BytesIO()
+    nuvem.to_image().save(buffer, format='png')
+    return buffer.getvalue()
+
+
+# Anos disponíveis (coluna 'ano' tipada, gerada no processamento)
+_ano_col = roles_insc.get('ano')
+_anos_ad: list = sorted(int(a) for a in df_inscricoes[_ano_col].dropna().unique()) if _ano_col else []
 
 # =========================
 # HEADER
@@ -101,28 +106,23 @@ col1, col2, col3, col4 = st.columns(4)
 
 total_inscritos = len(df_inscricoes)
 total_avaliacoes = len(df_avaliacoes)
-taxa_avaliacao = (total_avaliacoes / total_inscritos * 100) if total_inscritos > 0 else 0
+if df_vinculo is not None and df_vinculo["avaliou"].notna().any():
+    # Pessoas inscritas que avaliaram (um CPF conta uma vez)
+    _pessoas = df_vinculo.dropna(subset=["cpf_id"]).drop_duplicates("cpf_id")
+    taxa_avaliacao = float(_pessoas["avaliou"].mean()) * 100
+else:
+    taxa_avaliacao = (total_avaliacoes / total_inscritos * 100) if total_inscritos > 0 else 0
 
 # Calcular taxa de aposentados
-aposentados_col = [c for c in df_inscricoes.columns if 'aposentado' in c.lower()][0] if any('aposentado' in c.lower() for c in df_inscricoes.columns) else None
+aposentados_col = roles_insc.get('aposentado')
 perc_aposentados = 0
 if aposentados_col:
-    aposentados = df_inscricoes[aposentados_col].astype(str).str.contains('Sim', case=False, na=False).sum()
+    aposentados = _conta_sim(df_inscricoes[aposentados_col])
     perc_aposentados = (aposentados / total_inscritos * 100) if total_inscritos > 0 else 0
 
-# Calcular satisfação média
-avaliacao_col = [c for c in df_avaliacoes.columns if 'avaliacao_evento' in c.lower()][0] if any('avaliacao_evento' in c.lower() for c in df_avaliacoes.columns) else None
-satisfacao_media = 0
-if avaliacao_col:
-    try:
-        avaliacoes_numericas = pd.to_numeric(df_avaliacoes[avaliacao_col], errors='coerce')
-        satisfacao_media = avaliacoes_numericas.mean() if not avaliacoes_numericas.isna().all() else 0
-    except:
-        pass
-
 col1.markdown(f'<div class="kpi"><h4>Total de Inscritos</h4><div class="val">{total_inscritos:,}</div></div>', unsafe_allow_html=True)
 col2.markdown(f'<div class="kpi"><h4>Total de Avaliações</h4><div class="val">{total_avaliacoes:,}</div></div>', unsafe_allow_html=True)
-col3.markdown(f'<div class="kpi"><h4>Taxa de Avaliação</h4><div class="val">{taxa_avaliacao:.1f}%</div></div>', unsafe_allow_html=True)
+col3.markdown(f'<div class="kpi"><h4>Inscritos que Avaliaram</h4><div class="val">{taxa_avaliacao:.1f}%</div></div>', unsafe_allow_html=True)
 col4.markdown(f'<div class="kpi"><h4>Aposentados</h4><div class="val">{perc_aposentados:.0f}%</div></div>', unsafe_allow_html=True)
 
 st.markdown('<div class="sep"></div>', unsafe_allow_html=True)
@@ -144,7 +144,7 @@ with col_f0:
 
 with col_f1:
     # Filtro por projeto de extensão
-    projeto_col = [c for c in df_inscricoes.columns if 'projeto' in c.lower() and 'extensao' in c.lower()][0] if any('projeto' in c.lower() and 'extensao' in c.lower() for c in df_inscricoes.columns) else None
+    projeto_col = roles_insc.get('projeto')
     if projeto_col:
         projetos_disponiveis = ["Todos"] + sorted(df_inscricoes[projeto_col].dropna().unique().tolist())
         projeto_selecionado = st.selectbox(
@@ -158,7 +158,7 @@ with col_f1:
 
 with col_f2:
     # Filtro por período (baseado na data de inscrição)
-    data_col = [c for c in df_inscricoes.columns if 'data' in c.lower() or 'carimbo' in c.lower()][0] if any('data' in c.lower() or 'carimbo' in c.lower() for c in df_inscricoes.columns) else None
+    data_col = roles_insc.get('data')
     if data_col:
         # Extrair períodos únicos se possível
         periodo_selecionado = st.selectbox(
@@ -170,23 +170,17 @@ with col_f2:
     else:
         periodo_selecionado = "Todos"
 
+# Cruzamentos pré-calculados da pesquisa (item × gênero × faixa etária × ano)
+cruzamentos = load_pesquisa_cruzamentos()
+ano_pesquisa = None if ano_selecionado_ad == "Todos os Anos" else int(ano_selecionado_ad)
+pesquisa_geral = cruzamento(cruzamentos, ano=ano_pesquisa)
+
 # Aplicar filtros
-df_inscricoes_filtrado = df_inscricoes.copy()
-if ano_selecionado_ad != "Todos os Anos":
-    if 'ano' in df_inscricoes_filtrado.columns:
-        df_inscricoes_filtrado = df_inscricoes_filtrado[
-            df_inscricoes_filtrado['ano'].astype(str) == str(ano_selecionado_ad)
-        ]
-    elif _data_col_ano:
-        try:
-            _anos_series = pd.to_datetime(
-                df_inscricoes_filtrado[_data_col_ano], errors='coerce'
-            ).dt.year.astype('Int64').astype(str)
-            df_inscricoes_filtrado = df_inscricoes_filtrado[
-                _anos_series == str(ano_selecionado_ad)
-            ]
-        except Exception:
-            pass
+df_inscricoes_filtrado = df_inscricoes
+if ano_selecionado_ad != "Todos os Anos" and _ano_col:
+    df_inscricoes_filtrado = df_inscricoes_filtrado[
+        df_inscricoes_filtrado[_ano_col] == int(ano_selecionado_ad)
+    ]
 if projeto_selecionado != "Todos" and projeto_col:
     df_inscricoes_filtrado = df_inscricoes_filtrado[df_inscricoes_filtrado[projeto_col] == projeto_selecionado]
 
@@ -251,9 +245,54 @@ with tab1:
                 st.info("Sem dados para plotar.")
         st.markdown('</div>', unsafe_allow_html=True)
     
+    # Conclusão: inscrito → avaliou (junção pelo cpf_id, feita no processamento);
+    # uma linha por pessoa × projeto, então as taxas contam pessoas
+    if df_vinculo is not None:
+        vinc = df_vinculo[df_vinculo["avaliou"].notna()]
+        if ano_selecionado_ad != "Todos os Anos":
+            vinc = vinc[vinc["ano"] == int(ano_selecionado_ad)]
+        if projeto_selecionado != "Todos":
+            vinc = vinc[vinc["projeto_extensao"] == projeto_selecionado]
+
+        colC, colD = st.columns(2)
+        with colC:
+            st.markdown('<div class="panel"><h3>Conclusão por Projeto (% que avaliou)</h3>', unsafe_allow_html=True)
+            por_projeto = vinc.groupby("projeto_extensao")["avaliou"].agg(["mean", "size"])
+            por_projeto = por_projeto[por_projeto["size"] >= 5].sort_values("mean").tail(12)
+            if not por_projeto.empty:
+                por_projeto = por_projeto.assign(taxa=(por_projeto["mean"].astype(float) * 100).round(1)).reset_index()
+                fig_conc = px.bar(
+                    por_projeto, x="taxa", y="projeto_extensao", orientation="h",
+                    text="taxa", hover_data={"size": True},
+                    labels={"taxa": "Avaliaram (%)", "projeto_extensao": "Projeto", "size": "Pessoas"},
+                )
+                fig_conc.update_traces(texttemplate="%{x:.1f}%", textposition="outside", cliponaxis=False)
+                fig_conc.update_layout(height=400, margin=dict(l=10, r=10, t=10, b=10), xaxis_title=None, yaxis_title=None)
+                st.plotly_chart(fig_conc, use_container_width=True, key="autonomia_conclusao_projeto")
+            else:
+                st.info("Nenhum projeto com pelo menos 5 pessoas inscritas ligadas.")
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        with colD:
+            st.markdown('<div class="panel"><h3>Conclusão por Faixa Etária (% que avaliou)</h3>', unsafe_allow_html=True)
+            # Quem se inscreveu em dois projetos conta uma vez
+            por_faixa = vinc.drop_duplicates("cpf_id").groupby("faixa_etaria", observed=True)["avaliou"].agg(["mean", "size"])
+            if not por_faixa.empty:
+                por_faixa = por_faixa.assign(taxa=(por_faixa["mean"].astype(float) * 100).round(1)).reset_index()
+                fig_faixa = px.bar(
+                    por_faixa, x="faixa_etaria", y="taxa", text="taxa", hover_data={"size": True},
+                    labels={"taxa": "Avaliaram (%)", "faixa_etaria": "Faixa etária", "size": "Pessoas"},
+                )
+                fig_faixa.update_traces(texttemplate="%{y:.1f}%", textposition="outside", cliponaxis=False)
+                fig_faixa.update_layout(height=400, margin=dict(l=10, r=10, t=10, b=10), xaxis_title=None, yaxis_title=None)
+                st.plotly_chart(fig_faixa, use_container_width=True, key="autonomia_conclusao_faixa")
+            else:
+                st.info("Sem idades para agrupar.")
+            st.markdown('</div>', unsafe_allow_html=True)
+
     # Temas de maior dificuldade
     st.markdown('<div class="panel"><h3>Temas de Maior Dificuldade</h3>', unsafe_allow_html=True)
-    dificuldade_col = [c for c in df_inscricoes.columns if 'dificuldade' in c.lower()][0] if any('dificuldade' in c.lower() for c in df_inscricoes.columns) else None
+    dificuldade_col = roles_insc.get('dificuldade')
     if dificuldade_col:
         # Contar temas mencionados
         temas = df_inscricoes_filtrado[dificuldade_col].dropna().astype(str)
@@ -283,35 +322,8 @@ with tab1:
                     freq_dict = {str(k): int(v) for k, v in temas_contagem.items() if len(str(k)) > 2}
                 
                 if freq_dict:
-                    # Criar nuvem de palavras com tema escuro
-                    fig_wordcloud, ax = plt.subplots(figsize=(12, 6), facecolor='#0f1220')
-                    ax.set_facecolor('#0f1220')
-                    
-                    wordcloud = WordCloud(
-                        width=1200,
-                        height=600,
-                        background_color='#0f1220',
-                        colormap='viridis',  # Usar cores vibrantes
-                        max_words=100,
-                        relative_scaling=0.5,
-                        min_font_size=10,
-                        max_font_size=80,
-                        prefer_horizontal=0.7
-                    ).generate_from_frequencies(freq_dict)
-                    
-                    ax.imshow(wordcloud, interpolation='bilinear')
-                    ax.axis('off')
-                    
-                    # Ajustar cores do texto para tema escuro
-                    plt.tight_layout(pad=0)
-                    
-                    # Converter para imagem e exibir no Streamlit
-                    img_buffer = io.BytesIO()
-                    fig_wordcloud.savefig(img_buffer, format='png', facecolor='#0f1220', bbox_inches='tight', pad_inches=0)
-                    img_buffer.seek(0)
-                    
-                    st.image(img_buffer, use_container_width=True)
-                    plt.close(fig_wordcloud)
+                    # Nuvem de palavras com tema escuro ("viridis": cores vibrantes)
+                    st.image(nuvem_de_palavras(freq_dict, 'viridis'), use_container_width=True)
                     
                     # Também mostrar gráfico de barras com top temas
                     st.markdown("### Top 10 Temas Mais Mencionados")
@@ -353,10 +365,10 @@ with tab2:
         st.metric("Total de Inscritos", len(df_inscricoes_filtrado))
     with col_stat2:
         if aposentados_col:
-            aposentados_count = df_inscricoes_filtrado[aposentados_col].astype(str).str.contains('Sim', case=False, na=False).sum()
+            aposentados_count = _conta_sim(df_inscricoes_filtrado[aposentados_col])
             st.metric("Aposentados", aposentados_count)
     with col_stat3:
-        lgpd_col = [c for c in df_inscricoes.columns if 'autorizo' in c.lower() or 'lgpd' in c.lower()][0] if any('autorizo' in c.lower() or 'lgpd' in c.lower() for c in df_inscricoes.columns) else None
+        lgpd_col = roles_insc.get('lgpd')
         if lgpd_col:
             autorizacoes = df_inscricoes_filtrado[lgpd_col].astype(str).str.contains('Confirmo', case=False, na=False).sum()
             st.metric("Autorizações LGPD", autorizacoes)
@@ -380,54 +392,70 @@ with tab2:
 with tab3:
     st.markdown('<div class="panel"><h3>Análise de Avaliações</h3>', unsafe_allow_html=True)
     
-    # Satisfação geral
-    if avaliacao_col:
-        avaliacoes_numericas = pd.to_numeric(df_avaliacoes[avaliacao_col], errors='coerce')
-        if not avaliacoes_numericas.isna().all():
-            col_aval1, col_aval2, col_aval3 = st.columns(3)
-            with col_aval1:
-                st.metric("Satisfação Média", f"{avaliacoes_numericas.mean():.1f}/5")
-            with col_aval2:
-                st.metric("Avaliações Positivas (4-5)", f"{(avaliacoes_numericas >= 4).sum()}")
-            with col_aval3:
-                st.metric("Total de Avaliações", len(df_avaliacoes))
-            
-            # Distribuição de avaliações
-            fig_dist = px.histogram(
-                avaliacoes_numericas.dropna(),
-                nbins=5,
-                title="Distribuição de Avaliações",
-                labels={'value': 'Nota', 'count': 'Quantidade'}
-            )
-            fig_dist.update_layout(
-                height=400,
-                margin=dict(l=10, r=10, t=50, b=10)
-            )
-            st.plotly_chart(fig_dist, use_container_width=True, key="autonomia_avaliacao_dist")
-    
-    # Avaliações por dimensão
+    # Satisfação geral (cruzamento "todos" do item nota_evento)
+    nota_evento = pesquisa_geral[pesquisa_geral["item"] == "nota_evento"]
+    if not nota_evento.empty:
+        geral = nota_evento.iloc[0]
+        col_aval1, col_aval2, col_aval3 = st.columns(3)
+        with col_aval1:
+            st.metric("Satisfação Média", f"{geral['media']:.1f}/5",
+                      help=f"IC 95%: {geral['ic_inf']:.2f} – {geral['ic_sup']:.2f}")
+        with col_aval2:
+            st.metric("Avaliações Positivas (4-5)", f"{geral['n_positivos']}")
+        with col_aval3:
+            st.metric("Total de Avaliações", int(geral['n']))
+
+        # Distribuição de avaliações
+        dist = pd.DataFrame({
+            'Nota': [str(v) for v in range(1, 6)],
+            'Quantidade': [int(geral[f'n_{v}']) for v in range(1, 6)],
+        })
+        fig_dist = px.bar(dist, x='Nota', y='Quantidade', title="Distribuição de Avaliações", text='Quantidade')
+        fig_dist.update_layout(
+            height=400,
+            margin=dict(l=10, r=10, t=50, b=10)
+        )
+        st.plotly_chart(fig_dist, use_container_width=True, key="autonomia_avaliacao_dist")
+
+    # Avaliações por dimensão (demais itens nota_*)
     st.markdown("### Avaliações por Dimensão")
-    dimensoes = {
-        'Conteúdo': [c for c in df_avaliacoes.columns if 'conteudo' in c.lower()],
-        'Local': [c for c in df_avaliacoes.columns if 'local' in c.lower()],
-        'Atendimento': [c for c in df_avaliacoes.columns if 'atendimento' in c.lower() or 'acolhimento' in c.lower()],
-    }
-    
-    col_dim1, col_dim2, col_dim3 = st.columns(3)
-    for i, (dimensao, cols) in enumerate(dimensoes.items()):
-        if cols:
-            col_dimensao = cols[0]
-            avaliacoes_dim = pd.to_numeric(df_avaliacoes[col_dimensao], errors='coerce')
-            if not avaliacoes_dim.isna().all():
-                media = avaliacoes_dim.mean()
-                with [col_dim1, col_dim2, col_dim3][i]:
-                    st.metric(dimensao, f"{media:.1f}/5")
-    
+    dimensoes = pesquisa_geral[(pesquisa_geral["tipo_item"] == "nota") & (pesquisa_geral["item"] != "nota_evento")]
+    if not dimensoes.empty:
+        for col_dim, (_, dim) in zip(st.columns(len(dimensoes)), dimensoes.iterrows()):
+            with col_dim:
+                st.metric(str(dim['rotulo']), f"{dim['media']:.1f}/5",
+                          help=f"IC 95%: {dim['ic_inf']:.2f} – {dim['ic_sup']:.2f} (n={dim['n']})")
+
+    # Notas por perfil do respondente, com IC 95%
+    st.markdown("### Notas por Perfil")
+    recorte_nota = st.radio("Recorte", ["Gênero", "Faixa etária"], horizontal=True, key="pesquisa_recorte_nota")
+    coluna_recorte = {"Gênero": "genero", "Faixa etária": "faixa_etaria"}[recorte_nota]
+    notas_perfil = por_recorte(cruzamentos, coluna_recorte, ano_pesquisa)
+    notas_perfil = notas_perfil[notas_perfil["tipo_item"] == "nota"]
+    if not notas_perfil.empty:
+        fig_perfil = px.bar(
+            notas_perfil.assign(
+                rotulo=notas_perfil["rotulo"].astype(str),
+                erro_sup=notas_perfil["ic_sup"] - notas_perfil["media"],
+                erro_inf=notas_perfil["media"] - notas_perfil["ic_inf"],
+            ),
+            x='rotulo', y='media', color=coluna_recorte, barmode='group',
+            error_y='erro_sup', error_y_minus='erro_inf',
+            hover_data={'n': True, 'erro_sup': False, 'erro_inf': False},
+            category_orders={'faixa_etaria': [rotulo for _, _, rotulo in FAIXAS_ETARIAS]},
+            labels={'rotulo': 'Dimensão', 'media': 'Nota média', 'genero': 'Gênero', 'faixa_etaria': 'Faixa etária'},
+        )
+        fig_perfil.update_yaxes(range=[1, 5.2])
+        fig_perfil.update_layout(height=400, margin=dict(l=10, r=10, t=10, b=10))
+        st.plotly_chart(fig_perfil, use_container_width=True, key="autonomia_notas_perfil")
+    else:
+        st.info("Sem avaliações para o recorte selecionado.")
+
     # Sugestões e feedback
-    sugestoes_col = [c for c in df_avaliacoes.columns if 'sugestao' in c.lower() or 'elogio' in c.lower() or 'reclamacao' in c.lower()][0] if any('sugestao' in c.lower() or 'elogio' in c.lower() or 'reclamacao' in c.lower() for c in df_avaliacoes.columns) else None
+    sugestoes_col = roles_aval.get('sugestao')
     if sugestoes_col:
         st.markdown("### Sugestões, Elogios e Reclamações")
-        sugestoes = df_avaliacoes[sugestoes_col].dropna()
+        sugestoes = load_dataset("autonomiadigital_avaliacoes", [sugestoes_col])[sugestoes_col].dropna()
         sugestoes_validas = sugestoes[sugestoes.astype(str).str.strip() != '']
         if len(sugestoes_validas) > 0:
             # Nuvem de palavras para sugestões
@@ -442,33 +470,8 @@ with tab3:
                     freq_dict_sugestoes[palavra] = freq_dict_sugestoes.get(palavra, 0) + 1
             
             if freq_dict_sugestoes:
-                # Criar nuvem de palavras
-                fig_wordcloud_sug, ax_sug = plt.subplots(figsize=(12, 6), facecolor='#0f1220')
-                ax_sug.set_facecolor('#0f1220')
-                
-                wordcloud_sug = WordCloud(
-                    width=1200,
-                    height=600,
-                    background_color='#0f1220',
-                    colormap='plasma',  # Cores diferentes para diferenciar
-                    max_words=100,
-                    relative_scaling=0.5,
-                    min_font_size=10,
-                    max_font_size=80,
-                    prefer_horizontal=0.7
-                ).generate_from_frequencies(freq_dict_sugestoes)
-                
-                ax_sug.imshow(wordcloud_sug, interpolation='bilinear')
-                ax_sug.axis('off')
-                plt.tight_layout(pad=0)
-                
-                # Converter para imagem
-                img_buffer_sug = io.BytesIO()
-                fig_wordcloud_sug.savefig(img_buffer_sug, format='png', facecolor='#0f1220', bbox_inches='tight', pad_inches=0)
-                img_buffer_sug.seek(0)
-                
-                st.image(img_buffer_sug, use_container_width=True)
-                plt.close(fig_wordcloud_sug)
+                # Nuvem de palavras ("plasma" para diferenciar da de temas)
+                st.image(nuvem_de_palavras(freq_dict_sugestoes, 'plasma'), use_container_width=True)
             
             # Tabela com sugestões (opcional, pode ser colapsada)
             with st.expander("📋 Ver todas as sugestões em texto"):
@@ -482,42 +485,27 @@ with tab3:
 with tab4:
     st.markdown('<div class="panel"><h3>O que os Participantes Aprenderam</h3>', unsafe_allow_html=True)
     
-    # Mapear colunas de aprendizado
-    aprendizados_map = {
-        'Funções básicas do celular': [c for c in df_avaliacoes.columns if 'funcoes' in c.lower() and 'celular' in c.lower()],
-        'Uso de e-mail': [c for c in df_avaliacoes.columns if 'email' in c.lower() and 'usar' in c.lower()],
-        'Segurança digital': [c for c in df_avaliacoes.columns if 'seguranca' in c.lower() or 'confiaveis' in c.lower()],
-        'IA no dia a dia': [c for c in df_avaliacoes.columns if 'inteligencia' in c.lower() or 'ia' in c.lower()],
-        'Gov.pi Cidadão': [c for c in df_avaliacoes.columns if 'gov' in c.lower() and 'cidad' in c.lower()],
-        'Piauí Saúde Digital': [c for c in df_avaliacoes.columns if 'saude' in c.lower() and 'digital' in c.lower()],
-        'BO Fácil': [c for c in df_avaliacoes.columns if 'bo' in c.lower() and 'facil' in c.lower()],
-    }
-    
-    aprendizados_data = []
-    for aprendizado, cols in aprendizados_map.items():
-        if cols:
-            col_aprendizado = cols[0]
-            sim_count = df_avaliacoes[col_aprendizado].astype(str).str.contains('Sim', case=False, na=False).sum()
-            total = len(df_avaliacoes[df_avaliacoes[col_aprendizado].notna()])
-            perc = (sim_count / total * 100) if total > 0 else 0
-            aprendizados_data.append({
-                'Aprendizado': aprendizado,
-                'Aprenderam': sim_count,
-                'Total': total,
-                'Percentual': perc
-            })
-    
-    if aprendizados_data:
-        df_aprendizados = pd.DataFrame(aprendizados_data)
-        df_aprendizados = df_aprendizados.sort_values('Percentual', ascending=True)
-        
+    # Itens aprendeu_* do cruzamento "todos" (média = proporção de "sim")
+    aprendizados = pesquisa_geral[pesquisa_geral["tipo_item"] == "aprendeu"]
+    if not aprendizados.empty:
+        df_aprendizados = pd.DataFrame({
+            'Aprendizado': aprendizados['rotulo'].astype(str),
+            'Aprenderam': aprendizados['n_positivos'],
+            'Total': aprendizados['n'],
+            'Percentual': aprendizados['media'] * 100,
+            'IC 95% (inf.)': aprendizados['ic_inf'] * 100,
+            'IC 95% (sup.)': aprendizados['ic_sup'] * 100,
+        }).sort_values('Percentual', ascending=True)
+
         fig_aprend = px.bar(
             df_aprendizados,
             x='Percentual',
             y='Aprendizado',
             orientation='h',
             title=None,
-            text='Percentual'
+            text='Percentual',
+            error_x=df_aprendizados['IC 95% (sup.)'] - df_aprendizados['Percentual'],
+            error_x_minus=df_aprendizados['Percentual'] - df_aprendizados['IC 95% (inf.)'],
         )
         fig_aprend.update_traces(texttemplate='%{text:.1f}%', textposition='outside', cliponaxis=False)
         fig_aprend.update_xaxes(ticksuffix="%", range=[0, 110])
@@ -528,43 +516,47 @@ with tab4:
             yaxis_title=None
         )
         st.plotly_chart(fig_aprend, use_container_width=True, key="autonomia_aprendizados")
-        
-        # Matriz colorida (heatmap) para detalhamento
-        st.markdown("### Detalhamento")
-        # Criar matriz para heatmap
-        matriz_data = df_aprendizados[['Aprendizado', 'Percentual']].set_index('Aprendizado')
-        matriz_data = matriz_data.T  # Transpor para melhor visualização
-        
-        # Criar heatmap
-        fig_heatmap = px.imshow(
-            matriz_data,
-            labels=dict(x="Aprendizado", y="", color="Percentual (%)"),
-            color_continuous_scale='Viridis',
-            aspect="auto",
-            text_auto='.1f'
-        )
-        fig_heatmap.update_layout(
-            height=200,
-            margin=dict(l=10, r=10, t=10, b=10),
-            plot_bgcolor='#11142a',
-            paper_bgcolor='#0f1220',
-            font_color='#e6e7ee',
-            xaxis=dict(side='bottom')
-        )
-        fig_heatmap.update_traces(textfont_size=12, textfont_color='white')
-        st.plotly_chart(fig_heatmap, use_container_width=True, key="autonomia_heatmap")
-        
+
+        # Matriz aprendizado × faixa etária
+        st.markdown("### Detalhamento por Faixa Etária")
+        por_faixa = por_recorte(cruzamentos, "faixa_etaria", ano_pesquisa)
+        por_faixa = por_faixa[por_faixa["tipo_item"] == "aprendeu"]
+        if not por_faixa.empty:
+            matriz_data = por_faixa.assign(
+                Aprendizado=por_faixa["rotulo"].astype(str), Percentual=por_faixa["media"] * 100,
+            ).pivot_table(index="Aprendizado", columns="faixa_etaria", values="Percentual")
+            ordem = [rotulo for _, _, rotulo in FAIXAS_ETARIAS if rotulo in matriz_data.columns]
+            matriz_data = matriz_data[ordem]
+
+            fig_heatmap = px.imshow(
+                matriz_data,
+                labels=dict(x="Faixa etária", y="", color="Percentual (%)"),
+                color_continuous_scale='Viridis',
+                aspect="auto",
+                text_auto='.1f'
+            )
+            fig_heatmap.update_layout(
+                height=400,
+                margin=dict(l=10, r=10, t=10, b=10),
+                plot_bgcolor='#11142a',
+                paper_bgcolor='#0f1220',
+                font_color='#e6e7ee',
+                xaxis=dict(side='bottom')
+            )
+            fig_heatmap.update_traces(textfont_size=12, textfont_color='white')
+            st.plotly_chart(fig_heatmap, use_container_width=True, key="autonomia_heatmap")
+
         # Tabela também disponível (colapsada)
         with st.expander("📊 Ver dados em tabela"):
-            st.dataframe(df_aprendizados, use_container_width=True)
+            st.dataframe(df_aprendizados.round(1), use_container_width=True)
     else:
         st.info("Sem dados de aprendizados disponíveis.")
-    
+
     # Aprendizados extras
-    extras_col = [c for c in df_avaliacoes.columns if 'extras' in c.lower() or 'registrar' in c.lower()][0] if any('extras' in c.lower() or 'registrar' in c.lower() for c in df_avaliacoes.columns) else None
+    extras_col = roles_aval.get('extras')
     if extras_col:
         st.markdown("### Aprendizados Extras Registrados")
-        extras = df_avaliacoes[extras_col].dropna()
+        extras = load_dataset("autonomiadigital_avaliacoes", [extras_col])[extras_col].dropna()
         extras_validos = extras[extras.astype(str).str.strip() != '']
         if len(extras_validos) > 0:
             # Processar aprendizados extras para treemap
@@ -5,56 +5,28 @@ from pathlib import Path
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import plotly.io as pio
 import numpy as np
 import sys
 from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.data.loaders import load_servidores_data
+from src.data.loaders import load_servidores_data, load_ranking, load_jornadas, current_data_version, get_processed_path
+from src.data.schema import enforce_dados_schema
 from src.utils.constants import COLORS
+from src.utils.bootstrap import iniciar_pagina
+from src.utils.fig_cache import figura
+from src.utils.theme import style_fig
 
 # =========================
-# CONFIG & THEME
+# CONFIG, THEME & CSS
 # =========================
-st.set_page_config(
-    page_title="Evolução Temporal - CapacitIA",
-    page_icon="📈",
-    layout="wide",
-    initial_sidebar_state="collapsed",
-)
-
-pio.templates["capacit_dark"] = pio.templates["plotly_dark"]
-pio.templates["capacit_dark"].layout.font.family = "Inter, Segoe UI, Roboto, Arial"
-pio.templates["capacit_dark"].layout.colorway = [
-    "#7DD3FC", "#34D399", "#FBBF24", "#F472B6", "#60A5FA", "#A78BFA", "#F87171"
-]
-pio.templates["capacit_dark"].layout.paper_bgcolor = "#0f1220"
-pio.templates["capacit_dark"].layout.plot_bgcolor  = "#11142a"
-pio.templates["capacit_dark"].layout.hoverlabel = dict(
-    bgcolor="#0f1220", font_size=12, font_family="Inter, Segoe UI, Roboto, Arial"
-)
-pio.templates.default = "capacit_dark"
-
-with open("styles/main.css", "r", encoding="utf-8") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+iniciar_pagina("Evolução Temporal - CapacitIA", "📈")
 
 
 # =========================
 # HELPERS
 # =========================
-def style_fig(fig, height=420):
-    fig.update_layout(
-        height=height,
-        margin=dict(l=10, r=10, t=50, b=10),
-        xaxis_title=None,
-        yaxis_title=None,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
-    )
-    return fig
-
-
 def fmt_br(n) -> str:
     return f"{int(n):,}".replace(",", ".")
 
@@ -71,12 +43,10 @@ def delta_badge(valor: float, suffix: str = "%") -> str:
 # =========================
 # CARREGAR DADOS
 # =========================
-processed_path = Path(".data") / "processed"
-
-
 @st.cache_data(show_spinner=False)
-def load_evolucao():
+def load_evolucao(data_version=None):
     """Carrega arquivos de evolução anual; fallback: recalcula a partir de dados.parquet."""
+    processed_path = get_processed_path()
     files = {
         "geral":   "evolucao_anual_geral.parquet",
         "formato": "evolucao_anual_formato.parquet",
@@ -112,15 +82,18 @@ def load_evolucao():
             )
             df["ano"] = "2025"
 
-        df["ano"] = df["ano"].astype(str).str.strip()
+        df = enforce_dados_schema(df)
+        # Os arquivos evolucao_anual_* usam o ano como texto
+        df["ano"] = df["ano"].astype(str)
 
         # geral
         geral = df.groupby("ano").agg(
-            total_inscritos=("nome", "count"),
-            total_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            total_inscritos=("participante_id", "size"),
+            total_certificados=("certificado", "sum"),
             total_eventos=("evento", "nunique"),
             total_orgaos=("orgao", "nunique"),
-            total_gestores=("cargo_gestao", lambda x: (x == "Sim").sum()) if "cargo_gestao" in df.columns else ("nome", "count"),
+            total_participantes=("participante_id", "nunique"),
+            total_gestores=("cargo_gestao", "sum"),
         ).reset_index()
         geral["taxa_certificacao"] = (
             geral["total_certificados"] / geral["total_inscritos"] * 100
@@ -135,9 +108,9 @@ def load_evolucao():
 
         # formato
         if "formato" not in result:
-            ev_fmt = df.groupby(["ano", "formato"]).agg(
-                n_inscritos=("nome", "count"),
-                n_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            ev_fmt = df.groupby(["ano", "formato"], observed=True).agg(
+                n_inscritos=("participante_id", "size"),
+                n_certificados=("certificado", "sum"),
                 n_eventos=("evento", "nunique"),
             ).reset_index()
             ev_fmt["taxa_certificacao"] = (ev_fmt["n_certificados"] / ev_fmt["n_inscritos"] * 100).round(2)
@@ -147,9 +120,9 @@ def load_evolucao():
         if "orgao" not in result:
             filtro = df["orgao"].astype(str).str.strip()
             df_org = df[~filtro.str.lower().isin(["outro", "outros", ""])].copy()
-            ev_org = df_org.groupby(["ano", "orgao"]).agg(
-                n_inscritos=("nome", "count"),
-                n_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            ev_org = df_org.groupby(["ano", "orgao"], observed=True).agg(
+                n_inscritos=("participante_id", "size"),
+                n_certificados=("certificado", "sum"),
             ).reset_index()
             ev_org["taxa_certificacao"] = (ev_org["n_certificados"] / ev_org["n_inscritos"] * 100).round(2)
             result["orgao"] = ev_org
@@ -158,17 +131,17 @@ def load_evolucao():
         if "cargo" not in result:
             filtro_c = df["cargo"].astype(str).str.strip().str.lower()
             df_c = df[~filtro_c.isin(["", "outro", "outros"])].copy()
-            ev_c = df_c.groupby(["ano", "cargo"]).agg(
-                n_inscritos=("nome", "count"),
-                n_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            ev_c = df_c.groupby(["ano", "cargo"], observed=True).agg(
+                n_inscritos=("participante_id", "size"),
+                n_certificados=("certificado", "sum"),
             ).reset_index()
             result["cargo"] = ev_c
 
         # eixo
         if "eixo" not in result:
-            ev_eixo = df.groupby(["ano", "eixo"]).agg(
-                n_inscritos=("nome", "count"),
-                n_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            ev_eixo = df.groupby(["ano", "eixo"], observed=True).agg(
+                n_inscritos=("participante_id", "size"),
+                n_certificados=("certificado", "sum"),
             ).reset_index()
             result["eixo"] = ev_eixo
 
@@ -176,7 +149,7 @@ def load_evolucao():
 
 
 with st.spinner("Carregando dados de evolução..."):
-    evolucao = load_evolucao()
+    evolucao = load_evolucao(current_data_version())
 
 if evolucao is None:
     st.error(
@@ -270,12 +243,13 @@ st.markdown('<div class="sep"></div>', unsafe_allow_html=True)
 # =========================
 # ABAS
 # =========================
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "📊 Visão Geral",
     "📚 Por Formato",
     "🏢 Por Órgão",
     "👤 Por Cargo",
     "🧭 Por Eixo",
+    "🔁 Jornadas",
 ])
 
 
@@ -290,70 +264,78 @@ with tab1:
     # Gráfico principal: Inscritos e Certificados por Ano
     with col_l:
         st.markdown('<div class="panel"><h3>Inscritos vs Certificados por Ano</h3>', unsafe_allow_html=True)
-        fig_bar = go.Figure()
-        fig_bar.add_bar(
-            x=geral["ano"], y=geral["total_inscritos"],
-            name="Inscritos", marker_color="#7DD3FC",
-            text=geral["total_inscritos"].apply(fmt_br),
-            textposition="outside",
-        )
-        fig_bar.add_bar(
-            x=geral["ano"], y=geral["total_certificados"],
-            name="Certificados", marker_color="#34D399",
-            text=geral["total_certificados"].apply(fmt_br),
-            textposition="outside",
-        )
-        fig_bar.update_layout(barmode="group", xaxis=dict(type="category"))
-        st.plotly_chart(style_fig(fig_bar, 400), use_container_width=True, key="tl_bar_geral")
+        def _fig_bar():
+            fig_bar = go.Figure()
+            fig_bar.add_bar(
+                x=geral["ano"], y=geral["total_inscritos"],
+                name="Inscritos", marker_color="#7DD3FC",
+                text=geral["total_inscritos"].apply(fmt_br),
+                textposition="outside",
+            )
+            fig_bar.add_bar(
+                x=geral["ano"], y=geral["total_certificados"],
+                name="Certificados", marker_color="#34D399",
+                text=geral["total_certificados"].apply(fmt_br),
+                textposition="outside",
+            )
+            fig_bar.update_layout(barmode="group", xaxis=dict(type="category"))
+            return style_fig(fig_bar, height=400)
+        st.plotly_chart(figura("tl_bar_geral", (), _fig_bar), use_container_width=True, key="tl_bar_geral")
         st.markdown('</div>', unsafe_allow_html=True)
 
     with col_r:
         st.markdown('<div class="panel"><h3>Taxa de Certificação por Ano (%)</h3>', unsafe_allow_html=True)
-        fig_taxa = go.Figure()
-        fig_taxa.add_scatter(
-            x=geral["ano"], y=geral["taxa_certificacao"],
-            mode="lines+markers+text",
-            line=dict(color="#FBBF24", width=3),
-            marker=dict(size=12),
-            text=geral["taxa_certificacao"].apply(lambda v: f"{v:.1f}%"),
-            textposition="top center",
-            name="Taxa Cert.",
-        )
-        fig_taxa.add_scatter(
-            x=geral["ano"], y=geral["taxa_evasao"],
-            mode="lines+markers+text",
-            line=dict(color="#F87171", width=2, dash="dot"),
-            marker=dict(size=10),
-            text=geral["taxa_evasao"].apply(lambda v: f"{v:.1f}%"),
-            textposition="bottom center",
-            name="Taxa Evasão",
-        )
-        fig_taxa.update_layout(yaxis=dict(ticksuffix="%"), xaxis=dict(type="category"))
-        st.plotly_chart(style_fig(fig_taxa, 400), use_container_width=True, key="tl_linha_taxa")
+        def _fig_taxa():
+            fig_taxa = go.Figure()
+            fig_taxa.add_scatter(
+                x=geral["ano"], y=geral["taxa_certificacao"],
+                mode="lines+markers+text",
+                line=dict(color="#FBBF24", width=3),
+                marker=dict(size=12),
+                text=geral["taxa_certificacao"].apply(lambda v: f"{v:.1f}%"),
+                textposition="top center",
+                name="Taxa Cert.",
+            )
+            fig_taxa.add_scatter(
+                x=geral["ano"], y=geral["taxa_evasao"],
+                mode="lines+markers+text",
+                line=dict(color="#F87171", width=2, dash="dot"),
+                marker=dict(size=10),
+                text=geral["taxa_evasao"].apply(lambda v: f"{v:.1f}%"),
+                textposition="bottom center",
+                name="Taxa Evasão",
+            )
+            fig_taxa.update_layout(yaxis=dict(ticksuffix="%"), xaxis=dict(type="category"))
+            return style_fig(fig_taxa, height=400)
+        st.plotly_chart(figura("tl_linha_taxa", (), _fig_taxa), use_container_width=True, key="tl_linha_taxa")
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Linha do tempo de eventos e órgãos
     col_ev, col_org = st.columns(2)
     with col_ev:
         st.markdown('<div class="panel"><h3>Total de Eventos por Ano</h3>', unsafe_allow_html=True)
-        fig_ev = px.bar(
-            geral, x="ano", y="total_eventos",
-            text="total_eventos", color_discrete_sequence=["#A78BFA"],
-        )
-        fig_ev.update_traces(textposition="outside", cliponaxis=False)
-        fig_ev.update_layout(xaxis=dict(type="category"))
-        st.plotly_chart(style_fig(fig_ev, 340), use_container_width=True, key="tl_ev")
+        def _fig_ev():
+            fig_ev = px.bar(
+                geral, x="ano", y="total_eventos",
+                text="total_eventos", color_discrete_sequence=["#A78BFA"],
+            )
+            fig_ev.update_traces(textposition="outside", cliponaxis=False)
+            fig_ev.update_layout(xaxis=dict(type="category"))
+            return style_fig(fig_ev, height=340)
+        st.plotly_chart(figura("tl_ev", (), _fig_ev), use_container_width=True, key="tl_ev")
         st.markdown('</div>', unsafe_allow_html=True)
 
     with col_org:
         st.markdown('<div class="panel"><h3>Total de Órgãos Atendidos por Ano</h3>', unsafe_allow_html=True)
-        fig_org = px.bar(
-            geral, x="ano", y="total_orgaos",
-            text="total_orgaos", color_discrete_sequence=["#F472B6"],
-        )
-        fig_org.update_traces(textposition="outside", cliponaxis=False)
-        fig_org.update_layout(xaxis=dict(type="category"))
-        st.plotly_chart(style_fig(fig_org, 340), use_container_width=True, key="tl_org")
+        def _fig_org():
+            fig_org = px.bar(
+                geral, x="ano", y="total_orgaos",
+                text="total_orgaos", color_discrete_sequence=["#F472B6"],
+            )
+            fig_org.update_traces(textposition="outside", cliponaxis=False)
+            fig_org.update_layout(xaxis=dict(type="category"))
+            return style_fig(fig_org, height=340)
+        st.plotly_chart(figura("tl_org", (), _fig_org), use_container_width=True, key="tl_org")
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Tabela de resumo anual
@@ -389,15 +371,17 @@ with tab1:
 
         if metricas_cresc:
             df_cresc = pd.DataFrame(metricas_cresc)
-            fig_cresc = px.bar(
-                df_cresc, x="Métrica", y="Crescimento (%)", color="Ano",
-                barmode="group", text="Crescimento (%)",
-                color_discrete_sequence=["#7DD3FC", "#34D399", "#FBBF24", "#F472B6"],
-            )
-            fig_cresc.add_hline(y=0, line_dash="dot", line_color="#7780a1")
-            fig_cresc.update_traces(texttemplate="%{y:+.1f}%", textposition="outside", cliponaxis=False)
-            fig_cresc.update_yaxes(ticksuffix="%")
-            st.plotly_chart(style_fig(fig_cresc, 420), use_container_width=True, key="tl_cresc")
+            def _fig_cresc():
+                fig_cresc = px.bar(
+                    df_cresc, x="Métrica", y="Crescimento (%)", color="Ano",
+                    barmode="group", text="Crescimento (%)",
+                    color_discrete_sequence=["#7DD3FC", "#34D399", "#FBBF24", "#F472B6"],
+                )
+                fig_cresc.add_hline(y=0, line_dash="dot", line_color="#7780a1")
+                fig_cresc.update_traces(texttemplate="%{y:+.1f}%", textposition="outside", cliponaxis=False)
+                fig_cresc.update_yaxes(ticksuffix="%")
+                return style_fig(fig_cresc, height=420)
+            st.plotly_chart(figura("tl_cresc", (), _fig_cresc), use_container_width=True, key="tl_cresc")
         st.markdown('</div>', unsafe_allow_html=True)
 
 
@@ -414,42 +398,48 @@ with tab2:
 
         with col_a:
             st.markdown('<div class="panel"><h3>Inscritos por Formato e Ano</h3>', unsafe_allow_html=True)
-            fig_fmt = px.bar(
-                formato.sort_values(["ano", "n_inscritos"], ascending=[True, False]),
-                x="formato", y="n_inscritos", color="ano",
-                barmode="group", text="n_inscritos",
-                labels={"n_inscritos": "Inscritos", "formato": "Formato", "ano": "Ano"},
-            )
-            fig_fmt.update_traces(texttemplate="%{y}", textposition="outside", cliponaxis=False)
-            st.plotly_chart(style_fig(fig_fmt, 400), use_container_width=True, key="tl_fmt_bar")
+            def _fig_fmt():
+                fig_fmt = px.bar(
+                    formato.sort_values(["ano", "n_inscritos"], ascending=[True, False]),
+                    x="formato", y="n_inscritos", color="ano",
+                    barmode="group", text="n_inscritos",
+                    labels={"n_inscritos": "Inscritos", "formato": "Formato", "ano": "Ano"},
+                )
+                fig_fmt.update_traces(texttemplate="%{y}", textposition="outside", cliponaxis=False)
+                return style_fig(fig_fmt, height=400)
+            st.plotly_chart(figura("tl_fmt_bar", (), _fig_fmt), use_container_width=True, key="tl_fmt_bar")
             st.markdown('</div>', unsafe_allow_html=True)
 
         with col_b:
             st.markdown('<div class="panel"><h3>Taxa de Certificação por Formato</h3>', unsafe_allow_html=True)
-            fig_fmt_taxa = px.line(
-                formato.sort_values("ano"),
-                x="ano", y="taxa_certificacao", color="formato",
-                markers=True,
-                labels={"taxa_certificacao": "Taxa Cert. (%)", "ano": "Ano"},
-            )
-            fig_fmt_taxa.update_yaxes(ticksuffix="%")
-            fig_fmt_taxa.update_layout(xaxis=dict(type="category"))
-            st.plotly_chart(style_fig(fig_fmt_taxa, 400), use_container_width=True, key="tl_fmt_taxa")
+            def _fig_fmt_taxa():
+                fig_fmt_taxa = px.line(
+                    formato.sort_values("ano"),
+                    x="ano", y="taxa_certificacao", color="formato",
+                    markers=True,
+                    labels={"taxa_certificacao": "Taxa Cert. (%)", "ano": "Ano"},
+                )
+                fig_fmt_taxa.update_yaxes(ticksuffix="%")
+                fig_fmt_taxa.update_layout(xaxis=dict(type="category"))
+                return style_fig(fig_fmt_taxa, height=400)
+            st.plotly_chart(figura("tl_fmt_taxa", (), _fig_fmt_taxa), use_container_width=True, key="tl_fmt_taxa")
             st.markdown('</div>', unsafe_allow_html=True)
 
         # Heatmap: formato × ano (inscritos)
         st.markdown('<div class="panel"><h3>Heatmap — Inscritos por Formato × Ano</h3>', unsafe_allow_html=True)
         pivot = formato.pivot_table(index="formato", columns="ano", values="n_inscritos", aggfunc="sum").fillna(0)
-        fig_heat = px.imshow(
-            pivot,
-            text_auto=True,
-            color_continuous_scale="Blues",
-            aspect="auto",
-            labels={"color": "Inscritos"},
-        )
-        fig_heat.update_traces(textfont_size=13)
-        fig_heat.update_layout(xaxis=dict(type="category"))
-        st.plotly_chart(style_fig(fig_heat, 300), use_container_width=True, key="tl_fmt_heat")
+        def _fig_heat():
+            fig_heat = px.imshow(
+                pivot,
+                text_auto=True,
+                color_continuous_scale="Blues",
+                aspect="auto",
+                labels={"color": "Inscritos"},
+            )
+            fig_heat.update_traces(textfont_size=13)
+            fig_heat.update_layout(xaxis=dict(type="category"))
+            return style_fig(fig_heat, height=300)
+        st.plotly_chart(figura("tl_fmt_heat", (), _fig_heat), use_container_width=True, key="tl_fmt_heat")
         st.markdown('</div>', unsafe_allow_html=True)
 
 
@@ -464,39 +454,39 @@ with tab3:
     else:
         # Selecionar top N órgãos pelo total geral
         top_n_org = st.slider("Quantidade de órgãos a exibir", 5, 30, 15, key="sl_top_org")
-        top_orgaos = (
-            orgao_ev.groupby("orgao")["n_inscritos"].sum()
-            .sort_values(ascending=False)
-            .head(top_n_org)
-            .index.tolist()
-        )
+        # Ranking pré-calculado (total de todos os anos)
+        top_orgaos = load_ranking("orgao", "inscritos").head(top_n_org)["nome"].tolist()
         df_org_top = orgao_ev[orgao_ev["orgao"].isin(top_orgaos)]
 
         col_a, col_b = st.columns(2)
 
         with col_a:
             st.markdown('<div class="panel"><h3>Inscritos por Órgão e Ano</h3>', unsafe_allow_html=True)
-            fig_org = px.bar(
-                df_org_top.sort_values("n_inscritos"),
-                x="n_inscritos", y="orgao", color="ano",
-                barmode="group", orientation="h",
-                labels={"n_inscritos": "Inscritos", "orgao": "Órgão"},
-            )
-            fig_org.update_traces(texttemplate="%{x}", textposition="outside", cliponaxis=False)
-            st.plotly_chart(style_fig(fig_org, 520), use_container_width=True, key="tl_org_bar")
+            def _fig_org():
+                fig_org = px.bar(
+                    df_org_top.sort_values("n_inscritos"),
+                    x="n_inscritos", y="orgao", color="ano",
+                    barmode="group", orientation="h",
+                    labels={"n_inscritos": "Inscritos", "orgao": "Órgão"},
+                )
+                fig_org.update_traces(texttemplate="%{x}", textposition="outside", cliponaxis=False)
+                return style_fig(fig_org, height=520)
+            st.plotly_chart(figura("tl_org_bar", (top_n_org,), _fig_org), use_container_width=True, key="tl_org_bar")
             st.markdown('</div>', unsafe_allow_html=True)
 
         with col_b:
             st.markdown('<div class="panel"><h3>Taxa de Certificação por Órgão e Ano</h3>', unsafe_allow_html=True)
-            fig_org_taxa = px.bar(
-                df_org_top.sort_values("taxa_certificacao"),
-                x="taxa_certificacao", y="orgao", color="ano",
-                barmode="group", orientation="h",
-                labels={"taxa_certificacao": "Taxa Cert. (%)", "orgao": "Órgão"},
-            )
-            fig_org_taxa.update_traces(texttemplate="%{x:.1f}%", textposition="outside", cliponaxis=False)
-            fig_org_taxa.update_xaxes(ticksuffix="%")
-            st.plotly_chart(style_fig(fig_org_taxa, 520), use_container_width=True, key="tl_org_taxa")
+            def _fig_org_taxa():
+                fig_org_taxa = px.bar(
+                    df_org_top.sort_values("taxa_certificacao"),
+                    x="taxa_certificacao", y="orgao", color="ano",
+                    barmode="group", orientation="h",
+                    labels={"taxa_certificacao": "Taxa Cert. (%)", "orgao": "Órgão"},
+                )
+                fig_org_taxa.update_traces(texttemplate="%{x:.1f}%", textposition="outside", cliponaxis=False)
+                fig_org_taxa.update_xaxes(ticksuffix="%")
+                return style_fig(fig_org_taxa, height=520)
+            st.plotly_chart(figura("tl_org_taxa", (top_n_org,), _fig_org_taxa), use_container_width=True, key="tl_org_taxa")
             st.markdown('</div>', unsafe_allow_html=True)
 
         # Órgãos novos vs recorrentes (só se há 2+ anos)
@@ -515,16 +505,18 @@ with tab3:
                 resumo_rows.append({"Ano": ano, "Novos": novos, "Recorrentes": recorrentes, "Total": novos + recorrentes})
 
             df_resumo_org = pd.DataFrame(resumo_rows)
-            fig_nov = px.bar(
-                df_resumo_org.melt(id_vars="Ano", value_vars=["Novos", "Recorrentes"]),
-                x="Ano", y="value", color="variable",
-                barmode="stack", text="value",
-                color_discrete_map={"Novos": "#34D399", "Recorrentes": "#7DD3FC"},
-                labels={"value": "Órgãos", "variable": ""},
-            )
-            fig_nov.update_traces(texttemplate="%{y}", textposition="inside")
-            fig_nov.update_layout(xaxis=dict(type="category"))
-            st.plotly_chart(style_fig(fig_nov, 340), use_container_width=True, key="tl_org_novos")
+            def _fig_nov():
+                fig_nov = px.bar(
+                    df_resumo_org.melt(id_vars="Ano", value_vars=["Novos", "Recorrentes"]),
+                    x="Ano", y="value", color="variable",
+                    barmode="stack", text="value",
+                    color_discrete_map={"Novos": "#34D399", "Recorrentes": "#7DD3FC"},
+                    labels={"value": "Órgãos", "variable": ""},
+                )
+                fig_nov.update_traces(texttemplate="%{y}", textposition="inside")
+                fig_nov.update_layout(xaxis=dict(type="category"))
+                return style_fig(fig_nov, height=340)
+            st.plotly_chart(figura("tl_org_novos", (), _fig_nov), use_container_width=True, key="tl_org_novos")
             st.markdown('</div>', unsafe_allow_html=True)
 
 
@@ -538,36 +530,35 @@ with tab4:
         st.info("Sem dados de cargo disponíveis.")
     else:
         top_n_cargo = st.slider("Quantidade de cargos a exibir", 5, 25, 12, key="sl_top_cargo")
-        top_cargos = (
-            cargo_ev.groupby("cargo")["n_inscritos"].sum()
-            .sort_values(ascending=False)
-            .head(top_n_cargo)
-            .index.tolist()
-        )
+        top_cargos = load_ranking("cargo", "inscritos").head(top_n_cargo)["nome"].tolist()
         df_c_top = cargo_ev[cargo_ev["cargo"].isin(top_cargos)]
 
         st.markdown('<div class="panel"><h3>Inscritos por Cargo e Ano</h3>', unsafe_allow_html=True)
-        fig_cargo = px.bar(
-            df_c_top.sort_values("n_inscritos"),
-            x="n_inscritos", y="cargo", color="ano",
-            barmode="group", orientation="h",
-            labels={"n_inscritos": "Inscritos", "cargo": "Cargo"},
-        )
-        fig_cargo.update_traces(texttemplate="%{x}", textposition="outside", cliponaxis=False)
-        st.plotly_chart(style_fig(fig_cargo, 540), use_container_width=True, key="tl_cargo_bar")
+        def _fig_cargo():
+            fig_cargo = px.bar(
+                df_c_top.sort_values("n_inscritos"),
+                x="n_inscritos", y="cargo", color="ano",
+                barmode="group", orientation="h",
+                labels={"n_inscritos": "Inscritos", "cargo": "Cargo"},
+            )
+            fig_cargo.update_traces(texttemplate="%{x}", textposition="outside", cliponaxis=False)
+            return style_fig(fig_cargo, height=540)
+        st.plotly_chart(figura("tl_cargo_bar", (top_n_cargo,), _fig_cargo), use_container_width=True, key="tl_cargo_bar")
         st.markdown('</div>', unsafe_allow_html=True)
 
         # Heatmap de cargos × ano
         st.markdown('<div class="panel"><h3>Heatmap — Inscritos por Cargo × Ano</h3>', unsafe_allow_html=True)
         pivot_c = df_c_top.pivot_table(index="cargo", columns="ano", values="n_inscritos", aggfunc="sum").fillna(0)
-        fig_heat_c = px.imshow(
-            pivot_c, text_auto=True,
-            color_continuous_scale="Teal", aspect="auto",
-            labels={"color": "Inscritos"},
-        )
-        fig_heat_c.update_traces(textfont_size=12)
-        fig_heat_c.update_layout(xaxis=dict(type="category"))
-        st.plotly_chart(style_fig(fig_heat_c, 420), use_container_width=True, key="tl_cargo_heat")
+        def _fig_heat_c():
+            fig_heat_c = px.imshow(
+                pivot_c, text_auto=True,
+                color_continuous_scale="Teal", aspect="auto",
+                labels={"color": "Inscritos"},
+            )
+            fig_heat_c.update_traces(textfont_size=12)
+            fig_heat_c.update_layout(xaxis=dict(type="category"))
+            return style_fig(fig_heat_c, height=420)
+        st.plotly_chart(figura("tl_cargo_heat", (top_n_cargo,), _fig_heat_c), use_container_width=True, key="tl_cargo_heat")
         st.markdown('</div>', unsafe_allow_html=True)
 
 
@@ -584,45 +575,181 @@ with tab5:
 
         with col_a:
             st.markdown('<div class="panel"><h3>Inscritos por Eixo e Ano</h3>', unsafe_allow_html=True)
-            fig_eixo = px.bar(
-                eixo_ev.sort_values(["ano", "n_inscritos"], ascending=[True, False]),
-                x="eixo", y="n_inscritos", color="ano",
-                barmode="group", text="n_inscritos",
-                labels={"n_inscritos": "Inscritos", "eixo": "Eixo"},
-            )
-            fig_eixo.update_traces(texttemplate="%{y}", textposition="outside", cliponaxis=False)
-            fig_eixo.update_layout(xaxis=dict(type="category"))
-            st.plotly_chart(style_fig(fig_eixo, 420), use_container_width=True, key="tl_eixo_bar")
+            def _fig_eixo():
+                fig_eixo = px.bar(
+                    eixo_ev.sort_values(["ano", "n_inscritos"], ascending=[True, False]),
+                    x="eixo", y="n_inscritos", color="ano",
+                    barmode="group", text="n_inscritos",
+                    labels={"n_inscritos": "Inscritos", "eixo": "Eixo"},
+                )
+                fig_eixo.update_traces(texttemplate="%{y}", textposition="outside", cliponaxis=False)
+                fig_eixo.update_layout(xaxis=dict(type="category"))
+                return style_fig(fig_eixo, height=420)
+            st.plotly_chart(figura("tl_eixo_bar", (), _fig_eixo), use_container_width=True, key="tl_eixo_bar")
             st.markdown('</div>', unsafe_allow_html=True)
 
         with col_b:
             st.markdown('<div class="panel"><h3>Participação por Eixo (Treemap)</h3>', unsafe_allow_html=True)
-            fig_eixo_tree = px.treemap(
-                eixo_ev,
-                path=["eixo", "ano"],
-                values="n_inscritos",
-                color="n_inscritos",
-                color_continuous_scale="Blues",
-                labels={"n_inscritos": "Inscritos"},
-            )
-            fig_eixo_tree.update_traces(
-                texttemplate="<b>%{label}</b><br>%{value}",
-                textposition="middle center",
-            )
-            st.plotly_chart(style_fig(fig_eixo_tree, 420), use_container_width=True, key="tl_eixo_tree")
+            def _fig_eixo_tree():
+                fig_eixo_tree = px.treemap(
+                    eixo_ev,
+                    path=["eixo", "ano"],
+                    values="n_inscritos",
+                    color="n_inscritos",
+                    color_continuous_scale="Blues",
+                    labels={"n_inscritos": "Inscritos"},
+                )
+                fig_eixo_tree.update_traces(
+                    texttemplate="<b>%{label}</b><br>%{value}",
+                    textposition="middle center",
+                )
+                return style_fig(fig_eixo_tree, height=420)
+            st.plotly_chart(figura("tl_eixo_tree", (), _fig_eixo_tree), use_container_width=True, key="tl_eixo_tree")
             st.markdown('</div>', unsafe_allow_html=True)
 
         # Heatmap: eixo × ano
         st.markdown('<div class="panel"><h3>Heatmap — Inscritos por Eixo × Ano</h3>', unsafe_allow_html=True)
         pivot_e = eixo_ev.pivot_table(index="eixo", columns="ano", values="n_inscritos", aggfunc="sum").fillna(0)
-        fig_heat_e = px.imshow(
-            pivot_e, text_auto=True,
-            color_continuous_scale="Purples", aspect="auto",
-            labels={"color": "Inscritos"},
-        )
-        fig_heat_e.update_traces(textfont_size=13)
-        fig_heat_e.update_layout(xaxis=dict(type="category"))
-        st.plotly_chart(style_fig(fig_heat_e, 300), use_container_width=True, key="tl_eixo_heat")
+        def _fig_heat_e():
+            fig_heat_e = px.imshow(
+                pivot_e, text_auto=True,
+                color_continuous_scale="Purples", aspect="auto",
+                labels={"color": "Inscritos"},
+            )
+            fig_heat_e.update_traces(textfont_size=13)
+            fig_heat_e.update_layout(xaxis=dict(type="category"))
+            return style_fig(fig_heat_e, height=300)
+        st.plotly_chart(figura("tl_eixo_heat", (), _fig_heat_e), use_container_width=True, key="tl_eixo_heat")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+# ─────────────────────────────────────────────
+# TAB 6 — JORNADAS (coortes e transições pré-calculadas)
+# ─────────────────────────────────────────────
+with tab6:
+    st.markdown("### 🔁 Jornadas dos Participantes")
+
+    jornadas = load_jornadas()
+    if jornadas is None:
+        st.info("Coortes não disponíveis neste snapshot. Execute `python src/process_all.py` para gerá-las.")
+    else:
+        coortes, transicoes, participantes = jornadas
+
+        # Funil: participantes com pelo menos k participações / anos ativos
+        n_part = len(participantes)
+        recorrentes = int((participantes["n_participacoes"] >= 2).sum())
+        multi_ano = int((participantes["n_anos"] >= 2).sum())
+        c1, c2, c3 = st.columns(3)
+        c1.markdown(f'<div class="kpi"><h4>👤 Participantes Únicos</h4><div class="val">{fmt_br(n_part)}</div></div>', unsafe_allow_html=True)
+        c2.markdown(f'<div class="kpi"><h4>🔁 Com 2+ Participações</h4><div class="val">{fmt_br(recorrentes)}</div></div>', unsafe_allow_html=True)
+        c3.markdown(f'<div class="kpi"><h4>📅 Ativos em 2+ Anos</h4><div class="val">{fmt_br(multi_ano)}</div></div>', unsafe_allow_html=True)
+
+        col_a, col_b = st.columns(2)
+
+        with col_a:
+            st.markdown('<div class="panel"><h3>Funil de Participações</h3>', unsafe_allow_html=True)
+            def _fig_funil():
+                etapas = [1, 2, 3, 4]
+                valores = [int((participantes["n_participacoes"] >= k).sum()) for k in etapas]
+                fig_funil = go.Figure(go.Funnel(
+                    y=[f"{k}+ participações" for k in etapas], x=valores,
+                    textinfo="value+percent initial", marker=dict(color="#7DD3FC"),
+                ))
+                return style_fig(fig_funil, height=380)
+            st.plotly_chart(figura("tl_jornada_funil", (), _fig_funil), use_container_width=True, key="tl_jornada_funil")
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        with col_b:
+            st.markdown('<div class="panel"><h3>Transições entre Anos e Tipos</h3>', unsafe_allow_html=True)
+            def _fig_sankey():
+                if transicoes.empty:
+                    return None
+                origem = transicoes["de_ano"].astype(str) + " · " + transicoes["de_tipo"].astype(str)
+                destino = np.where(
+                    transicoes["para_ano"].isna(), transicoes["para_tipo"].astype(str),
+                    transicoes["para_ano"].astype(str) + " · " + transicoes["para_tipo"].astype(str),
+                )
+                nos = pd.Index(pd.unique(np.concatenate([origem.to_numpy(), destino])))
+                fig_sankey = go.Figure(go.Sankey(
+                    node=dict(label=nos.tolist(), pad=18, thickness=16),
+                    link=dict(
+                        source=nos.get_indexer(origem), target=nos.get_indexer(destino),
+                        value=transicoes["n_participantes"],
+                    ),
+                ))
+                return style_fig(fig_sankey, height=380)
+            fig_sankey = figura("tl_jornada_sankey", (), _fig_sankey)
+            if fig_sankey is None:
+                st.info("Sem transições registradas.")
+            else:
+                st.plotly_chart(fig_sankey, use_container_width=True, key="tl_jornada_sankey")
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        # Matriz de retenção: coorte (1º ano × tipo) × ano posterior × tipo
+        st.markdown('<div class="panel"><h3>Retenção por Coorte (%)</h3>', unsafe_allow_html=True)
+        if coortes.empty:
+            st.info("Ainda não há anos posteriores às coortes para medir retenção.")
+        else:
+            por_orgao = coortes[coortes["orgao"].notna()]
+            # coorte_tipo nulo = pessoas distintas da coorte (sem repetir quem fez dois tipos)
+            orgaos = (
+                por_orgao[por_orgao["coorte_tipo"].isna()].drop_duplicates(["coorte_ano", "orgao"])
+                .groupby("orgao")["n_coorte"].sum().sort_values(ascending=False).index.tolist()
+            )
+            orgao_sel = st.selectbox("Órgão da coorte", ["Todos"] + orgaos, key="sel_jornada_orgao")
+            sel = coortes[coortes["orgao"].isna()] if orgao_sel == "Todos" else por_orgao[por_orgao["orgao"] == orgao_sel]
+
+            def _fig_coortes():
+                if sel.empty:
+                    return None
+                tipo_coorte = sel["coorte_tipo"].astype(str).where(sel["coorte_tipo"].notna(), "Todos os tipos")
+                linhas = sel["coorte_ano"].astype(str) + " · " + tipo_coorte + " (" + sel["n_coorte"].map(fmt_br) + ")"
+                colunas = sel["ano"].astype(str) + " · " + sel["tipo"].astype(str).where(sel["tipo"].notna(), "Qualquer")
+                matriz = sel.assign(coorte=linhas, destino=colunas).pivot_table(
+                    index="coorte", columns="destino", values="taxa_retencao", aggfunc="sum",
+                )
+                fig_coortes = px.imshow(
+                    matriz, text_auto=".1f", color_continuous_scale="Teal", aspect="auto",
+                    labels={"color": "Retenção (%)", "x": "Voltou em", "y": "Coorte"},
+                )
+                return style_fig(fig_coortes, height=360)
+            fig_coortes = figura("tl_jornada_coortes", (orgao_sel,), _fig_coortes)
+            if fig_coortes is None:
+                st.info("Sem coortes para o órgão selecionado.")
+            else:
+                st.plotly_chart(fig_coortes, use_container_width=True, key="tl_jornada_coortes")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Retenção por órgão: qualquer retorno no ano seguinte à coorte
+        st.markdown('<div class="panel"><h3>Retenção por Órgão (retorno no ano seguinte)</h3>', unsafe_allow_html=True)
+        seguinte = coortes[
+            coortes["orgao"].notna() & coortes["coorte_tipo"].isna() & coortes["tipo"].isna()
+            & (coortes["ano"] == coortes["coorte_ano"] + 1)
+        ]
+        if seguinte.empty:
+            st.info("Ainda não há ano seguinte às coortes para medir retenção.")
+        else:
+            min_coorte = st.slider("Tamanho mínimo da coorte", 5, 50, 10, key="sl_jornada_min")
+            def _fig_ret_org():
+                # uma linha por órgão × ano da coorte; somar anos não repete pessoas
+                ret = seguinte.groupby("orgao")[["n_coorte", "n_retidos"]].sum()
+                ret = ret[ret["n_coorte"] >= min_coorte]
+                if ret.empty:
+                    return None
+                ret["taxa_retencao"] = (ret["n_retidos"] / ret["n_coorte"] * 100).round(1)
+                ret = ret.sort_values("taxa_retencao").tail(20).reset_index()
+                fig_ret_org = px.bar(
+                    ret, x="taxa_retencao", y="orgao", orientation="h",
+                    text="taxa_retencao", hover_data=["n_coorte", "n_retidos"],
+                    labels={"taxa_retencao": "Retenção (%)", "orgao": "Órgão"},
+                )
+                fig_ret_org.update_traces(texttemplate="%{x:.1f}%", textposition="outside", cliponaxis=False)
+                return style_fig(fig_ret_org, height=520)
+            fig_ret_org = figura("tl_jornada_orgao", (min_coorte,), _fig_ret_org)
+            if fig_ret_org is None:
+                st.info("Nenhum órgão com coorte do tamanho mínimo.")
+            else:
+                st.plotly_chart(fig_ret_org, use_container_width=True, key="tl_jornada_orgao")
         st.markdown('</div>', unsafe_allow_html=True)
 
 
@@ -9,13 +9,27 @@ Uso com XLSX (múltiplos anos em abas separadas):
     uv run preparar_dados.py --input capacitia-dados.xlsx --ano todos
     uv run preparar_dados.py --input capacitia-dados.xlsx --ano 2026
 
+Uso direto (sem CSV intermediário):
+    uv run preparar_dados.py --input capacitia-dados.xlsx --direto
+    uv run preparar_dados.py --input capacitia-dados.xlsx --direto --output auditoria.csv
+
+Com --direto o DataFrame padronizado vai em memória para o
+CapacitiaCSVProcessor e é publicado como um novo snapshot em .data/processed;
+o CSV só é gravado se --output for informado (artefato de auditoria).
+
+As abas "AAAA DADOS" são descobertas automaticamente e lidas em paralelo no
+modo streaming do openpyxl (``--leitura pandas`` usa o leitor antigo).
+
 Saída:
-    .data/raw/dados_gerais_capacitia.csv  (sobrescreve com coluna ANO adicionada)
+    .data/raw/dados_gerais_capacitia.csv  (sobrescreve com coluna ANO adicionada),
+    o único arquivo que src/process_csv_to_parquet.py lê; sem CSV, use --direto
 """
 
 import pandas as pd
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import os
 import sys
 import re
 
@@ -23,7 +37,15 @@ import re
 # CONFIGURAÇÕES
 # ============================================================
 
+DEFAULT_OUTPUT = ".data/raw/dados_gerais_capacitia.csv"
+
 HEADER_ROW = 6  # linha do cabeçalho real no XLSX (0-indexed)
+HEADER_SCAN_ROWS = 20  # até onde procurar o cabeçalho no modo streaming
+
+# Mesmos marcadores de ausência que o pd.read_excel converte para vazio
+NA_STRINGS = {"NA", "N/A", "n/a", "#N/A", "#NA", "NULL", "null", "NaN", "nan", "-NaN", "-nan", "None", "<NA>"}
+
+ABA_ANO_RE = re.compile(r"^\s*(\d{4})\s+DADOS\s*$", re.IGNORECASE)
 
 COLUNAS_MAP = {
     "EVENTO":              "EVENTO",
@@ -110,7 +132,7 @@ def ler_csv(caminho: Path, ano_fixo: str) -> pd.DataFrame:
                 break
 
     # Limpar linhas vazias e de total
-    df = df[df.apply(lambda r: r.astype(str).str.strip().ne("").any(), axis=1)]
+    df = df[df.apply(lambda col: col.astype(str).str.strip().ne("")).any(axis=1)]
     df = df[~df.iloc[:, 0].astype(str).str.upper().str.contains("TOTAL|SUBTOTAL", na=False)]
     df = df.apply(lambda col: col.str.strip() if col.dtype == object else col)
 
@@ -139,11 +161,111 @@ def ler_csv(caminho: Path, ano_fixo: str) -> pd.DataFrame:
     return df
 
 
+def descobrir_abas_anos(caminho: Path) -> list:
+    """Lista as abas "AAAA DADOS" do XLSX como (aba, ano), em ordem de ano."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(caminho, read_only=True)
+    try:
+        nomes = wb.sheetnames
+    finally:
+        wb.close()
+    abas = [(n, m.group(1)) for n in nomes if (m := ABA_ANO_RE.match(n))]
+    return sorted(abas, key=lambda a: a[1])
+
+
+def _celula_str(valor) -> str:
+    if valor is None:
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    texto = str(valor)
+    return "" if texto in NA_STRINGS else texto.strip()
+
+
+def ler_aba_xlsx_streaming(caminho: Path, aba: str, ano_str: str) -> pd.DataFrame:
+    """Lê uma aba do XLSX linha a linha (openpyxl read-only) e adiciona coluna ANO.
+
+    O cabeçalho é localizado pela linha que contém EVENTO e FORMATO; linhas
+    vazias e de TOTAL/SUBTOTAL são descartadas durante a leitura.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = wb[aba].iter_rows(values_only=True)
+        colunas = None
+        for i, row in enumerate(linhas):
+            vals = [_celula_str(v) for v in row]
+            upper = [v.upper() for v in vals]
+            if "EVENTO" in upper and "FORMATO" in upper:
+                colunas = vals
+                break
+            if i >= HEADER_SCAN_ROWS:
+                raise ValueError(f"cabeçalho (EVENTO/FORMATO) não encontrado nas {HEADER_SCAN_ROWS} primeiras linhas")
+        if colunas is None:
+            raise ValueError("aba vazia")
+
+        registros = []
+        for row in linhas:
+            vals = [_celula_str(v) for v in row[:len(colunas)]]
+            if not any(vals):
+                continue
+            if re.search("TOTAL|SUBTOTAL", vals[0].upper()):
+                continue
+            registros.append(vals)
+    finally:
+        wb.close()
+
+    df = pd.DataFrame(registros, columns=colunas, dtype=str)
+    df = df.loc[:, [c != "" for c in df.columns]]
+    df["ANO"] = ano_str
+    print(f"  [{aba}] {len(df)} registros lidos → ANO={ano_str}")
+    return df
+
+
+def _ler_e_padronizar_aba(args) -> pd.DataFrame:
+    caminho, aba, ano_str = args
+    return padronizar(ler_aba_xlsx_streaming(caminho, aba, ano_str))
+
+
+def ler_xlsx_paralelo(caminho: Path, abas_anos: list, workers: int = 0) -> list:
+    """Lê e padroniza várias abas em processos separados (ordem preservada).
+
+    Abas com erro são ignoradas com aviso, como no leitor sequencial.
+    """
+    workers = workers or min(len(abas_anos), os.cpu_count() or 1)
+    tarefas = [(caminho, aba, ano_str) for aba, ano_str in abas_anos]
+    frames = []
+    if workers <= 1 or len(tarefas) <= 1:
+        resultados = []
+        for t in tarefas:
+            try:
+                resultados.append(_ler_e_padronizar_aba(t))
+            except Exception as e:
+                resultados.append(e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = [pool.submit(_ler_e_padronizar_aba, t) for t in tarefas]
+            resultados = []
+            for f in futuros:
+                try:
+                    resultados.append(f.result())
+                except Exception as e:
+                    resultados.append(e)
+    for (aba, _), res in zip(abas_anos, resultados):
+        if isinstance(res, Exception):
+            print(f"  ⚠️  Aba '{aba}' ignorada: {res}")
+        else:
+            frames.append(res)
+    return frames
+
+
 def ler_aba_xlsx(caminho: Path, aba: str, ano_str: str) -> pd.DataFrame:
     """Lê uma aba do XLSX e adiciona coluna ANO."""
     df = pd.read_excel(caminho, sheet_name=aba, header=HEADER_ROW, dtype=str)
     df = df.fillna("")
-    df = df[df.apply(lambda r: r.astype(str).str.strip().ne("").any(), axis=1)]
+    df = df[df.apply(lambda col: col.astype(str).str.strip().ne("")).any(axis=1)]
     df = df[~df.iloc[:, 0].astype(str).str.upper().str.contains("TOTAL|SUBTOTAL", na=False)]
     df = df.apply(lambda col: col.str.strip() if col.dtype == object else col)
     df["ANO"] = ano_str
@@ -218,6 +340,18 @@ def resumo(df: pd.DataFrame):
             print(f"     • {org}: {cnt}")
 
 
+def processar_direto(df: pd.DataFrame):
+    """Passa o DataFrame padronizado direto para o pipeline de Parquets."""
+    from src.data.snapshots import snapshot_transaction
+    from src.process_csv_to_parquet import CapacitiaCSVProcessor, processar_dependentes
+
+    base_path = Path(__file__).resolve().parent
+    with snapshot_transaction(base_path / ".data" / "processed") as staging:
+        CapacitiaCSVProcessor(base_path, processed_path=staging).process_all(df)
+        processar_dependentes(staging, base_path / "relatorio")
+    print(f"\n✅ Parquets publicados a partir de {len(df)} registros (sem CSV intermediário)")
+
+
 # ============================================================
 # MAIN
 # ============================================================
@@ -238,15 +372,35 @@ def main():
             "Ano dos dados:\n"
             "  2025    → marca todos como 2025\n"
             "  2026    → marca todos como 2026\n"
-            "  todos   → lê abas '2025 DADOS' e '2026 DADOS' (somente XLSX)\n"
+            "  todos   → lê todas as abas 'AAAA DADOS' (somente XLSX)\n"
             "  inferir → extrai o ano do nome do evento (padrão)"
         ),
     )
     parser.add_argument(
-        "--output", default=".data/raw/dados_gerais_capacitia.csv",
-        help="Destino do CSV (padrão: .data/raw/dados_gerais_capacitia.csv)",
+        "--output", default=None,
+        help=f"Destino do CSV (padrão: {DEFAULT_OUTPUT};\n"
+             "com --direto só é gravado se informado)",
+    )
+    parser.add_argument(
+        "--direto", action="store_true",
+        help="Processa em memória até os Parquets de .data/processed,\n"
+             "sem reler o CSV (equivale a rodar src/process_csv_to_parquet.py)",
+    )
+    parser.add_argument(
+        "--leitura", choices=["streaming", "pandas"], default="streaming",
+        help=(
+            "Leitor do XLSX:\n"
+            "  streaming → openpyxl read-only, abas em paralelo (padrão)\n"
+            "  pandas    → pd.read_excel, abas em sequência"
+        ),
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="Processos para ler as abas no modo streaming (padrão: uma por aba)",
     )
     args = parser.parse_args()
+    if args.output and Path(args.output).suffix.lower() != ".csv":
+        parser.error("--output deve ser um .csv; para gerar os Parquets direto, use --direto")
 
     caminho = _resolve_path(args.input)
     if not caminho.exists():
@@ -272,18 +426,21 @@ def main():
         frames.append(padronizar(df))
 
     elif sufixo in (".xlsx", ".xls"):
-        abas_anos = (
-            [("2025 DADOS", "2025"), ("2026 DADOS", "2026")]
-            if args.ano in ("todos", "inferir")
-            else [(f"{args.ano} DADOS", args.ano)]
-        )
-        for aba, ano_str in abas_anos:
-            try:
-                print(f"\n📋 Processando aba: '{aba}'")
-                df_aba = ler_aba_xlsx(caminho, aba, ano_str)
-                frames.append(padronizar(df_aba))
-            except Exception as e:
-                print(f"  ⚠️  Aba '{aba}' ignorada: {e}")
+        abas_anos = descobrir_abas_anos(caminho)
+        if args.ano not in ("todos", "inferir"):
+            abas_anos = [(aba, ano_str) for aba, ano_str in abas_anos if ano_str == args.ano]
+        print(f"📋 Abas: {[aba for aba, _ in abas_anos]}")
+
+        if args.leitura == "streaming":
+            frames = ler_xlsx_paralelo(caminho, abas_anos, args.workers)
+        else:
+            for aba, ano_str in abas_anos:
+                try:
+                    print(f"\n📋 Processando aba: '{aba}'")
+                    df_aba = ler_aba_xlsx(caminho, aba, ano_str)
+                    frames.append(padronizar(df_aba))
+                except Exception as e:
+                    print(f"  ⚠️  Aba '{aba}' ignorada: {e}")
         if not frames:
             print("❌ Nenhuma aba processada com sucesso.")
             sys.exit(1)
@@ -293,9 +450,21 @@ def main():
 
     df_final = pd.concat(frames, ignore_index=True)
     resumo(df_final)
-    salvar_csv(df_final, Path(args.output))
+
+    if args.direto:
+        if args.output:
+            salvar_csv(df_final, Path(args.output))
+        processar_direto(df_final)
+        print("\n✅ Próximo passo:")
+        print("   streamlit run app.py")
+        return
+
+    destino = Path(args.output or DEFAULT_OUTPUT)
+    salvar_csv(df_final, destino)
 
     print("\n✅ Próximos passos:")
+    if destino.resolve() != Path(DEFAULT_OUTPUT).resolve():
+        print(f"   src/process_csv_to_parquet.py lê {DEFAULT_OUTPUT}; copie {destino} para lá")
     print("   python src/process_csv_to_parquet.py")
     print("   streamlit run app.py")
 
@@ -1,8 +1,11 @@
 import pandas as pd
+from pathlib import Path
 
-# Carregar dados
-df = pd.read_parquet('.data/processed/dados.parquet')
-externos = df[df['orgao_externo'] == 'Sim']
+from data.snapshots import resolve_processed_path
+
+# Carregar dados (snapshot publicado)
+df = pd.read_parquet(resolve_processed_path(Path('.data/processed')) / 'dados.parquet')
+externos = df[df['orgao_externo']]
 
 # Filtrar apenas os órgãos de interesse
 orgaos_interesse = ['PRF', 'MPPI', 'Câmara Municipal']
@@ -13,7 +16,7 @@ print('=== MÉTRICAS DOS ÓRGÃOS EXTERNOS ===\n')
 for orgao in orgaos_interesse:
     dados_orgao = dados_interesse[dados_interesse['orgao'] == orgao]
     if len(dados_orgao) > 0:
-        certificados = len(dados_orgao[dados_orgao['certificado'] == 'Sim'])
+        certificados = int(dados_orgao['certificado'].sum())
         taxa_cert = certificados / len(dados_orgao) * 100
         
         print(f'--- {orgao} ---')
@@ -53,8 +56,8 @@ for orgao_previsto in orgaos_previstos:
 print('=== RESUMO GERAL DOS ÓRGÃOS EXTERNOS ===')
 print(f'Total de órgãos externos atendidos: {externos["orgao"].nunique()}')
 print(f'Total de participantes de órgãos externos: {len(externos)}')
-print(f'Total de certificados emitidos para órgãos externos: {len(externos[externos["certificado"] == "Sim"])}')
+print(f'Total de certificados emitidos para órgãos externos: {int(externos["certificado"].sum())}')
 if len(externos) > 0:
-    print(f'Taxa geral de certificação órgãos externos: {len(externos[externos["certificado"] == "Sim"]) / len(externos) * 100:.2f}%')
+    print(f'Taxa geral de certificação órgãos externos: {int(externos["certificado"].sum()) / len(externos) * 100:.2f}%')
 else:
     print(f'Taxa geral de certificação órgãos externos: 0%')
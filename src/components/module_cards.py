@@ -9,8 +9,92 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.utils.constants import MODULES, COLORS
 
+# Emitido uma vez por página por src/utils/bootstrap.py
+MODULE_CARD_CSS = f"""
+.module-card {{
+    background: {COLORS['background']};
+    border: 1px solid {COLORS['border']};
+    border-radius: 16px;
+    padding: 32px;
+    margin: 16px 0;
+    transition: all 0.3s ease;
+    box-shadow: 0 4px 24px rgba(0,0,0,.25);
+}}
+.module-card:hover {{
+    transform: translateY(-4px);
+    box-shadow: 0 8px 32px rgba(125,211,252,.15);
+    border-color: {COLORS['primary']};
+}}
+.module-icon {{
+    font-size: 64px;
+    text-align: center;
+    margin-bottom: 16px;
+    animation: pulse 2s ease-in-out infinite;
+}}
+@keyframes pulse {{
+    0%, 100% {{ transform: scale(1); }}
+    50% {{ transform: scale(1.05); }}
+}}
+.module-title {{
+    font-size: 24px;
+    font-weight: 700;
+    color: {COLORS['text']};
+    text-align: center;
+    margin-bottom: 12px;
+}}
+.module-description {{
+    font-size: 14px;
+    color: {COLORS['muted']};
+    text-align: center;
+    margin-bottom: 24px;
+    line-height: 1.6;
+}}
+.module-kpis {{
+    display: flex;
+    justify-content: space-around;
+    margin: 24px 0;
+    padding: 16px 0;
+    border-top: 1px solid {COLORS['border']};
+    border-bottom: 1px solid {COLORS['border']};
+}}
+.module-kpi {{
+    text-align: center;
+}}
+.module-kpi-value {{
+    font-size: 20px;
+    font-weight: 700;
+    color: {COLORS['primary']};
+    display: block;
+}}
+.module-kpi-label {{
+    font-size: 12px;
+    color: {COLORS['muted']};
+    margin-top: 4px;
+}}
+.module-button {{
+    width: 100%;
+    padding: 12px 24px;
+    background: linear-gradient(135deg, {COLORS['primary']}, {COLORS['secondary']});
+    border: none;
+    border-radius: 8px;
+    color: white;
+    font-weight: 600;
+    font-size: 16px;
+    cursor: pointer;
+    transition: all 0.3s ease;
+    text-align: center;
+    text-decoration: none;
+    display: block;
+}}
+.module-button:hover {{
+    transform: scale(1.02);
+    box-shadow: 0 4px 16px rgba(125,211,252,.3);
+}}
+"""
+
+
 def render_module_card(module_key: str, kpis: dict = None):
-    """Renderiza um card de módulo estilizado."""
+    """Renderiza um card de módulo estilizado (CSS em MODULE_CARD_CSS)."""
     module = MODULES[module_key]
     
     # KPIs padrão se não fornecidos
@@ -21,109 +105,22 @@ def render_module_card(module_key: str, kpis: dict = None):
             'extra': '',
         }
     
-    # Estilos inline para o card
-    card_style = f"""
-    <style>
-    .module-card-{module_key} {{
-        background: {COLORS['background']};
-        border: 1px solid {COLORS['border']};
-        border-radius: 16px;
-        padding: 32px;
-        margin: 16px 0;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 24px rgba(0,0,0,.25);
-    }}
-    .module-card-{module_key}:hover {{
-        transform: translateY(-4px);
-        box-shadow: 0 8px 32px rgba(125,211,252,.15);
-        border-color: {COLORS['primary']};
-    }}
-    .module-icon-{module_key} {{
-        font-size: 64px;
-        text-align: center;
-        margin-bottom: 16px;
-        animation: pulse 2s ease-in-out infinite;
-    }}
-    @keyframes pulse {{
-        0%, 100% {{ transform: scale(1); }}
-        50% {{ transform: scale(1.05); }}
-    }}
-    .module-title-{module_key} {{
-        font-size: 24px;
-        font-weight: 700;
-        color: {COLORS['text']};
-        text-align: center;
-        margin-bottom: 12px;
-    }}
-    .module-description-{module_key} {{
-        font-size: 14px;
-        color: {COLORS['muted']};
-        text-align: center;
-        margin-bottom: 24px;
-        line-height: 1.6;
-    }}
-    .module-kpis-{module_key} {{
-        display: flex;
-        justify-content: space-around;
-        margin: 24px 0;
-        padding: 16px 0;
-        border-top: 1px solid {COLORS['border']};
-        border-bottom: 1px solid {COLORS['border']};
-    }}
-    .module-kpi-{module_key} {{
-        text-align: center;
-    }}
-    .module-kpi-value-{module_key} {{
-        font-size: 20px;
-        font-weight: 700;
-        color: {COLORS['primary']};
-        display: block;
-    }}
-    .module-kpi-label-{module_key} {{
-        font-size: 12px;
-        color: {COLORS['muted']};
-        margin-top: 4px;
-    }}
-    .module-button-{module_key} {{
-        width: 100%;
-        padding: 12px 24px;
-        background: linear-gradient(135deg, {COLORS['primary']}, {COLORS['secondary']});
-        border: none;
-        border-radius: 8px;
-        color: white;
-        font-weight: 600;
-        font-size: 16px;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        text-align: center;
-        text-decoration: none;
-        display: block;
-    }}
-    .module-button-{module_key}:hover {{
-        transform: scale(1.02);
-        box-shadow: 0 4px 16px rgba(125,211,252,.3);
-    }}
-    </style>
-    """
-    
-    st.markdown(card_style, unsafe_allow_html=True)
-    
     # Renderizar o card
     card_html = f"""
-    <div class="module-card-{module_key}">
-        <div class="module-icon-{module_key}">{module['icon']}</div>
-        <div class="module-title-{module_key}">{module['name']}</div>
-        <div class="module-description-{module_key}">{module['description']}</div>
-        <div class="module-kpis-{module_key}">
-            <div class="module-kpi-{module_key}">
-                <span class="module-kpi-value-{module_key}">📊 {kpis['participantes']:,}</span>
-                <span class="module-kpi-label-{module_key}">Participantes</span>
+    <div class="module-card">
+        <div class="module-icon">{module['icon']}</div>
+        <div class="module-title">{module['name']}</div>
+        <div class="module-description">{module['description']}</div>
+        <div class="module-kpis">
+            <div class="module-kpi">
+                <span class="module-kpi-value">📊 {kpis['participantes']:,}</span>
+                <span class="module-kpi-label">Participantes</span>
             </div>
-            <div class="module-kpi-{module_key}">
-                <span class="module-kpi-value-{module_key}">✅ {kpis['eventos']}</span>
-                <span class="module-kpi-label-{module_key}">Eventos</span>
+            <div class="module-kpi">
+                <span class="module-kpi-value">✅ {kpis['eventos']}</span>
+                <span class="module-kpi-label">Eventos</span>
             </div>
-            {f'<div class="module-kpi-{module_key}"><span class="module-kpi-value-{module_key}">{kpis["extra"]}</span></div>' if kpis.get('extra') else ''}
+            {f'<div class="module-kpi"><span class="module-kpi-value">{kpis["extra"]}</span></div>' if kpis.get('extra') else ''}
         </div>
     </div>
     """
@@ -0,0 +1,68 @@
+"""Cópias Arrow IPC (Feather v2) dos Parquets de cada snapshot.
+
+Ao publicar um snapshot, cada ``<nome>.parquet`` ganha um
+``arrow/<nome>.arrow`` sem compressão. Esse formato pode ser lido com memory
+map: vários processos do dashboard (ex.: réplicas atrás de um balanceador)
+compartilham as mesmas páginas do cache do sistema operacional, e colunas
+numéricas viram views sobre o arquivo em vez de cópias.
+
+Snapshots antigos sem a pasta ``arrow/`` continuam sendo lidos dos Parquets.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+ARROW_DIR = "arrow"
+ARROW_SUFFIX = ".arrow"
+
+
+def arrow_path(snapshot_dir: Path, name: str) -> Path:
+    return Path(snapshot_dir) / ARROW_DIR / f"{name}{ARROW_SUFFIX}"
+
+
+def has_arrow(snapshot_dir: Path, name: str) -> bool:
+    return arrow_path(snapshot_dir, name).exists()
+
+
+def export_arrow(snapshot_dir: Path) -> List[str]:
+    """Grava ``arrow/<nome>.arrow`` para cada Parquet do diretório."""
+    snapshot_dir = Path(snapshot_dir)
+    destino = snapshot_dir / ARROW_DIR
+    destino.mkdir(exist_ok=True)
+
+    gerados = []
+    for parquet_file in sorted(snapshot_dir.glob("*.parquet")):
+        target = destino / f"{parquet_file.stem}{ARROW_SUFFIX}"
+        tmp = target.with_name(f".{target.name}.tmp")
+        # Sem compressão: só assim o memory map devolve os buffers sem cópia
+        feather.write_feather(pq.read_table(parquet_file), tmp, compression="uncompressed")
+        os.replace(tmp, target)
+        gerados.append(target.name)
+
+    logger.info(f"Cache Arrow gerado: {len(gerados)} arquivos em {destino}")
+    return gerados
+
+
+def read_arrow_table(snapshot_dir: Path, name: str, columns: Optional[Sequence[str]] = None) -> pa.Table:
+    """Abre ``arrow/<nome>.arrow`` com memory map (colunas inexistentes são ignoradas)."""
+    path = arrow_path(snapshot_dir, name)
+    if columns is not None:
+        with pa.memory_map(str(path)) as source:
+            disponiveis = set(pa.ipc.open_file(source).schema.names)
+        columns = [c for c in columns if c in disponiveis]
+    return feather.read_table(path, columns=columns, memory_map=True)
+
+
+def read_arrow_frame(snapshot_dir: Path, name: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """DataFrame sobre o arquivo mapeado; colunas numéricas sem nulos não são copiadas."""
+    table = read_arrow_table(snapshot_dir, name, columns)
+    return table.to_pandas(split_blocks=True)
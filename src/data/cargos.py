@@ -0,0 +1,17 @@
+"""Inscritos por evento × cargo em formato longo (cargos_eventos.parquet).
+
+Uma linha por ano/evento/tipo/órgão/órgão externo/cargo, só combinações
+existentes; a aba Cargos filtra e soma estas contagens em vez de pivotar
+dados.parquet a cada rerun.
+"""
+
+import pandas as pd
+
+CHAVES_CARGOS_EVENTOS = ["ano", "evento", "tipo", "orgao", "orgao_externo", "cargo"]
+
+
+def build_cargos_eventos(df_dados: pd.DataFrame) -> pd.DataFrame:
+    """Monta cargos_eventos.parquet a partir de dados.parquet (já tipado)."""
+    base = df_dados[df_dados["cargo"].astype(str).str.strip() != ""]
+    contagens = base.groupby(CHAVES_CARGOS_EVENTOS, observed=True).size()
+    return contagens.rename("inscritos").astype("int32").reset_index()
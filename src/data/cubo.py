@@ -0,0 +1,80 @@
+"""Cubo de KPIs de Servidores com contagens distintas mescláveis.
+
+Cada célula (ano × tipo × órgão externo × órgão) guarda somas de inscritos e
+certificados e, para as colunas de DISTINTOS, um bitset exato sobre o
+dicionário de valores (bit i = valor i presente na célula). Distintos de
+qualquer combinação de filtros = popcount do OR dos bitsets das células
+selecionadas, sem varrer dados.parquet. Órgãos e eventos ocupam poucas
+dezenas de bytes por célula e participantes (``participante_id``) poucas
+centenas, então não há necessidade de HyperLogLog.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+CUBO_CHAVES = ["ano", "tipo", "orgao_externo", "orgao"]
+
+# nome do bitset → coluna de dados.parquet
+DISTINTOS = {"orgaos": "orgao", "eventos": "evento", "participantes": "participante_id"}
+
+
+def _bitsets(celula: np.ndarray, valores: pd.Series, n_celulas: int) -> list:
+    codigos, dominio = pd.factorize(valores, sort=True)
+    matriz = np.zeros((n_celulas, max(len(dominio), 1)), dtype=bool)
+    validos = codigos >= 0
+    matriz[celula[validos], codigos[validos]] = True
+    return [linha.tobytes() for linha in np.packbits(matriz, axis=1, bitorder="little")]
+
+
+def build_cubo(df_dados: pd.DataFrame) -> pd.DataFrame:
+    """Monta cubo_servidores.parquet a partir de dados.parquet (já tipado)."""
+    grupos = df_dados.groupby(CUBO_CHAVES, observed=True)
+    cubo = grupos.agg(
+        n_inscritos=("certificado", "size"),
+        n_certificados=("certificado", "sum"),
+    ).reset_index()
+    cubo = cubo.astype({"n_inscritos": "int32", "n_certificados": "int32"})
+
+    # ngroup numera as células na mesma ordem do agg acima
+    celula = grupos.ngroup().to_numpy()
+    for nome, coluna in DISTINTOS.items():
+        valores = df_dados[coluna]
+        if not pd.api.types.is_integer_dtype(valores):
+            valores = valores.astype(str)
+        cubo[nome] = _bitsets(celula, valores, len(cubo))
+    return cubo
+
+
+def contar_distintos(bitsets: pd.Series) -> int:
+    """Popcount do OR de uma coleção de bitsets do mesmo dicionário."""
+    if bitsets.empty:
+        return 0
+    largura = len(bitsets.iloc[0])
+    matriz = np.frombuffer(b"".join(bitsets), dtype=np.uint8).reshape(-1, largura)
+    return int(np.unpackbits(np.bitwise_or.reduce(matriz, axis=0)).sum())
+
+
+def resumo_cubo(
+    cubo: pd.DataFrame,
+    ano: Optional[int] = None,
+    tipo: Optional[str] = None,
+    orgao_externo: Optional[bool] = None,
+    orgao: Optional[str] = None,
+) -> dict:
+    """KPIs das células que atendem aos filtros (None = todos)."""
+    mask = pd.Series(True, index=cubo.index)
+    for coluna, valor in zip(CUBO_CHAVES, (ano, tipo, orgao_externo, orgao)):
+        if valor is not None:
+            mask &= cubo[coluna] == valor
+    celulas = cubo[mask]
+
+    resumo = {
+        "n_inscritos": int(celulas["n_inscritos"].sum()),
+        "n_certificados": int(celulas["n_certificados"].sum()),
+    }
+    for nome in DISTINTOS:
+        # cubos de snapshots antigos não têm todos os bitsets
+        resumo[nome] = contar_distintos(celulas[nome]) if nome in celulas else None
+    return resumo
@@ -0,0 +1,92 @@
+"""Jornadas dos participantes entre anos e tipos de evento.
+
+A sequência de cada participante são as células (ano, tipo) em que ele
+aparece em dados.parquet, numeradas por ano ativo (``passo``). A planilha não
+tem datas comparáveis entre tipos dentro de um ano, então a ordem é anual.
+
+- coortes.parquet: a coorte de um participante são os tipos do seu primeiro
+  ano. Para cada ano posterior × tipo (nulo = qualquer tipo) conta quantos
+  da coorte voltaram, no total e por órgão da coorte (``orgao`` nulo = todos).
+  ``coorte_tipo`` nulo é a coorte do ano inteiro, em pessoas distintas (quem
+  fez dois tipos no primeiro ano conta uma vez); somar as linhas por tipo
+  contaria essa pessoa em cada uma.
+- transicoes.parquet: de (ano, tipo) no passo k para (ano, tipo) no passo
+  k + 1, em participantes distintos; ``para_tipo = SAIDA`` fecha o funil
+  (exceto no último ano, que ainda não tem ano seguinte).
+"""
+
+import pandas as pd
+
+SAIDA = "Não voltou"
+
+_ID = "participante_id"
+
+
+def sequencias(df_dados: pd.DataFrame) -> pd.DataFrame:
+    """Uma linha por participante × ano × tipo, com o ``passo`` (ano ativo 1, 2, ...)."""
+    df = df_dados.loc[df_dados[_ID].notna(), [_ID, "ano", "tipo", "orgao"]]
+    seq = df.groupby([_ID, "ano", "tipo"], observed=True).agg(orgao=("orgao", "first")).reset_index()
+    seq = seq.astype({"tipo": "string", "orgao": "string"})
+    seq["passo"] = seq.groupby(_ID)["ano"].rank(method="dense").astype("int16")
+    return seq
+
+
+def _qualquer_tipo(df: pd.DataFrame, chaves: list, coluna: str) -> pd.DataFrame:
+    """Uma linha por ``chaves`` com ``coluna`` nula (já tipada, para o concat)."""
+    return df.drop_duplicates(chaves).assign(**{coluna: pd.NA}).astype({coluna: "string"})
+
+
+def build_coortes(df_dados: pd.DataFrame) -> pd.DataFrame:
+    """Monta coortes.parquet: retenção da coorte (1º ano × tipo) em cada ano posterior × tipo."""
+    seq = sequencias(df_dados)
+    coorte = seq.loc[seq["passo"] == 1, [_ID, "ano", "tipo", "orgao"]].rename(
+        columns={"ano": "coorte_ano", "tipo": "coorte_tipo"}
+    )
+    # coorte "qualquer tipo" = uma linha por participante, coorte_tipo nulo
+    coorte = pd.concat([coorte, _qualquer_tipo(coorte, [_ID], "coorte_tipo")], ignore_index=True)
+    depois = seq.loc[seq["passo"] > 1, [_ID, "ano", "tipo"]]
+    # "qualquer tipo" no ano = uma linha por participante × ano, tipo nulo
+    depois = pd.concat([depois, _qualquer_tipo(depois, [_ID, "ano"], "tipo")], ignore_index=True)
+    pares = coorte.merge(depois, on=_ID)
+    destinos = depois[["ano", "tipo"]].drop_duplicates()
+
+    partes = []
+    for chaves in (["coorte_ano", "coorte_tipo", "orgao"], ["coorte_ano", "coorte_tipo"]):
+        tamanho = coorte.groupby(chaves, dropna=False).size().rename("n_coorte").reset_index()
+        if "orgao" in chaves:
+            tamanho = tamanho[tamanho["orgao"].notna()]
+        retidos = pares.groupby([*chaves, "ano", "tipo"], dropna=False).size().rename("n_retidos").reset_index()
+        # grade completa: destinos sem retorno aparecem com zero
+        grade = tamanho.merge(destinos, how="cross")
+        grade = grade[grade["ano"] > grade["coorte_ano"]]
+        partes.append(grade.merge(retidos, on=[*chaves, "ano", "tipo"], how="left"))
+
+    df = pd.concat(partes, ignore_index=True)
+    df["n_retidos"] = df["n_retidos"].fillna(0)
+    df = df.astype({
+        "coorte_ano": "int16", "coorte_tipo": "category", "orgao": "string", "ano": "int16",
+        "tipo": "category", "n_coorte": "int32", "n_retidos": "int32",
+    })
+    df["taxa_retencao"] = (df["n_retidos"] / df["n_coorte"] * 100).round(2)
+    df = df.sort_values(["coorte_ano", "coorte_tipo", "orgao", "ano", "tipo"], na_position="first", kind="stable")
+    return df[["coorte_ano", "coorte_tipo", "orgao", "ano", "tipo", "n_coorte", "n_retidos", "taxa_retencao"]].reset_index(drop=True)
+
+
+def build_transicoes(df_dados: pd.DataFrame) -> pd.DataFrame:
+    """Monta transicoes.parquet: participantes que passam de uma célula à do ano ativo seguinte."""
+    seq = sequencias(df_dados)[[_ID, "passo", "ano", "tipo"]]
+    seguinte = seq.assign(passo=seq["passo"] - 1).rename(columns={"ano": "para_ano", "tipo": "para_tipo"})
+    pares = seq.merge(seguinte, on=[_ID, "passo"], how="left")
+    # no último ano ninguém teve chance de voltar: sem linha de saída
+    pares = pares[pares["para_tipo"].notna() | (pares["ano"] < seq["ano"].max())]
+    pares["para_tipo"] = pares["para_tipo"].fillna(SAIDA)
+
+    df = (
+        pares.groupby(["passo", "ano", "tipo", "para_ano", "para_tipo"], dropna=False)
+        .size().rename("n_participantes").reset_index()
+        .rename(columns={"ano": "de_ano", "tipo": "de_tipo"})
+    )
+    return df.astype({
+        "passo": "int16", "de_ano": "int16", "de_tipo": "category", "para_ano": "Int16",
+        "para_tipo": "category", "n_participantes": "int32",
+    })
@@ -0,0 +1,159 @@
+"""Adaptador da planilha consolidada antiga (formato original do Excel).
+
+As abas VISÃO ABERTA, SECRETARIAS-MASTERCLASS e CARGOS-INCRITOS têm
+cabeçalho fora da primeira linha, linhas "TOTAL GERAL"/"ATIVIDADE/EVENTO"
+e números no formato pt-BR. Tudo isso é resolvido aqui, na ingestão, e o
+resultado sai no schema dos Parquets (visao_aberta, secretarias,
+cargos_eventos); as páginas só leem o formato canônico.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+try:
+    from src.data.schema import evento_campos
+    from src.utils.helpers import empty_labels_mask, parse_ptbr_series
+except ImportError:
+    from data.schema import evento_campos
+    from utils.helpers import empty_labels_mask, parse_ptbr_series
+
+# Parquet de destino → aba da planilha antiga
+ABAS_LEGADAS = {
+    "visao_aberta": "VISÃO ABERTA",
+    "secretarias": "SECRETARIAS-MASTERCLASS",
+    "cargos_eventos": "CARGOS-INCRITOS",
+}
+
+# A planilha antiga não traz órgão por cargo
+ORGAO_LEGADO = "Outro"
+
+_META_RE = r"ATIVIDADE/EVENTO|TOTAL GERAL|^TOTAL$"
+_EVENTO_RE = r"Masterclass|Workshop|Curso"
+
+
+def _coluna(df: pd.DataFrame, *chaves: str) -> Optional[str]:
+    """Primeira coluna cujo título contém todas as ``chaves``."""
+    for col in df.columns:
+        nome = str(col).upper().replace("\xa0", " ")
+        if all(k in nome for k in chaves):
+            return col
+    return None
+
+
+def _com_cabecalho(bruto: pd.DataFrame, *chaves: str) -> pd.DataFrame:
+    """Promove a cabeçalho a primeira linha (entre as 15 iniciais) com todas as ``chaves``."""
+    if _coluna(bruto, *chaves) is not None:
+        return bruto
+    linhas = bruto.head(15).fillna("").astype(str)
+    texto = linhas.agg(" ".join, axis=1).str.upper()
+    achou = texto.str.contains(chaves[0], regex=False)
+    for chave in chaves[1:]:
+        achou &= texto.str.contains(chave, regex=False)
+    hdr = int(achou.to_numpy().argmax()) if achou.any() else 0
+    df = bruto.iloc[hdr + 1:].reset_index(drop=True)
+    df.columns = [str(c).strip() for c in bruto.iloc[hdr].tolist()]
+    return df
+
+
+def _sem_meta(df: pd.DataFrame, rotulo: str) -> pd.DataFrame:
+    """Remove linhas vazias, de total e de cabeçalho repetido (olhando só o rótulo)."""
+    txt = df[rotulo].fillna("").astype(str).str.strip().str.upper()
+    meta = txt.str.contains(_META_RE).to_numpy() | empty_labels_mask(df[rotulo])
+    return df.loc[~meta]
+
+
+def normalizar_visao(bruto: pd.DataFrame, ano: int) -> pd.DataFrame:
+    """Aba VISÃO ABERTA → linhas de visao_aberta.parquet (sem TOTAL GERAL)."""
+    df = _com_cabecalho(bruto, "INSCRIT", "CERTIFIC")
+    col_evento = _coluna(df, "EVENTO") or _coluna(df, "ATIVIDADE") or df.columns[0]
+    df = _sem_meta(df, col_evento)
+
+    visao = pd.DataFrame({
+        "ano": str(ano),
+        "evento": df[col_evento].astype(str).str.strip(),
+    })
+    for destino, chave in (("formato", "FORMATO"), ("eixo", "EIXO"), ("local_realizacao", "LOCAL")):
+        col = _coluna(df, chave)
+        visao[destino] = df[col].astype(str).str.strip() if col is not None else None
+    visao["n_inscritos"] = parse_ptbr_series(df[_coluna(df, "INSCRIT")]).fillna(0).astype("int64")
+    visao["n_certificados"] = parse_ptbr_series(df[_coluna(df, "CERTIFIC")]).fillna(0).astype("int64")
+    visao = visao.join(evento_campos(visao["evento"], visao["formato"]))
+    return visao[["ano", "evento", "evento_ordinal", "tipo", "evento_label", "formato", "eixo",
+                  "local_realizacao", "n_inscritos", "n_certificados"]].reset_index(drop=True)
+
+
+def normalizar_secretarias(bruto: pd.DataFrame, ano: int) -> pd.DataFrame:
+    """Aba SECRETARIAS-MASTERCLASS → linhas de secretarias.parquet."""
+    df = _com_cabecalho(bruto, "SECRETARIA/ÓRGÃO", "INSCRITOS")
+    col_org = _coluna(df, "SECRETARIA") or _coluna(df, "ÓRGÃO") or df.columns[0]
+    df = _sem_meta(df, col_org)
+
+    inscritos = parse_ptbr_series(df[_coluna(df, "INSCRIT")]).fillna(0).astype("int64")
+    col_cer = _coluna(df, "CERTIFIC")
+    certificados = parse_ptbr_series(df[col_cer]).fillna(0).astype("int64") if col_cer else inscritos * 0
+    col_eva = _coluna(df, "EVAS")
+    evasao = (
+        parse_ptbr_series(df[col_eva]).fillna(0).astype("int64") if col_eva else inscritos - certificados
+    )
+    secret = pd.DataFrame({
+        "ano": str(ano),
+        "secretaria_orgao": df[col_org].astype(str).str.strip(),
+        "n_inscritos": inscritos,
+        "n_certificados": certificados,
+        "n_turmas": pd.array([pd.NA] * len(df), dtype="Int64"),
+        "n_evasao": evasao,
+    })
+    return secret.reset_index(drop=True)
+
+
+def normalizar_cargos(bruto: pd.DataFrame, ano: int) -> pd.DataFrame:
+    """Aba CARGOS-INCRITOS (evento × cargo, largo) → linhas de cargos_eventos.parquet."""
+    col_evento = bruto.columns[0]
+    eventos = bruto[col_evento].fillna("").astype(str)
+    df = bruto.loc[eventos.str.contains(_EVENTO_RE, case=False)]
+    cargos = [c for c in df.columns if c != col_evento]
+
+    longo = df.melt(id_vars=col_evento, value_vars=cargos, var_name="cargo", value_name="inscritos")
+    longo["inscritos"] = parse_ptbr_series(longo["inscritos"]).fillna(0).astype("int32")
+    longo = longo[longo["inscritos"] > 0]
+    longo = longo.rename(columns={col_evento: "evento"})
+    longo["evento"] = longo["evento"].astype(str).str.strip()
+    longo["cargo"] = longo["cargo"].astype(str).str.strip()
+
+    return pd.DataFrame({
+        "ano": pd.Series(ano, index=longo.index, dtype="int16"),
+        "evento": longo["evento"],
+        "tipo": evento_campos(longo["evento"])["tipo"],
+        "orgao": ORGAO_LEGADO,
+        "orgao_externo": False,
+        "cargo": longo["cargo"],
+        "inscritos": longo["inscritos"],
+    }).reset_index(drop=True)
+
+
+_NORMALIZADORES = {
+    "visao_aberta": normalizar_visao,
+    "secretarias": normalizar_secretarias,
+    "cargos_eventos": normalizar_cargos,
+}
+
+
+def ler_planilha_legada(caminho: Path, ano: int) -> Dict[str, pd.DataFrame]:
+    """Lê as abas antigas de ``caminho`` e devolve {parquet: DataFrame canônico}.
+
+    Abas ausentes são ignoradas.
+    """
+    abas = pd.read_excel(caminho, sheet_name=None, header=None)
+    por_nome = {str(nome).strip().upper(): df for nome, df in abas.items()}
+    saida = {}
+    for destino, aba in ABAS_LEGADAS.items():
+        bruto = por_nome.get(aba)
+        if bruto is None:
+            continue
+        if destino == "cargos_eventos":
+            # 1ª linha = nomes dos cargos; a 1ª coluna traz os eventos
+            bruto = bruto.iloc[1:].set_axis(bruto.iloc[0].astype(str).str.strip(), axis=1)
+        saida[destino] = _NORMALIZADORES[destino](bruto, ano)
+    return saida
@@ -1,38 +1,102 @@
 """Funções de carregamento de dados para todos os módulos."""
 
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Sequence
 import streamlit as st
 import sys
 
 # Adicionar o diretório raiz ao path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-@st.cache_data(show_spinner=False)
+from src.data.arrow_cache import has_arrow, read_arrow_frame
+from src.data.cargos import build_cargos_eventos
+from src.data.cubo import build_cubo, resumo_cubo
+from src.data.pesquisa import build_cruzamentos, respostas_longas
+from src.data.rankings import build_rankings, ranking
+from src.data.schema import EVENTO_COLUMNS, enforce_dados_schema, evento_campos, read_column_roles, resolve_roles
+from src.data.snapshots import current_snapshot_id, snapshot_path
+
+PROCESSED_ROOT = Path(".data") / "processed"
+
+# Os frames ficam em st.cache_resource (um objeto por processo, sem cópia a
+# cada rerun) e as páginas recebem visões rasas (``_visao``): atribuir uma
+# coluna (``df[col] = ...``) troca a coluna só na visão. Escritas no lugar
+# (``.loc``/``.iloc``, ``inplace=True``) exigem ``.copy()`` antes.
+
+
+def current_data_version() -> Optional[str]:
+    """Id do snapshot publicado; usar como chave de cache em funções derivadas."""
+    return current_snapshot_id(PROCESSED_ROOT)
+
+
+def get_processed_path() -> Path:
+    """Diretório com os Parquets publicados (resolvido via ponteiro CURRENT)."""
+    return snapshot_path(PROCESSED_ROOT, current_data_version())
+
+
+def _visao(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Visão rasa do frame compartilhado (não copia dados; protege o cache)."""
+    return None if df is None else df.copy(deep=False)
+
+
+def load_dataset(name: str, columns: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+    """Lê ``<name>.parquet`` do snapshot publicado, só com ``columns`` (se informado).
+
+    Cada projeção é uma entrada própria no cache: colunas de texto longo só
+    são desserializadas pela aba que as pede. Colunas inexistentes no arquivo
+    são ignoradas.
+
+    O frame é lido uma vez por processo (do cache Arrow mapeado em memória
+    quando o snapshot o tem) e compartilhado entre sessões; cada chamada
+    devolve uma visão rasa dele, sem cópia de dados.
+    """
+    columns = tuple(columns) if columns is not None else None
+    return _visao(_load_dataset(current_data_version(), name, columns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _load_dataset(version: Optional[str], name: str, columns: Optional[Tuple[str, ...]]) -> Optional[pd.DataFrame]:
+    try:
+        return _read_table(snapshot_path(PROCESSED_ROOT, version), name, columns)
+    except Exception as e:
+        st.error(f"Erro ao carregar {name}: {e}")
+        return None
+
+
 def load_servidores_data() -> Tuple[Optional[pd.DataFrame], ...]:
-    """Carrega dados do CapacitIA Servidores."""
-    processed_path = Path(".data") / "processed"
+    """Carrega dados do CapacitIA Servidores (visões rasas dos frames compartilhados)."""
+    return tuple(_visao(df) for df in _load_servidores_data(current_data_version()))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_servidores_data(version: Optional[str]) -> Tuple[Optional[pd.DataFrame], ...]:
+    # Todos os arquivos vêm do mesmo snapshot; a versão entra na chave do cache
+    processed_path = snapshot_path(PROCESSED_ROOT, version)
     
     try:
-        df_dados = pd.read_parquet(processed_path / "dados.parquet")
-        df_visao = pd.read_parquet(processed_path / "visao_aberta.parquet")
-        df_secretarias = pd.read_parquet(processed_path / "secretarias.parquet")
-        df_cargos = pd.read_parquet(processed_path / "cargos.parquet")
+        # Schema tipado também na leitura (converte arquivos no formato antigo)
+        df_dados = enforce_dados_schema(_read_table(processed_path, "dados"))
+        df_visao = _read_table(processed_path, "visao_aberta")
+        df_secretarias = _read_table(processed_path, "secretarias")
+        df_cargos = _read_table(processed_path, "cargos")
         
         # Normalizar campo 'formato' removendo espaços extras
-        if 'formato' in df_dados.columns:
-            df_dados['formato'] = df_dados['formato'].str.strip()
+        # (em df_dados isso já é feito pelo schema)
         if 'formato' in df_visao.columns:
             df_visao['formato'] = df_visao['formato'].str.strip()
+        # Snapshots anteriores às colunas derivadas do evento
+        if 'evento' in df_visao.columns and not set(EVENTO_COLUMNS) <= set(df_visao.columns):
+            df_visao = df_visao.join(evento_campos(df_visao['evento'], df_visao.get('formato')))
         
         try:
-            df_min = pd.read_parquet(processed_path / "ministrantes.parquet")
+            df_min = _read_table(processed_path, "ministrantes")
         except Exception:
             df_min = None
         
         try:
-            df_orgaos_parceiros = pd.read_parquet(processed_path / "orgaos_parceiros.parquet")
+            df_orgaos_parceiros = _read_table(processed_path, "orgaos_parceiros")
         except Exception:
             df_orgaos_parceiros = None
             
@@ -41,32 +105,222 @@ def load_servidores_data() -> Tuple[Optional[pd.DataFrame], ...]:
         st.error(f"Erro ao carregar dados de Servidores: {e}")
         return None, None, None, None, None, None
 
-@st.cache_data(show_spinner=False)
-def load_saude_data() -> Optional[pd.DataFrame]:
-    """Carrega dados do CapacitIA Saúde."""
-    processed_path = Path(".data") / "processed"
-    
-    try:
-        df_saude = pd.read_parquet(processed_path / "saude.parquet")
-        return df_saude
-    except Exception as e:
-        st.error(f"Erro ao carregar dados de Saúde: {e}")
+
+def _read_table(processed_path: Path, name: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Lê do cache Arrow mapeado em memória quando existe; senão, do Parquet.
+
+    Colunas de ``columns`` inexistentes no arquivo são ignoradas.
+    """
+    if has_arrow(processed_path, name):
+        return read_arrow_frame(processed_path, name, columns)
+    parquet_file = processed_path / f"{name}.parquet"
+    if columns is not None:
+        disponiveis = set(pq.read_schema(parquet_file).names)
+        columns = [c for c in columns if c in disponiveis]
+    return pd.read_parquet(parquet_file, columns=columns)
+
+def load_saude_data(columns: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+    """Carrega dados do CapacitIA Saúde (opcionalmente só ``columns``)."""
+    return load_dataset("saude", columns)
+
+
+def load_autonomia_digital_data(
+    inscricoes_columns: Optional[Sequence[str]] = None,
+    avaliacoes_columns: Optional[Sequence[str]] = None,
+) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """Carrega dados do CapacitIA Autonomia Digital (opcionalmente projetados)."""
+    return (
+        load_dataset("autonomiadigital_inscricoes", inscricoes_columns),
+        load_dataset("autonomiadigital_avaliacoes", avaliacoes_columns),
+    )
+
+
+def load_autonomia_vinculo() -> Optional[pd.DataFrame]:
+    """Inscrições de Autonomia Digital ligadas às avaliações (autonomiadigital_vinculo.parquet).
+
+    Retorna None em snapshots gerados antes deste artefato.
+    """
+    if not (get_processed_path() / "autonomiadigital_vinculo.parquet").exists():
         return None
+    return load_dataset("autonomiadigital_vinculo")
 
-@st.cache_data(show_spinner=False)
-def load_autonomia_digital_data() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
-    """Carrega dados do CapacitIA Autonomia Digital."""
-    processed_path = Path(".data") / "processed"
-    
+
+def load_pesquisa_cruzamentos() -> pd.DataFrame:
+    """Cruzamentos da pesquisa de avaliação (item × gênero × faixa etária × ano; nulo = todos).
+
+    Contagens, médias e IC 95% já calculados; a página só seleciona linhas.
+    """
+    return _visao(_load_pesquisa_cruzamentos(current_data_version()))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_pesquisa_cruzamentos(version: Optional[str]) -> pd.DataFrame:
+    processed_path = snapshot_path(PROCESSED_ROOT, version)
+    if (processed_path / "autonomiadigital_pesquisa_cruzamentos.parquet").exists():
+        return _read_table(processed_path, "autonomiadigital_pesquisa_cruzamentos")
+    # Snapshots anteriores aos cruzamentos: calcula a partir das avaliações
+    return build_cruzamentos(respostas_longas(_read_table(processed_path, "autonomiadigital_avaliacoes")))
+
+
+def load_participacoes(columns: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+    """Tabela fato de participações de todos os módulos (participacoes.parquet)."""
+    columns = tuple(columns) if columns is not None else None
+    return _visao(_load_participacoes(current_data_version(), columns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_participacoes(version: Optional[str], columns: Optional[Tuple[str, ...]]) -> Optional[pd.DataFrame]:
+    processed_path = snapshot_path(PROCESSED_ROOT, version)
+    if (processed_path / "participacoes.parquet").exists():
+        return _read_table(processed_path, "participacoes", columns)
+
+    # Snapshots anteriores à tabela fato: monta a partir dos Parquets dos módulos
+    from src.processors.processor_participacoes import build_participacoes
+
+    def _modulo(name: str) -> Optional[pd.DataFrame]:
+        if not (processed_path / f"{name}.parquet").exists():
+            return None
+        return _load_dataset(version, name, None)
+
+    dados = _modulo("dados")
     try:
-        df_inscricoes = pd.read_parquet(processed_path / "autonomiadigital_inscricoes.parquet")
-        df_avaliacoes = pd.read_parquet(processed_path / "autonomiadigital_avaliacoes.parquet")
-        return df_inscricoes, df_avaliacoes
+        df = build_participacoes(
+            enforce_dados_schema(dados) if dados is not None else None,
+            _modulo("saude"),
+            _modulo("autonomiadigital_inscricoes"),
+        )
     except Exception as e:
-        st.error(f"Erro ao carregar dados de Autonomia Digital: {e}")
-        return None, None
+        st.error(f"Erro ao montar participações: {e}")
+        return None
+    return df[[c for c in columns if c in df.columns]] if columns is not None else df
+
+
+def load_cargos_eventos(columns: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+    """Inscritos por evento × cargo em formato longo (cargos_eventos.parquet)."""
+    columns = tuple(columns) if columns is not None else None
+    return _visao(_load_cargos_eventos(current_data_version(), columns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_cargos_eventos(version: Optional[str], columns: Optional[Tuple[str, ...]]) -> Optional[pd.DataFrame]:
+    processed_path = snapshot_path(PROCESSED_ROOT, version)
+    if (processed_path / "cargos_eventos.parquet").exists():
+        return _read_table(processed_path, "cargos_eventos", columns)
+    # Snapshots anteriores ao cargos_eventos.parquet: calcula a partir de dados.parquet
+    df = build_cargos_eventos(enforce_dados_schema(_read_table(processed_path, "dados")))
+    return df[[c for c in columns if c in df.columns]] if columns is not None else df
+
+
+def load_jornadas() -> Optional[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+    """(coortes, transições, participantes) da aba Jornadas; None em snapshots sem esses artefatos."""
+    processed_path = get_processed_path()
+    if not all((processed_path / f"{nome}.parquet").exists() for nome in ("coortes", "transicoes", "participantes")):
+        return None
+    return (
+        load_dataset("coortes"),
+        load_dataset("transicoes"),
+        load_dataset("participantes", ["n_anos", "n_participacoes"]),
+    )
+
+
+def load_ranking(
+    dimensao: str,
+    metrica: str,
+    ano: Optional[int] = None,
+    tipo: Optional[str] = None,
+    orgao_externo: Optional[bool] = None,
+) -> pd.DataFrame:
+    """Ranking já ordenado de ``dimensao`` ("orgao"/"cargo") por ``metrica``.
+
+    ``ano``, ``tipo`` e ``orgao_externo`` escolhem o recorte (None = todos).
+    Cada recorte fica em cache; a página só faz ``head(topn)``.
+    """
+    return _visao(_load_ranking(current_data_version(), dimensao, metrica, ano, tipo, orgao_externo))
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _load_ranking(version, dimensao, metrica, ano, tipo, orgao_externo) -> pd.DataFrame:
+    return ranking(_load_rankings(version), dimensao, metrica, ano, tipo, orgao_externo)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_rankings(version: Optional[str]) -> pd.DataFrame:
+    processed_path = snapshot_path(PROCESSED_ROOT, version)
+    if (processed_path / "rankings.parquet").exists():
+        return _read_table(processed_path, "rankings")
+    # Snapshots anteriores ao rankings.parquet: calcula a partir de dados.parquet
+    return build_rankings(enforce_dados_schema(_read_table(processed_path, "dados")))
+
+
+def load_kpis_servidores(
+    ano: Optional[int] = None,
+    tipo: Optional[str] = None,
+    orgao_externo: Optional[bool] = None,
+    orgao: Optional[str] = None,
+) -> dict:
+    """Inscritos, certificados e órgãos, eventos e participantes distintos (None = todos).
+
+    Mescla as células de cubo_servidores.parquet (OR dos bitsets), sem varrer
+    dados.parquet.
+    """
+    return _load_kpis_servidores(current_data_version(), ano, tipo, orgao_externo, orgao)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _load_kpis_servidores(version, ano, tipo, orgao_externo, orgao) -> dict:
+    return resumo_cubo(_load_cubo(version), ano, tipo, orgao_externo, orgao)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_cubo(version: Optional[str]) -> pd.DataFrame:
+    processed_path = snapshot_path(PROCESSED_ROOT, version)
+    if (processed_path / "cubo_servidores.parquet").exists():
+        return _read_table(processed_path, "cubo_servidores")
+    # Snapshots anteriores ao cubo: calcula a partir de dados.parquet
+    return build_cubo(enforce_dados_schema(_read_table(processed_path, "dados")))
+
+
+def load_column_roles(dataset: str) -> dict:
+    """Papéis → colunas de ``dataset`` (ex.: ``roles["aposentado"]``).
+
+    Vem do schema_manifest.json gravado no processamento; a consulta nas
+    páginas é só um lookup de dicionário.
+    """
+    return _load_column_roles(current_data_version()).get(dataset, {})
+
 
 @st.cache_data(show_spinner=False)
+def _load_column_roles(version: Optional[str]) -> dict:
+    processed_path = snapshot_path(PROCESSED_ROOT, version)
+    manifest = read_column_roles(processed_path)
+    roles = {dataset: info.get("roles", {}) for dataset, info in manifest.items()}
+
+    # Snapshots antigos sem manifesto: resolve uma vez pelo schema dos Parquets
+    for dataset, spec in _role_specs().items():
+        parquet_file = processed_path / f"{dataset}.parquet"
+        if dataset not in roles and parquet_file.exists():
+            roles[dataset] = resolve_roles(pq.read_schema(parquet_file).names, spec)
+    return roles
+
+
+def _role_specs() -> dict:
+    from src.data.schema import PAPEIS_DADOS
+    from src.processors.processor_autonomiadigital_inscricoes import PAPEIS_INSCRICOES
+    from src.processors.processors_autonomiadigital_avaliacoes import PAPEIS_AVALIACOES
+    from src.processors.processor_ministrantes import PAPEIS_MINISTRANTES
+    from src.processors.processor_participacoes import PAPEIS_PARTICIPACOES
+    from src.processors.processor_saude import PAPEIS_SAUDE
+
+    return {
+        "dados": PAPEIS_DADOS,
+        "autonomiadigital_inscricoes": PAPEIS_INSCRICOES,
+        "autonomiadigital_avaliacoes": PAPEIS_AVALIACOES,
+        "ministrantes": PAPEIS_MINISTRANTES,
+        "saude": PAPEIS_SAUDE,
+        "participacoes": PAPEIS_PARTICIPACOES,
+    }
+
+
 def load_all_data() -> dict:
     """Carrega todos os dados de todos os módulos."""
     servidores_data = load_servidores_data()
@@ -0,0 +1,68 @@
+"""Escrita dos Parquets publicados com layout físico pensado para os filtros.
+
+Todo Parquet do pipeline passa por ``write_parquet``: compressão zstd,
+dicionário, estatísticas min/max por coluna e page index. Datasets com
+entrada em ``LAYOUTS`` são ordenados pelas colunas dos filtros do dashboard
+antes da escrita, então cada row group / página cobre uma faixa estreita de
+ano, órgão externo, formato... e leitores com ``filters=`` pulam o resto
+pelas estatísticas. A ordenação é gravada em ``sorting_columns``.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+COMPRESSAO = "zstd"
+NIVEL_COMPRESSAO = 3
+ROW_GROUP_PADRAO = 64 * 1024
+PAGINA_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class Layout:
+    ordenar: Tuple[str, ...] = ()
+    row_group_size: int = ROW_GROUP_PADRAO
+
+
+# Ordem = filtros globais das páginas, do mais seletivo para o menos
+LAYOUTS = {
+    "dados": Layout(ordenar=("ano", "orgao_externo", "formato", "orgao")),
+    "cargos_eventos": Layout(ordenar=("ano", "orgao_externo", "tipo", "orgao")),
+    "cubo_servidores": Layout(ordenar=("ano", "tipo", "orgao_externo", "orgao")),
+    "participacoes": Layout(ordenar=("modulo", "ano")),
+    "participantes": Layout(ordenar=("participante_id",)),
+}
+
+
+def write_parquet(
+    df: pd.DataFrame,
+    path: Path,
+    schema: Optional[pa.Schema] = None,
+    layout: Optional[Layout] = None,
+) -> None:
+    """Grava ``df`` em ``path``; ``layout`` padrão vem de ``LAYOUTS[path.stem]``."""
+    path = Path(path)
+    layout = layout or LAYOUTS.get(path.stem, Layout())
+    ordenar = [c for c in layout.ordenar if c in df.columns]
+    if ordenar:
+        df = df.sort_values(ordenar, kind="stable", na_position="last")
+
+    # preserve_index=False: sem coluna/blob de índice; os metadados pandas de
+    # tipos (Int16, categorias) continuam para a leitura voltar igual
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    pq.write_table(
+        table,
+        path,
+        row_group_size=layout.row_group_size,
+        compression=COMPRESSAO,
+        compression_level=NIVEL_COMPRESSAO,
+        use_dictionary=True,
+        write_statistics=True,
+        write_page_index=True,
+        data_page_size=PAGINA_BYTES,
+        sorting_columns=[pq.SortingColumn(table.schema.get_field_index(c)) for c in ordenar] or None,
+    )
@@ -0,0 +1,126 @@
+"""Pseudonimização dos participantes e tabela-dimensão participantes.parquet.
+
+O nome é normalizado (sem acento, maiúsculo, espaços colapsados) e passa por
+um hash com chave (BLAKE2b, 8 bytes → int64). O mesmo nome gera o mesmo
+``participante_id`` em todos os eventos e anos, então distintos e junções
+viram operações sobre inteiros; sem a chave não dá para refazer o hash a
+partir de uma lista de nomes. O nome não sai do pipeline.
+
+O CPF das planilhas de Autonomia Digital passa pelo mesmo hash (``cpf_id``)
+antes de ser descartado, como chave de junção inscrição → avaliação.
+
+A chave vem de ``CAPACITIA_CHAVE_PSEUDONIMO`` ou de ``.data/pseudonimo.key``
+(gerada na primeira execução). Trocar a chave muda todos os IDs.
+"""
+
+import hashlib
+import logging
+import os
+import secrets
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger(__name__)
+
+ENV_CHAVE = "CAPACITIA_CHAVE_PSEUDONIMO"
+ARQUIVO_CHAVE = Path(".data") / "pseudonimo.key"
+
+# "000.000.000-00", "111.111.111-11"...: preenchimento de formulário, não CPF
+_CPFS_REPETIDOS = pa.array([d * 11 for d in "0123456789"])
+
+
+def carregar_chave(base_path: Path) -> bytes:
+    """Chave do hash: variável de ambiente ou arquivo local (criado se faltar)."""
+    chave = os.environ.get(ENV_CHAVE)
+    if chave:
+        return chave.encode("utf-8")
+    arquivo = Path(base_path) / ARQUIVO_CHAVE
+    if not arquivo.exists():
+        arquivo.parent.mkdir(parents=True, exist_ok=True)
+        arquivo.write_bytes(secrets.token_bytes(32))
+        logger.warning(f"Chave de pseudonimização criada em {arquivo} — guarde-a para manter os IDs estáveis")
+    return arquivo.read_bytes()
+
+
+def normalizar_nomes(nomes: pd.Series) -> pa.Array:
+    """Valores de ``nomes`` → texto sem acento, maiúsculo e com espaços simples."""
+    texto = pa.array(np.asarray(nomes, dtype=object), type=pa.string(), from_pandas=True)
+    texto = pc.utf8_normalize(texto, form="NFKD")
+    texto = pc.replace_substring_regex(texto, r"\p{Mn}", "")
+    texto = pc.replace_substring_regex(texto, r"\s+", " ")
+    return pc.utf8_upper(pc.utf8_trim_whitespace(texto))
+
+
+def normalizar_cpfs(cpfs: pd.Series) -> pa.Array:
+    """CPFs digitados → 11 dígitos ("096.579.913-15 ", "O0026327805"); inválidos → nulo.
+
+    Zeros à esquerda perdidos pela planilha são repostos (9 ou 10 dígitos).
+    """
+    texto = pa.array(np.asarray(cpfs, dtype=object), type=pa.string(), from_pandas=True)
+    texto = pc.replace_substring(pc.utf8_upper(texto), "O", "0")
+    texto = pc.replace_substring_regex(texto, r"\D", "")
+    tamanho_ok = pc.match_substring_regex(texto, r"^\d{9,11}$")
+    texto = pc.utf8_lpad(texto, width=11, padding="0")
+    valido = pc.and_(tamanho_ok, pc.invert(pc.is_in(texto, value_set=_CPFS_REPETIDOS)))
+    return pc.if_else(valido, texto, pa.scalar(None, pa.string()))
+
+
+def _hash_ids(valores: pd.Series, normalizar, chave: bytes, nome: str, pessoa: bytes = b"") -> pd.Series:
+    """Hash com chave (8 bytes → Int64) de ``normalizar(valores)``; vazios ficam nulos.
+
+    O hash roda só nos valores únicos e volta para as linhas por indexação.
+    """
+    codigos, unicos = pd.factorize(valores)
+    normal = normalizar(pd.Series(unicos, dtype=object)).to_pylist()
+    digests = b"".join(
+        hashlib.blake2b((n or "").encode("utf-8"), key=chave, digest_size=8, person=pessoa).digest()
+        for n in normal
+    )
+    ids = np.append(np.frombuffer(digests, dtype="<i8"), 0)
+    # nulo no fim: código -1 (ausente) cai nele
+    nulo = np.append([not n for n in normal], True).astype(bool)
+    ids = pd.arrays.IntegerArray(ids[codigos], nulo[codigos])
+    return pd.Series(ids, index=valores.index, name=nome)
+
+
+def pseudonimizar(nomes: pd.Series, chave: bytes) -> pd.Series:
+    """Nome → ``participante_id`` (Int64); nomes vazios ficam nulos."""
+    return _hash_ids(nomes, normalizar_nomes, chave, "participante_id")
+
+
+def pseudonimizar_cpf(cpfs: pd.Series, chave: bytes) -> pd.Series:
+    """CPF → ``cpf_id`` (Int64), chave de junção entre inscrições e avaliações.
+
+    Usa a mesma chave com outro domínio (``person``), então um ``cpf_id``
+    nunca coincide com um ``participante_id``. CPFs inválidos ficam nulos.
+    """
+    return _hash_ids(cpfs, normalizar_cpfs, chave, "cpf_id", pessoa=b"cpf")
+
+
+def build_participantes(df_dados: pd.DataFrame) -> pd.DataFrame:
+    """Uma linha por participante com trajetória resumida e o vínculo mais recente."""
+    df = df_dados[df_dados["participante_id"].notna()]
+    grupos = df.groupby("participante_id")
+    dim = grupos.agg(
+        primeiro_ano=("ano", "min"),
+        ultimo_ano=("ano", "max"),
+        n_anos=("ano", "nunique"),
+        n_participacoes=("ano", "size"),
+        n_eventos=("evento", "nunique"),
+        n_certificados=("certificado", "sum"),
+    )
+    # órgão/cargo/vínculo da participação mais recente
+    recente = (
+        df.sort_values(["ano", "evento_ordinal"], kind="stable", na_position="first")
+        .groupby("participante_id")[["orgao", "cargo", "vinculo"]]
+        .last()
+    )
+    dim = dim.join(recente).reset_index()
+    return dim.astype({
+        "primeiro_ano": "int16", "ultimo_ano": "int16", "n_anos": "int16",
+        "n_participacoes": "int32", "n_eventos": "int32", "n_certificados": "int32",
+    })
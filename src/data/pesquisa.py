@@ -0,0 +1,177 @@
+"""Pesquisa de avaliação de Autonomia Digital em formato longo e cruzamentos.
+
+Cada pergunta ``nota_*`` (escala 1–5) ou ``aprendeu_*`` (sim/não → 1/0) do
+mapeamento de colunas do processador de avaliações vira um item. A tabela
+longa tem uma linha por resposta × item; os cruzamentos agregam cada item
+por todas as combinações de gênero, faixa etária e ano (nulo = todos), com
+contagem, média, desvio e intervalo de confiança de 95%. As páginas só
+selecionam linhas; uma pergunta nova no mapeamento aparece sem mudar nada
+aqui.
+
+Para ``aprendeu_*`` a média é a proporção de "sim" (0–1) e o intervalo é o
+de Wilson; para notas, t de Student (tabela para poucos graus de liberdade e
+aproximação de Cornish-Fisher acima, sem scipy).
+"""
+
+from itertools import combinations
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.utils.helpers import faixa_etaria
+except ImportError:
+    from utils.helpers import faixa_etaria
+
+# prefixo da coluna → tipo do item
+TIPOS_ITEM = {"nota_": "nota", "aprendeu_": "aprendeu"}
+
+ESCALA = range(1, 6)
+
+RECORTES = ["genero", "faixa_etaria", "ano"]
+
+_Z95 = 1.959964
+
+# t de Student, quantil 97,5%, por graus de liberdade
+_T95_EXATO = {
+    1: 12.7062, 2: 4.3027, 3: 3.1824, 4: 2.7764, 5: 2.5706,
+    6: 2.4469, 7: 2.3646, 8: 2.3060, 9: 2.2622, 10: 2.2281,
+}
+
+# Rótulos dos itens (colunas nota_*/aprendeu_* de COLUNAS_AVALIACOES no processador);
+# uma pergunta nova sem rótulo aqui usa o nome da coluna
+ROTULOS_ITENS = {
+    "nota_evento": "Evento",
+    "nota_conteudo": "Conteúdo",
+    "nota_local": "Local",
+    "nota_atendimento": "Atendimento",
+    "aprendeu_celular_basico": "Funções básicas do celular",
+    "aprendeu_email": "Uso de e-mail",
+    "aprendeu_seguranca": "Segurança digital",
+    "aprendeu_ia": "IA no dia a dia",
+    "aprendeu_govpi": "Gov.pi Cidadão",
+    "aprendeu_saude_digital": "Piauí Saúde Digital",
+    "aprendeu_bo_facil": "BO Fácil",
+}
+
+
+def itens_pesquisa(colunas, rotulos: Optional[Dict[str, str]] = None) -> Dict[str, tuple]:
+    """Coluna → (tipo do item, rótulo) para as colunas ``nota_*``/``aprendeu_*``."""
+    rotulos = ROTULOS_ITENS if rotulos is None else rotulos
+    itens = {}
+    for col in colunas:
+        for prefixo, tipo in TIPOS_ITEM.items():
+            if str(col).startswith(prefixo):
+                padrao = str(col)[len(prefixo):].replace("_", " ").capitalize()
+                itens[col] = (tipo, rotulos.get(col, padrao))
+    return itens
+
+
+def respostas_longas(df_avaliacoes: pd.DataFrame, rotulos: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Uma linha por resposta × item, com gênero, faixa etária e ano do respondente."""
+    itens = itens_pesquisa(df_avaliacoes.columns, rotulos)
+    base = pd.DataFrame({
+        "resposta": np.arange(len(df_avaliacoes), dtype="int32"),
+        "genero": df_avaliacoes["genero"].astype("string").str.strip() if "genero" in df_avaliacoes else pd.NA,
+        "faixa_etaria": faixa_etaria(df_avaliacoes["idade"]).astype("string") if "idade" in df_avaliacoes else pd.NA,
+        "ano": df_avaliacoes["ano"].astype("Int16") if "ano" in df_avaliacoes else pd.NA,
+    }, index=df_avaliacoes.index)
+
+    partes = []
+    for col, (tipo, rotulo) in itens.items():
+        valores = df_avaliacoes[col]
+        if tipo == "aprendeu":
+            valores = valores.map({True: 1.0, False: 0.0})
+        partes.append(base.assign(item=col, tipo_item=tipo, rotulo=rotulo, valor=pd.to_numeric(valores, errors="coerce")))
+    if not partes:
+        return pd.DataFrame(columns=[*base.columns, "item", "tipo_item", "rotulo", "valor"])
+
+    longo = pd.concat(partes, ignore_index=True).dropna(subset=["valor"])
+    longo = longo.astype({"item": "category", "tipo_item": "category", "rotulo": "category", "valor": "float32"})
+    return longo.reset_index(drop=True)
+
+
+def _t95(graus: pd.Series) -> pd.Series:
+    """Quantil 97,5% da t de Student: tabela exata até gl = 10, Cornish-Fisher acima.
+
+    A expansão subestima muito com poucos graus (7,15 em vez de 12,71 com
+    gl = 1); com gl > 10 o erro fica abaixo de 0,2%.
+    """
+    z = _Z95
+    g = graus.astype(float)
+    aproximado = z + (z**3 + z) / (4 * g) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * g**2)
+    return g.map(_T95_EXATO).fillna(aproximado)
+
+
+def build_cruzamentos(longo: pd.DataFrame) -> pd.DataFrame:
+    """Monta os cruzamentos item × gênero × faixa etária × ano a partir da tabela longa."""
+    dist_cols = [f"n_{v}" for v in ESCALA]
+    longo = longo.assign(
+        positivo=np.where(longo["tipo_item"] == "aprendeu", longo["valor"] == 1, longo["valor"] >= 4),
+        **{f"n_{v}": longo["valor"] == v for v in ESCALA},
+    )
+    partes = []
+    # Todas as combinações de recortes, de "tudo" até gênero × faixa × ano
+    for k in range(len(RECORTES) + 1):
+        for chaves in combinations(RECORTES, k):
+            agg = longo.groupby(["item", "tipo_item", "rotulo", *chaves], observed=True).agg(
+                n=("valor", "size"),
+                n_positivos=("positivo", "sum"),
+                media=("valor", "mean"),
+                desvio=("valor", "std"),
+                **{c: (c, "sum") for c in dist_cols},
+            )
+            partes.append(agg.reset_index())
+
+    df = pd.concat(partes, ignore_index=True)
+    for c in RECORTES:
+        if c not in df:
+            df[c] = pd.NA
+    df = df.astype({
+        "genero": "string", "faixa_etaria": "string", "ano": "Int16", "n": "int32", "n_positivos": "int32",
+        "media": "float64", "desvio": "float64", **{c: "Int32" for c in dist_cols},
+    })
+    n = df["n"].astype(float)
+    aprendeu = (df["tipo_item"] == "aprendeu").to_numpy()
+
+    # notas: média ± t * s / √n (sem intervalo com uma resposta só)
+    margem = _t95(n.where(n > 1) - 1) * df["desvio"] / np.sqrt(n)
+    # aprendeu: Wilson
+    p = df["media"].where(aprendeu)
+    centro = (p + _Z95**2 / (2 * n)) / (1 + _Z95**2 / n)
+    raio = _Z95 * np.sqrt(p * (1 - p) / n + _Z95**2 / (4 * n**2)) / (1 + _Z95**2 / n)
+    df["ic_inf"] = np.where(aprendeu, centro - raio, (df["media"] - margem).clip(lower=min(ESCALA)))
+    df["ic_sup"] = np.where(aprendeu, centro + raio, (df["media"] + margem).clip(upper=max(ESCALA)))
+
+    # Distribuição 1–5 só faz sentido para notas
+    df.loc[aprendeu, dist_cols] = pd.NA
+    df = df.round({"media": 4, "desvio": 4, "ic_inf": 4, "ic_sup": 4})
+    colunas = ["item", "tipo_item", "rotulo", *RECORTES, "n", "n_positivos", "media", "desvio", "ic_inf", "ic_sup", *dist_cols]
+    return df[colunas].sort_values(["item", *RECORTES], na_position="first", kind="stable").reset_index(drop=True)
+
+
+def cruzamento(
+    cruzamentos: pd.DataFrame,
+    genero: Optional[str] = None,
+    faixa_etaria: Optional[str] = None,
+    ano: Optional[int] = None,
+) -> pd.DataFrame:
+    """Linhas de um recorte, uma por item (None em um recorte = todos)."""
+    mask = pd.Series(True, index=cruzamentos.index)
+    for coluna, valor in zip(RECORTES, (genero, faixa_etaria, ano)):
+        serie = cruzamentos[coluna]
+        mask &= serie.isna() if valor is None else serie.eq(valor).fillna(False).astype(bool)
+    return cruzamentos.loc[mask].reset_index(drop=True)
+
+
+def por_recorte(cruzamentos: pd.DataFrame, recorte: str, ano: Optional[int] = None) -> pd.DataFrame:
+    """Linhas abertas por ``recorte`` ("genero"/"faixa_etaria"), demais recortes = todos."""
+    mask = cruzamentos[recorte].notna()
+    for coluna in RECORTES:
+        if coluna in (recorte, "ano"):
+            continue
+        mask &= cruzamentos[coluna].isna()
+    serie = cruzamentos["ano"]
+    mask &= serie.isna() if ano is None else serie.eq(ano).fillna(False).astype(bool)
+    return cruzamentos.loc[mask].reset_index(drop=True)
@@ -0,0 +1,78 @@
+"""Rankings pré-calculados (top-N) de órgãos e cargos.
+
+Uma linha por dimensão × métrica × recorte × posição. O recorte combina ano,
+tipo de evento e órgão externo; cada um pode ser nulo (= todos). Dentro de
+cada recorte as linhas já estão na ordem do ranking, então o top-N de um
+gráfico é só ``ranking(...).head(n)``.
+"""
+
+from itertools import combinations
+from typing import Optional
+
+import pandas as pd
+
+DIMENSOES = ["orgao", "cargo"]
+
+# métrica → coluna usada na ordenação (desempate por inscritos e nome)
+METRICAS = {
+    "inscritos": "n_inscritos",
+    "certificados": "n_certificados",
+    "taxa_certificacao": "taxa_certificacao",
+}
+
+RECORTES = ["ano", "tipo", "orgao_externo"]
+
+# Rótulos que não entram em rankings (mesmo critério de secretarias.parquet)
+NOMES_GENERICOS = {"", "outro", "outros"}
+
+COLUNAS_RANKING = ["posicao", "nome", "n_inscritos", "n_certificados", "taxa_certificacao"]
+
+
+def build_rankings(df_dados: pd.DataFrame) -> pd.DataFrame:
+    """Monta rankings.parquet a partir de dados.parquet (já tipado)."""
+    partes = []
+    for dimensao in DIMENSOES:
+        nomes = df_dados[dimensao].astype(str).str.strip()
+        base = df_dados[~nomes.str.lower().isin(NOMES_GENERICOS)]
+        # Todas as combinações de recortes, de "tudo" até ano × tipo × órgão externo
+        for k in range(len(RECORTES) + 1):
+            for chaves in combinations(RECORTES, k):
+                agg = base.groupby([*chaves, dimensao], observed=True).agg(
+                    n_inscritos=("certificado", "size"),
+                    n_certificados=("certificado", "sum"),
+                ).reset_index()
+                partes.append(agg.rename(columns={dimensao: "nome"}).assign(dimensao=dimensao))
+
+    df = pd.concat(partes, ignore_index=True)
+    df = df.astype({
+        "nome": "str", "ano": "Int16", "tipo": "string", "orgao_externo": "boolean",
+        "n_inscritos": "int32", "n_certificados": "int32",
+    })
+    df["taxa_certificacao"] = (df["n_certificados"] / df["n_inscritos"] * 100).round(2)
+
+    rankings = [
+        df.sort_values([coluna, "n_inscritos", "nome"], ascending=[False, False, True]).assign(metrica=metrica)
+        for metrica, coluna in METRICAS.items()
+    ]
+    out = pd.concat(rankings, ignore_index=True)
+    out["posicao"] = out.groupby(["dimensao", "metrica", *RECORTES], dropna=False).cumcount().add(1).astype("int16")
+    out = out.sort_values(["dimensao", "metrica", *RECORTES, "posicao"], na_position="first", kind="stable")
+
+    out = out.astype({"dimensao": "category", "metrica": "category", "tipo": "category"})
+    return out[["dimensao", "metrica", *RECORTES, *COLUNAS_RANKING]].reset_index(drop=True)
+
+
+def ranking(
+    rankings: pd.DataFrame,
+    dimensao: str,
+    metrica: str,
+    ano: Optional[int] = None,
+    tipo: Optional[str] = None,
+    orgao_externo: Optional[bool] = None,
+) -> pd.DataFrame:
+    """Linhas de um recorte, já ordenadas (None em um recorte = todos)."""
+    mask = (rankings["dimensao"] == dimensao) & (rankings["metrica"] == metrica)
+    for coluna, valor in (("ano", ano), ("tipo", tipo), ("orgao_externo", orgao_externo)):
+        serie = rankings[coluna]
+        mask &= serie.isna() if valor is None else serie.eq(valor).fillna(False).astype(bool)
+    return rankings.loc[mask, COLUNAS_RANKING].reset_index(drop=True)
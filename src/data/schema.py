@@ -0,0 +1,206 @@
+"""Schema tipado de dados.parquet e manifesto de papéis de colunas.
+
+Flags Sim/Não viram booleanos, ``ano`` vira int16 e as colunas de baixa
+cardinalidade são gravadas como dicionário (categorias no pandas). O mesmo
+schema é aplicado na escrita (pipeline) e na leitura (loaders), então as
+páginas podem filtrar com ``df[df["certificado"]]`` e ``df["ano"] == 2025``
+em vez de comparar strings.
+"""
+
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+FLAG_COLUMNS = ["orgao_externo", "certificado", "cargo_gestao", "servidor_estado"]
+
+CATEGORY_COLUMNS = ["evento", "formato", "eixo", "local_realizacao", "cargo", "orgao", "vinculo", "tipo", "evento_label"]
+
+# Colunas derivadas do nome do evento (ver evento_campos)
+EVENTO_COLUMNS = ["evento_ordinal", "tipo", "evento_label"]
+
+_DICT = pa.dictionary(pa.int32(), pa.string())
+
+DADOS_SCHEMA = pa.schema([
+    pa.field("ano", pa.int16(), nullable=False),
+    pa.field("evento", _DICT),
+    pa.field("orgao_externo", pa.bool_(), nullable=False),
+    pa.field("formato", _DICT),
+    pa.field("eixo", _DICT),
+    pa.field("local_realizacao", _DICT),
+    pa.field("participante_id", pa.int64()),
+    pa.field("cargo", _DICT),
+    pa.field("orgao", _DICT),
+    pa.field("vinculo", _DICT),
+    pa.field("certificado", pa.bool_(), nullable=False),
+    pa.field("cargo_gestao", pa.bool_(), nullable=False),
+    pa.field("servidor_estado", pa.bool_(), nullable=False),
+    pa.field("evento_ordinal", pa.int16()),
+    pa.field("tipo", _DICT),
+    pa.field("evento_label", _DICT),
+])
+
+# Tipo canônico de evento, a partir do formato ou do nome do evento
+TIPOS_EVENTO = {"curso": "Curso de IA", "masterclass": "Masterclass", "workshop": "Workshop"}
+TIPO_OUTRO = "Outro"
+
+# "10ª MasterClass ...", "1° Workshop: ...", "2° Worskshop ...", "3º Curso ..."
+_EVENTO_RE = re.compile(r"(\d+)\s*[ºª°]?\s*(masterclass|wors?kshop|curso)", re.IGNORECASE)
+
+
+def evento_campos(evento: pd.Series, formato: pd.Series = None) -> pd.DataFrame:
+    """Ordinal, tipo canônico e rótulo curto de cada evento (vetorizado).
+
+    "10° Curso: Inteligência Artificial ..." → 10, "Curso de IA", "10° Curso de IA".
+    O tipo vem de ``formato`` quando preenchido e, senão, do nome do evento;
+    sem ordinal, o rótulo são as seis primeiras palavras do nome.
+    """
+    nomes = evento.astype(str)
+    partes = nomes.str.extract(_EVENTO_RE)
+    ordinal = pd.to_numeric(partes[0], errors="coerce").astype("Int16")
+
+    tipo = partes[1].str.lower().str.replace("worskshop", "workshop").map(TIPOS_EVENTO)
+    if formato is not None:
+        tipo_formato = formato.astype(str).str.strip().str.lower().map(TIPOS_EVENTO)
+        tipo = tipo_formato.fillna(tipo)
+    tipo = tipo.fillna(TIPO_OUTRO)
+
+    label = ordinal.astype(str) + "° " + tipo
+    curto = nomes.str.split().str[:6].str.join(" ")
+    label = label.where(ordinal.notna(), curto)
+
+    return pd.DataFrame(
+        {"evento_ordinal": ordinal, "tipo": tipo, "evento_label": label},
+        index=evento.index,
+    )
+
+
+def parse_flag(series: pd.Series) -> pd.Series:
+    """Converte 'Sim'/'Não' (qualquer caixa, com espaços) em booleano; vazio → False."""
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype(bool)
+    return series.astype(str).str.strip().str.upper().eq("SIM")
+
+
+def _as_category(series: pd.Series) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cats = series.cat.categories
+        if (cats == cats.str.strip()).all():
+            return series
+    return series.fillna("").astype(str).str.strip().astype("category")
+
+
+def enforce_dados_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte um DataFrame de participantes para os tipos de DADOS_SCHEMA.
+
+    Aceita tanto o formato antigo (tudo string) quanto um arquivo já tipado; no
+    segundo caso nenhuma coluna precisa ser convertida. Arquivos sem as colunas
+    derivadas do evento (EVENTO_COLUMNS) ganham essas colunas aqui; arquivos
+    anteriores à pseudonimização (com ``nome``) ficam com ``participante_id`` nulo.
+    """
+    if not set(EVENTO_COLUMNS) <= set(df.columns) and {"evento", "formato"} <= set(df.columns):
+        df = df.assign(**evento_campos(df["evento"], df["formato"]))
+    if "participante_id" not in df.columns:
+        df = df.assign(participante_id=pd.array([pd.NA] * len(df), dtype="Int64"))
+
+    missing = [f.name for f in DADOS_SCHEMA if f.name not in df.columns]
+    if missing:
+        raise ValueError(f"dados.parquet sem colunas obrigatórias: {missing}")
+
+    out = {}
+    ano = df["ano"]
+    if ano.dtype != "int16":
+        ano = pd.to_numeric(ano.astype(str).str.strip(), errors="coerce")
+        invalidos = int(ano.isna().sum())
+        if invalidos:
+            raise ValueError(f"{invalidos} registro(s) com 'ano' inválido em dados.parquet")
+        ano = ano.astype("int16")
+    out["ano"] = ano
+
+    for field in DADOS_SCHEMA:
+        col = field.name
+        if col == "ano":
+            continue
+        if col == "evento_ordinal":
+            out[col] = pd.to_numeric(df[col], errors="coerce").astype("Int16")
+            continue
+        if col == "participante_id":
+            out[col] = df[col].astype("Int64")
+            continue
+        if col in FLAG_COLUMNS:
+            out[col] = parse_flag(df[col])
+        elif col in CATEGORY_COLUMNS:
+            out[col] = _as_category(df[col])
+        else:
+            out[col] = df[col].fillna("").astype(str)
+
+    return pd.DataFrame(out, index=df.index)
+
+
+# ----------------------------------------------------------------------
+# Manifesto de papéis de colunas
+# ----------------------------------------------------------------------
+# Cada processador declara, para o seu dataset, os papéis que as páginas
+# consultam (ex.: "aposentado", "nota_evento") como
+#     {papel: (coluna_canonica, [(palavra, ...), ...])}
+# A coluna canônica é usada quando existe; senão, a primeira coluna cujo nome
+# (minúsculo, sem acento) contém todas as palavras de alguma alternativa. A
+# busca acontece uma vez, no processamento, e o resultado vai para
+# schema_manifest.json junto dos Parquets.
+
+SCHEMA_MANIFEST = "schema_manifest.json"
+
+PAPEIS_DADOS = {f.name: (f.name, []) for f in DADOS_SCHEMA}
+
+
+def _normalizar_nome(nome: str) -> str:
+    nome = unicodedata.normalize("NFKD", str(nome)).encode("ascii", "ignore").decode()
+    return nome.lower().strip()
+
+
+def resolve_roles(columns, spec: dict) -> dict:
+    """Resolve {papel: coluna} para as colunas de um DataFrame processado."""
+    columns = list(columns)
+    normalizadas = [_normalizar_nome(c) for c in columns]
+    roles = {}
+    for role, (canonica, alternativas) in spec.items():
+        if canonica in columns:
+            roles[role] = canonica
+            continue
+        for palavras in alternativas:
+            achou = next(
+                (c for c, n in zip(columns, normalizadas) if all(p in n for p in palavras)),
+                None,
+            )
+            if achou is not None:
+                roles[role] = achou
+                break
+    return roles
+
+
+def write_column_roles(processed_path, dataset: str, columns, spec: dict) -> dict:
+    """Registra colunas e papéis de ``dataset`` em schema_manifest.json."""
+    manifest_file = Path(processed_path) / SCHEMA_MANIFEST
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+
+    roles = resolve_roles(columns, spec)
+    manifest[dataset] = {"columns": [str(c) for c in columns], "roles": roles}
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return roles
+
+
+def read_column_roles(processed_path) -> dict:
+    """Lê schema_manifest.json ({dataset: {"columns": [...], "roles": {...}}})."""
+    try:
+        with open(Path(processed_path) / SCHEMA_MANIFEST, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,257 @@
+"""Publicação atômica e versionada dos arquivos processados.
+
+Cada execução do pipeline grava seus Parquets em um snapshot próprio
+(``.data/processed/snapshots/<id>/``) com um ``manifest.json``. Ao final, o
+ponteiro ``.data/processed/CURRENT`` é trocado atomicamente para o novo
+snapshot. Os loaders leem sempre através do ponteiro, então o dashboard nunca
+enxerga uma mistura de arquivos de execuções diferentes.
+
+Sem ponteiro (layout antigo), os arquivos são lidos direto de
+``.data/processed``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+try:
+    from src.data.arrow_cache import export_arrow
+except ImportError:
+    from data.arrow_cache import export_arrow
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOTS_DIR = "snapshots"
+CURRENT_POINTER = "CURRENT"
+MANIFEST_NAME = "manifest.json"
+# arquivos copiados do snapshot publicado (só durante o staging)
+COPIADOS_NAME = ".copiados.json"
+STAGING_PREFIX = ".staging-"
+DEFAULT_KEEP = 5
+
+
+def _snapshots_root(processed_path: Path) -> Path:
+    return Path(processed_path) / SNAPSHOTS_DIR
+
+
+def current_snapshot_id(processed_path: Path) -> Optional[str]:
+    """Retorna o id do snapshot publicado (ou None no layout antigo)."""
+    pointer = Path(processed_path) / CURRENT_POINTER
+    try:
+        snapshot_id = pointer.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    if snapshot_id and (_snapshots_root(processed_path) / snapshot_id).is_dir():
+        return snapshot_id
+    logger.warning(f"Ponteiro {pointer} aponta para snapshot inexistente: '{snapshot_id}'")
+    return None
+
+
+def snapshot_path(processed_path: Path, snapshot_id: Optional[str]) -> Path:
+    """Diretório de leitura para um snapshot (ou o layout antigo se None)."""
+    if snapshot_id is None:
+        return Path(processed_path)
+    return _snapshots_root(processed_path) / snapshot_id
+
+
+def resolve_processed_path(processed_path: Path) -> Path:
+    """Diretório com os Parquets atualmente publicados."""
+    return snapshot_path(processed_path, current_snapshot_id(processed_path))
+
+
+def list_snapshots(processed_path: Path) -> List[str]:
+    """Snapshots publicados, do mais antigo para o mais recente."""
+    root = _snapshots_root(processed_path)
+    if not root.exists():
+        return []
+    return sorted(
+        p.name for p in root.iterdir()
+        if p.is_dir() and not p.name.startswith(STAGING_PREFIX) and (p / MANIFEST_NAME).exists()
+    )
+
+
+def read_manifest(processed_path: Path, snapshot_id: Optional[str] = None) -> Optional[dict]:
+    """Lê o manifest de um snapshot (padrão: o publicado)."""
+    snapshot_id = snapshot_id or current_snapshot_id(processed_path)
+    if snapshot_id is None:
+        return None
+    manifest = snapshot_path(processed_path, snapshot_id) / MANIFEST_NAME
+    with open(manifest, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _new_snapshot_id() -> str:
+    return datetime.now().strftime("%Y%m%dT%H%M%S%f")
+
+
+def _sha256(filepath: Path) -> str:
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _describe_file(filepath: Path) -> dict:
+    info = {"bytes": filepath.stat().st_size, "sha256": _sha256(filepath)}
+    if filepath.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        meta = pq.read_metadata(filepath)
+        info["rows"] = meta.num_rows
+        info["columns"] = meta.schema.to_arrow_schema().names
+    return info
+
+
+def _write_atomic(target: Path, content: str):
+    tmp = target.with_name(f".{target.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, target)
+
+
+def _assinatura(filepath: Path) -> list:
+    """Tamanho e mtime: ``copy2`` preserva o mtime, um writer o altera."""
+    stat = filepath.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def begin_snapshot(processed_path: Path) -> Path:
+    """Cria o diretório de staging de uma nova execução.
+
+    O staging começa com uma cópia dos arquivos publicados, de modo que uma
+    execução parcial (ex.: só ``process_csv_to_parquet.py``) ainda publica um
+    conjunto completo. Quem reescreve uma tabela deve refazer também as que
+    dependem dela; as cópias que ninguém regravou saem em ``carried_over`` no
+    manifest.
+    """
+    processed_path = Path(processed_path)
+    root = _snapshots_root(processed_path)
+    root.mkdir(parents=True, exist_ok=True)
+
+    # Restos de execuções que falharam antes de publicar
+    for leftover in root.glob(f"{STAGING_PREFIX}*"):
+        shutil.rmtree(leftover, ignore_errors=True)
+
+    staging = root / f"{STAGING_PREFIX}{_new_snapshot_id()}"
+    staging.mkdir()
+
+    base = resolve_processed_path(processed_path)
+    copiados = {}
+    for src in [*base.glob("*.parquet"), *base.glob("*.json")]:
+        if src.name == MANIFEST_NAME:
+            continue
+        # cópia (e não hardlink): os writers sobrescrevem os arquivos no lugar
+        shutil.copy2(src, staging / src.name)
+        copiados[src.name] = _assinatura(staging / src.name)
+    _write_atomic(staging / COPIADOS_NAME, json.dumps(copiados))
+
+    logger.info(f"Snapshot em preparação: {staging}")
+    return staging
+
+
+def publish_snapshot(
+    processed_path: Path, staging: Path, keep: int = DEFAULT_KEEP, falhas: Optional[List[str]] = None,
+) -> str:
+    """Gera o cache Arrow, grava o manifest, promove o staging e troca o ponteiro CURRENT.
+
+    ``falhas`` lista os módulos que falharam numa publicação parcial; os
+    arquivos deles no snapshot são os da execução anterior.
+    """
+    processed_path = Path(processed_path)
+    staging = Path(staging)
+    snapshot_id = staging.name[len(STAGING_PREFIX):]
+
+    # Cópias do snapshot anterior que nenhum writer regravou
+    marcador = staging / COPIADOS_NAME
+    copiados = json.loads(marcador.read_text(encoding="utf-8")) if marcador.exists() else {}
+    marcador.unlink(missing_ok=True)
+    herdados = sorted(
+        nome for nome, assinatura in copiados.items()
+        if (staging / nome).exists() and _assinatura(staging / nome) == assinatura
+    )
+
+    # Cópias Arrow IPC para leitura via memory map pelos workers do dashboard
+    export_arrow(staging)
+
+    manifest = {
+        "snapshot_id": snapshot_id,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "previous": current_snapshot_id(processed_path),
+        "failed_modules": sorted(falhas or []),
+        "carried_over": herdados,
+        "files": {
+            p.name: _describe_file(p) for p in sorted(staging.iterdir()) if p.is_file()
+        },
+    }
+    _write_atomic(staging / MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    final = _snapshots_root(processed_path) / snapshot_id
+    os.replace(staging, final)
+    _write_atomic(processed_path / CURRENT_POINTER, snapshot_id + "\n")
+    logger.info(f"Snapshot publicado: {snapshot_id} ({len(manifest['files'])} arquivos)")
+
+    prune_snapshots(processed_path, keep=keep)
+    return snapshot_id
+
+
+def discard_snapshot(staging: Path):
+    """Remove um staging que não deve ser publicado."""
+    shutil.rmtree(staging, ignore_errors=True)
+    logger.warning(f"Snapshot descartado: {staging}")
+
+
+@contextmanager
+def snapshot_transaction(processed_path: Path, keep: int = DEFAULT_KEEP) -> Iterator[Path]:
+    """Contexto que entrega o diretório de staging e publica ao final.
+
+    Se o bloco levantar exceção, nada é publicado e o snapshot atual continua
+    valendo.
+    """
+    staging = begin_snapshot(processed_path)
+    try:
+        yield staging
+    except BaseException:
+        discard_snapshot(staging)
+        raise
+    publish_snapshot(processed_path, staging, keep=keep)
+
+
+def prune_snapshots(processed_path: Path, keep: int = DEFAULT_KEEP) -> List[str]:
+    """Mantém os ``keep`` snapshots mais recentes (e sempre o publicado)."""
+    snapshots = list_snapshots(processed_path)
+    current = current_snapshot_id(processed_path)
+    removidos = []
+    for snapshot_id in snapshots[:-keep] if keep > 0 else snapshots:
+        if snapshot_id == current:
+            continue
+        shutil.rmtree(snapshot_path(processed_path, snapshot_id), ignore_errors=True)
+        removidos.append(snapshot_id)
+    if removidos:
+        logger.info(f"Snapshots antigos removidos: {removidos}")
+    return removidos
+
+
+def rollback_snapshot(processed_path: Path, snapshot_id: Optional[str] = None) -> str:
+    """Aponta CURRENT para ``snapshot_id`` ou, por padrão, para o anterior ao publicado."""
+    processed_path = Path(processed_path)
+    snapshots = list_snapshots(processed_path)
+    if snapshot_id is None:
+        current = current_snapshot_id(processed_path)
+        anteriores = [s for s in snapshots if current is None or s < current]
+        if not anteriores:
+            raise ValueError("Nenhum snapshot anterior disponível para rollback.")
+        snapshot_id = anteriores[-1]
+    elif snapshot_id not in snapshots:
+        raise ValueError(f"Snapshot não encontrado: '{snapshot_id}'. Disponíveis: {snapshots}")
+
+    _write_atomic(processed_path / CURRENT_POINTER, snapshot_id + "\n")
+    logger.info(f"Rollback: CURRENT → {snapshot_id}")
+    return snapshot_id
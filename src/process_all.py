@@ -1,28 +1,78 @@
 from pathlib import Path
+import argparse
 import sys
 
 from process_csv_to_parquet import CapacitiaCSVProcessor
+from data.legado import ler_planilha_legada
+from data.snapshots import (
+    DEFAULT_KEEP, begin_snapshot, current_snapshot_id, discard_snapshot, list_snapshots, publish_snapshot,
+    rollback_snapshot,
+)
 from processors.processor_autonomiadigital_inscricoes import process_autonomiadigital_inscricoes
+from processors.processor_autonomiadigital_vinculo import process_autonomiadigital_vinculo
+from processors.processor_ministrantes import process_ministrantes
+from processors.processor_participacoes import process_participacoes
 from processors.processor_saude import process_saude
 from processors.processors_autonomiadigital_avaliacoes import process_autonomiadigital_avaliacoes
 
 
 RAW_PATH = Path(".data/raw")
 PROCESSED_PATH = Path(".data/processed")
+RELATORIO_PATH = Path("relatorio")
 
 
-def process_all():
+def process_all(keep: int = DEFAULT_KEEP, legado: dict = None, permitir_parcial: bool = False):
     print("=" * 60)
     print("Processando módulos do CapacitIA")
     print("=" * 60)
 
+    # Tudo é gravado num snapshot novo; o dashboard só passa a enxergá-lo
+    # quando o ponteiro CURRENT é trocado, na publicação.
+    staging = begin_snapshot(PROCESSED_PATH)
+    try:
+        erros = _process_modules(staging, legado)
+    except BaseException:
+        discard_snapshot(staging)
+        raise
+
+    # Um módulo que falhou deixaria no staging o arquivo da execução anterior:
+    # sem --permitir-parcial, nada é publicado
+    if erros and not permitir_parcial:
+        discard_snapshot(staging)
+        print("=" * 60)
+        print(f"Erros em: {', '.join(erros)} — nada publicado; "
+              f"CURRENT continua em {current_snapshot_id(PROCESSED_PATH)}")
+        print("Use --permitir-parcial para publicar mesmo assim.")
+        sys.exit(1)
+
+    publish_snapshot(PROCESSED_PATH, staging, keep=keep, falhas=erros)
+    print(f"Snapshot publicado: {current_snapshot_id(PROCESSED_PATH)}")
+    print("=" * 60)
+    if erros:
+        print(f"Publicado parcialmente; falharam: {', '.join(erros)} (ver manifest.json)")
+        sys.exit(1)
+    else:
+        print("Todos os módulos processados com sucesso.")
+
+
+def _process_modules(staging: Path, legado: dict = None) -> list:
     erros = []
 
-    processor = CapacitiaCSVProcessor()
-    processor.process_all()
+    processor = CapacitiaCSVProcessor(processed_path=staging)
+    processor.process_all(legado=legado)
+
+    try:
+        df = process_ministrantes(RELATORIO_PATH, staging)
+        print(f"  Colunas: {list(df.columns)}\n")
+    except FileNotFoundError as e:
+        print(f"[ministrantes] ✗ Arquivo não encontrado: {e}\n")
+        erros.append("ministrantes")
+    except Exception as e:
+        print(f"[ministrantes] ✗ Erro: {e}\n")
+        erros.append("ministrantes")
 
     try:
-        df = process_autonomiadigital_inscricoes(RAW_PATH, PROCESSED_PATH)
+        df = process_autonomiadigital_inscricoes(RAW_PATH, staging)
         print(f"  Colunas: {list(df.columns)}\n")
     except FileNotFoundError as e:
         print(f"[inscricoes] ✗ Arquivo não encontrado: {e}\n")
@@ -32,7 +82,7 @@ def process_all():
         erros.append("inscricoes")
 
     try:
-        df = process_autonomiadigital_avaliacoes(RAW_PATH, PROCESSED_PATH)
+        df = process_autonomiadigital_avaliacoes(RAW_PATH, staging)
         print(f"  Colunas: {list(df.columns)}\n")
     except FileNotFoundError as e:
         print(f"[avaliacoes] ✗ Arquivo não encontrado: {e}\n")
@@ -41,8 +91,19 @@ def process_all():
         print(f"[avaliacoes] ✗ Erro: {e}\n")
         erros.append("avaliacoes")
 
+    # Depende das inscrições e avaliações acima (junção pelo cpf_id)
+    try:
+        df = process_autonomiadigital_vinculo(staging)
+        print(f"  Colunas: {list(df.columns)}\n")
+    except FileNotFoundError as e:
+        print(f"[vinculo] ✗ Arquivo não encontrado: {e}\n")
+        erros.append("vinculo")
+    except Exception as e:
+        print(f"[vinculo] ✗ Erro: {e}\n")
+        erros.append("vinculo")
+
     try:
-        df = process_saude(RAW_PATH, PROCESSED_PATH)
+        df = process_saude(RAW_PATH, staging)
         print(f"  Colunas: {list(df.columns)}\n")
     except FileNotFoundError as e:
         print(f"[saude] ✗ Arquivo não encontrado: {e}\n")
@@ -51,16 +112,57 @@ def process_all():
         print(f"[saude] ✗ Erro: {e}\n")
         erros.append("saude")
 
-    print("=" * 60)
-    if erros:
-        print(f"Concluído com erros em: {', '.join(erros)}")
-        sys.exit(1)
-    else:
-        print("Todos os módulos processados com sucesso.")
+    # Depende dos Parquets acima (dados, saude, inscrições)
+    try:
+        df = process_participacoes(staging)
+        print(f"  Colunas: {list(df.columns)}\n")
+    except FileNotFoundError as e:
+        print(f"[participacoes] ✗ Arquivo não encontrado: {e}\n")
+        erros.append("participacoes")
+    except Exception as e:
+        print(f"[participacoes] ✗ Erro: {e}\n")
+        erros.append("participacoes")
+
+    return erros
 
 
 def main():
-    process_all()
+    parser = argparse.ArgumentParser(description="Processa todos os módulos do CapacitIA.")
+    parser.add_argument(
+        "--keep", type=int, default=DEFAULT_KEEP,
+        help=f"Quantidade de snapshots mantidos para rollback (padrão: {DEFAULT_KEEP})",
+    )
+    parser.add_argument(
+        "--rollback", nargs="?", const="", default=None, metavar="SNAPSHOT",
+        help="Volta o ponteiro CURRENT para o snapshot anterior (ou para o informado)",
+    )
+    parser.add_argument("--list", action="store_true", help="Lista os snapshots disponíveis")
+    parser.add_argument(
+        "--legado", type=Path, default=None, metavar="XLSX",
+        help="Planilha consolidada antiga (VISÃO ABERTA, SECRETARIAS-MASTERCLASS, CARGOS-INCRITOS)",
+    )
+    parser.add_argument("--ano-legado", type=int, default=None, help="Ano dos dados da planilha antiga")
+    parser.add_argument(
+        "--permitir-parcial", action="store_true",
+        help="Publica o snapshot mesmo com módulos com erro (registrados em manifest.json)",
+    )
+    args = parser.parse_args()
+    if args.legado is not None and args.ano_legado is None:
+        parser.error("--legado exige --ano-legado")
+
+    if args.list:
+        atual = current_snapshot_id(PROCESSED_PATH)
+        for snapshot_id in list_snapshots(PROCESSED_PATH):
+            print(f"{'*' if snapshot_id == atual else ' '} {snapshot_id}")
+        return
+
+    if args.rollback is not None:
+        snapshot_id = rollback_snapshot(PROCESSED_PATH, args.rollback or None)
+        print(f"CURRENT → {snapshot_id}")
+        return
+
+    legado = ler_planilha_legada(args.legado, args.ano_legado) if args.legado else None
+    process_all(keep=args.keep, legado=legado, permitir_parcial=args.permitir_parcial)
 
 if __name__ == "__main__":
     main()
@@ -10,14 +10,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+try:
+    from src.data.schema import DADOS_SCHEMA, PAPEIS_DADOS, enforce_dados_schema, evento_campos, parse_flag, write_column_roles
+    from src.data.cargos import build_cargos_eventos
+    from src.data.cubo import build_cubo
+    from src.data.jornadas import build_coortes, build_transicoes
+    from src.data.parquet_io import write_parquet
+    from src.data.participantes import build_participantes, carregar_chave, pseudonimizar
+    from src.data.rankings import build_rankings
+    from src.data.snapshots import snapshot_transaction
+    from src.processors.processor_ministrantes import process_ministrantes
+    from src.processors.processor_participacoes import process_participacoes
+except ImportError:
+    from data.schema import DADOS_SCHEMA, PAPEIS_DADOS, enforce_dados_schema, evento_campos, parse_flag, write_column_roles
+    from data.cargos import build_cargos_eventos
+    from data.cubo import build_cubo
+    from data.jornadas import build_coortes, build_transicoes
+    from data.parquet_io import write_parquet
+    from data.participantes import build_participantes, carregar_chave, pseudonimizar
+    from data.rankings import build_rankings
+    from data.snapshots import snapshot_transaction
+    from processors.processor_ministrantes import process_ministrantes
+    from processors.processor_participacoes import process_participacoes
+
+
+# Colunas Sim/Não do CSV (nomes antes do create_df_dados)
+FLAGS_CSV = ["orgao_externo", "certificado", "cargo_de_gestao", "servidor_do_estado"]
+
 
 class CapacitiaCSVProcessor:
 
-    def __init__(self, base_path: Path = None):
+    def __init__(self, base_path: Path = None, processed_path: Path = None):
         script_dir = Path(__file__).resolve().parent
         self.base_path = base_path or script_dir.parent
         self.raw_path = self.base_path / ".data" / "raw"
-        self.processed_path = self.base_path / ".data" / "processed"
+        # processed_path explícito = diretório de staging do snapshot em preparação
+        self.processed_path = processed_path or self.base_path / ".data" / "processed"
         self.processed_path.mkdir(parents=True, exist_ok=True)
 
     def load_csv_data(self) -> pd.DataFrame:
@@ -35,7 +63,16 @@ class CapacitiaCSVProcessor:
         logger.info(f"Separador detectado: '{sep}'")
 
         df = pd.read_csv(csv_file, sep=sep, dtype=str, encoding="utf-8", engine="python")
-        df = df.fillna("")
+        logger.info(f"CSV carregado com {len(df)} linhas e {len(df.columns)} colunas.")
+        return self.prepare_dataframe(df)
+
+    def prepare_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Normaliza colunas e unifica pares OUTROS de um DataFrame já carregado.
+
+        Recebe tanto o CSV lido em ``load_csv_data`` quanto o DataFrame
+        padronizado entregue em memória pelo ``preparar_dados.py --direto``.
+        """
+        df = df.fillna("").reset_index(drop=True)
 
         df.columns = (
             df.columns
@@ -52,7 +89,6 @@ class CapacitiaCSVProcessor:
             .str.replace("ú", "u")
         )
 
-        logger.info(f"CSV carregado com {len(df)} linhas e {len(df.columns)} colunas.")
         logger.info(f"Colunas detectadas: {list(df.columns)}")
 
         # --- Inferir ANO se não vier do CSV ---
@@ -108,6 +144,22 @@ class CapacitiaCSVProcessor:
         match = re.search(r"(202\d)", event_name)
         return match.group(1) if match else "2025"
 
+    def tipar_flags(self, df):
+        """Colunas Sim/Não → bool com o mesmo ``parse_flag`` de dados.parquet.
+
+        Todos os agregados contam a partir destas colunas, então "Nao",
+        "sim " etc. valem o mesmo em todas as tabelas do snapshot.
+        """
+        flags = [c for c in FLAGS_CSV if c in df.columns]
+        return df.assign(**{c: parse_flag(df[c]) for c in flags})
+
+    def pseudonimizar_participantes(self, df):
+        """Troca ``nome`` por ``participante_id`` (hash com chave, ver data/participantes.py)."""
+        logger.info("Pseudonimizando participantes...")
+        df = df.assign(participante_id=pseudonimizar(df["nome"], carregar_chave(self.base_path)))
+        logger.info(f"{df['participante_id'].nunique()} participantes distintos")
+        return df.drop(columns=["nome"])
+
     # ------------------------------------------------------------------
     # CRIAÇÃO DOS DataFrames
     # ------------------------------------------------------------------
@@ -121,30 +173,34 @@ class CapacitiaCSVProcessor:
         df_dados["formato"] = df["formato"]
         df_dados["eixo"] = df["eixo"]
         df_dados["local_realizacao"] = df["local_de_realizacao"]
-        df_dados["nome"] = df["nome"]
+        df_dados["participante_id"] = df["participante_id"]
         df_dados["cargo"] = df["cargo"]
         df_dados["orgao"] = df["orgao"]
         df_dados["vinculo"] = df["vinculo"]
         df_dados["certificado"] = df["certificado"]
         df_dados["cargo_gestao"] = df["cargo_de_gestao"]
         df_dados["servidor_estado"] = df["servidor_do_estado"]
-        return df_dados
+        # Ordinal, tipo canônico e rótulo curto do evento, calculados uma vez aqui
+        df_dados = df_dados.join(evento_campos(df_dados["evento"], df_dados["formato"]))
+        # Flags → bool, ano → int16, textos repetidos → categorias (ver DADOS_SCHEMA)
+        return enforce_dados_schema(df_dados)
 
     def create_df_visao(self, df):
         logger.info("Gerando visao_aberta...")
 
         visao = df.groupby(["ano", "evento"]).agg(   # ← NOVO: agrupa por ano + evento
-            n_inscritos=("nome", "count"),
-            n_certificados=("certificado", lambda x: (x == "Sim").sum())
+            n_inscritos=("participante_id", "size"),
+            n_certificados=("certificado", "sum")
         ).reset_index()
 
         base = df.drop_duplicates(subset=["evento"]).set_index("evento")
         visao["formato"] = visao["evento"].map(base["formato"])
         visao["eixo"] = visao["evento"].map(base["eixo"])
         visao["local_realizacao"] = visao["evento"].map(base["local_de_realizacao"])
+        visao = visao.join(evento_campos(visao["evento"], visao["formato"]))
 
-        visao = visao[["ano", "evento", "formato", "eixo", "local_realizacao",
-                        "n_inscritos", "n_certificados"]]
+        visao = visao[["ano", "evento", "evento_ordinal", "tipo", "evento_label", "formato", "eixo",
+                        "local_realizacao", "n_inscritos", "n_certificados"]]
         return visao
 
     def create_df_secretarias(self, df):
@@ -154,8 +210,8 @@ class CapacitiaCSVProcessor:
         df_filtrado = df[~filtro.str.lower().isin(["outro", "outros", ""])].copy()
 
         secret = df_filtrado.groupby(["ano", "orgao"]).agg(   # ← NOVO: por ano + órgão
-            n_inscritos=("nome", "count"),
-            n_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            n_inscritos=("participante_id", "size"),
+            n_certificados=("certificado", "sum"),
             n_turmas=("evento", "nunique"),
         ).reset_index()
 
@@ -172,18 +228,17 @@ class CapacitiaCSVProcessor:
                                          "n_certificados", "n_turmas", "taxa_certificacao",
                                          "formatos", "eixos"])
 
-        df_parceiros = df[df["orgao_externo"].astype(str).str.strip().str.upper() == "SIM"].copy()
+        df_parceiros = df[df["orgao_externo"]].copy()
 
         if len(df_parceiros) == 0:
-            valores_unicos = df["orgao_externo"].astype(str).str.strip().str.upper().unique()
-            logger.warning(f"Nenhum órgão parceiro encontrado. Valores únicos em 'orgao_externo': {valores_unicos}")
+            logger.warning("Nenhum órgão parceiro encontrado (nenhum 'Sim' em 'orgao_externo').")
             return pd.DataFrame(columns=["ano", "orgao_parceiro", "n_inscritos",
                                          "n_certificados", "n_turmas", "taxa_certificacao",
                                          "formatos", "eixos"])
 
         parceiros = df_parceiros.groupby(["ano", "orgao"]).agg(   # ← NOVO: por ano + órgão
-            n_inscritos=("nome", "count"),
-            n_certificados=("certificado", lambda x: (x.astype(str).str.strip().str.upper() == "SIM").sum()),
+            n_inscritos=("participante_id", "size"),
+            n_certificados=("certificado", "sum"),
             n_turmas=("evento", "nunique"),
             formatos=("formato", lambda x: ", ".join(x.unique().astype(str))),
             eixos=("eixo", lambda x: ", ".join(x.unique().astype(str))),
@@ -196,15 +251,20 @@ class CapacitiaCSVProcessor:
         parceiros = parceiros.sort_values(["ano", "n_inscritos"], ascending=[True, False])
         return parceiros
 
+    def create_df_cargos_eventos(self, df_dados):
+        """Inscritos por evento × cargo em formato longo (ver data/cargos.py)."""
+        logger.info("Gerando cargos_eventos...")
+        return build_cargos_eventos(df_dados)
+
     def create_df_cargos(self, df):
         logger.info("Gerando cargos...")
         filtro_cargo = df["cargo"].astype(str).str.strip().str.lower()
         df_cargos_base = df[~filtro_cargo.isin(["", "outro", "outros"])].copy()
 
         cargos = df_cargos_base.groupby(["ano", "cargo", "orgao"]).agg(   # ← NOVO: por ano
-            total_inscritos=("nome", "count"),
-            n_gestores=("cargo_de_gestao", lambda x: (x == "Sim").sum()),
-            n_servidores_estado=("servidor_do_estado", lambda x: (x == "Sim").sum()),
+            total_inscritos=("participante_id", "size"),
+            n_gestores=("cargo_de_gestao", "sum"),
+            n_servidores_estado=("servidor_do_estado", "sum"),
             n_turmas=("evento", "nunique"),
         ).reset_index()
 
@@ -216,25 +276,6 @@ class CapacitiaCSVProcessor:
         ).round(2)
         return cargos
 
-    def create_df_min(self, df):
-        logger.info("Gerando ministrantes (simulados)...")
-        eventos = df["evento"].unique()
-        registros = []
-        for ev in eventos:
-            ev_df = df[df["evento"] == ev]
-            registros.append({
-                "ano": ev_df["ano"].iloc[0] if "ano" in ev_df.columns else "2025",
-                "evento": ev,
-                "ministrante": f"Ministrante {ev[:20]}",
-                "carga_horaria": int(np.random.choice([4, 8, 16, 20, 40])),
-                "tipo_ministrante": np.random.choice(["Interno", "Externo", "Convidado"]),
-                "area_expertise": np.random.choice(["IA", "Gestao", "Tecnologia"]),
-                "total_participantes": ev_df.shape[0],
-                "eixo": ev_df["eixo"].iloc[0],
-                "local_realizacao": ev_df["local_de_realizacao"].iloc[0],
-            })
-        return pd.DataFrame(registros)
-
     def create_df_evolucao_anual(self, df):
         """
         NOVO: Cria DataFrame de evolução anual para a feature de linha do tempo.
@@ -245,11 +286,12 @@ class CapacitiaCSVProcessor:
         anos_disponiveis = sorted(df["ano"].unique())
 
         evolucao = df.groupby("ano").agg(
-            total_inscritos=("nome", "count"),
-            total_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            total_inscritos=("participante_id", "size"),
+            total_certificados=("certificado", "sum"),
             total_eventos=("evento", "nunique"),
             total_orgaos=("orgao", "nunique"),
-            total_gestores=("cargo_de_gestao", lambda x: (x == "Sim").sum()),
+            total_participantes=("participante_id", "nunique"),
+            total_gestores=("cargo_de_gestao", "sum"),
         ).reset_index()
 
         evolucao["taxa_certificacao"] = (
@@ -267,8 +309,8 @@ class CapacitiaCSVProcessor:
 
         # --- Evolução por formato/tipo ---
         evolucao_formato = df.groupby(["ano", "formato"]).agg(
-            n_inscritos=("nome", "count"),
-            n_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            n_inscritos=("participante_id", "size"),
+            n_certificados=("certificado", "sum"),
             n_eventos=("evento", "nunique"),
         ).reset_index()
         evolucao_formato["taxa_certificacao"] = (
@@ -279,8 +321,8 @@ class CapacitiaCSVProcessor:
         filtro = df["orgao"].astype(str).str.strip()
         df_org = df[~filtro.str.lower().isin(["outro", "outros", ""])].copy()
         evolucao_orgao = df_org.groupby(["ano", "orgao"]).agg(
-            n_inscritos=("nome", "count"),
-            n_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            n_inscritos=("participante_id", "size"),
+            n_certificados=("certificado", "sum"),
         ).reset_index()
         evolucao_orgao["taxa_certificacao"] = (
             evolucao_orgao["n_certificados"] / evolucao_orgao["n_inscritos"] * 100
@@ -290,14 +332,14 @@ class CapacitiaCSVProcessor:
         filtro_cargo = df["cargo"].astype(str).str.strip().str.lower()
         df_cargo = df[~filtro_cargo.isin(["", "outro", "outros"])].copy()
         evolucao_cargo = df_cargo.groupby(["ano", "cargo"]).agg(
-            n_inscritos=("nome", "count"),
-            n_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            n_inscritos=("participante_id", "size"),
+            n_certificados=("certificado", "sum"),
         ).reset_index()
 
         # --- Evolução por eixo ---
         evolucao_eixo = df.groupby(["ano", "eixo"]).agg(
-            n_inscritos=("nome", "count"),
-            n_certificados=("certificado", lambda x: (x == "Sim").sum()),
+            n_inscritos=("participante_id", "size"),
+            n_certificados=("certificado", "sum"),
         ).reset_index()
 
         return {
@@ -308,27 +350,66 @@ class CapacitiaCSVProcessor:
             "eixo": evolucao_eixo,
         }
 
-    def save_to_parquet(self, df, name):
+    @staticmethod
+    def _com_legado(df, legado, name):
+        """Acrescenta as linhas da planilha antiga de anos que o CSV não cobre."""
+        antigo = (legado or {}).get(name)
+        if antigo is None or antigo.empty:
+            return df
+        anos = set(df["ano"].astype(str))
+        antigo = antigo[~antigo["ano"].astype(str).isin(anos)]
+        logger.info(f"{name}: {len(antigo)} linhas da planilha antiga")
+        juntos = pd.concat([df, antigo], ignore_index=True)
+        # concat com colunas de texto desfaz as categorias
+        categorias = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+        return juntos.astype({c: "category" for c in categorias})
+
+    def save_to_parquet(self, df, name, schema=None):
         filepath = self.processed_path / f"{name}.parquet"
-        df.to_parquet(filepath, index=False)
+        write_parquet(df, filepath, schema=schema)
         logger.info(f"Arquivo salvo: {filepath}")
 
-    def process_all(self):
-        df = self.load_csv_data()
+    def process_all(self, df_raw: pd.DataFrame = None, legado: dict = None):
+        """Gera todos os Parquets; ``df_raw`` evita reler o CSV quando já está em memória.
+
+        ``legado`` ({parquet: DataFrame}, ver ``ler_planilha_legada``) traz as
+        abas da planilha antiga já no formato canônico.
+        """
+        df = self.load_csv_data() if df_raw is None else self.prepare_dataframe(df_raw)
+        df = self.pseudonimizar_participantes(df)
+        df = self.tipar_flags(df)
 
         df_dados = self.create_df_dados(df)
-        self.save_to_parquet(df_dados, "dados")
+        self.save_to_parquet(df_dados, "dados", schema=DADOS_SCHEMA)
+        write_column_roles(self.processed_path, "dados", df_dados.columns, PAPEIS_DADOS)
+        self.save_to_parquet(build_participantes(df_dados), "participantes")
+
+        # Coortes de retenção e transições entre anos/tipos (aba Jornadas da Evolução)
+        logger.info("Gerando jornadas dos participantes...")
+        self.save_to_parquet(build_coortes(df_dados), "coortes")
+        self.save_to_parquet(build_transicoes(df_dados), "transicoes")
 
-        df_visao = self.create_df_visao(df)
+        df_visao = self._com_legado(self.create_df_visao(df), legado, "visao_aberta")
         self.save_to_parquet(df_visao, "visao_aberta")
 
         df_cargos = self.create_df_cargos(df)
         self.save_to_parquet(df_cargos, "cargos")
 
-        df_min = self.create_df_min(df)
-        self.save_to_parquet(df_min, "ministrantes")
+        df_cargos_eventos = self._com_legado(self.create_df_cargos_eventos(df_dados), legado, "cargos_eventos")
+        self.save_to_parquet(df_cargos_eventos, "cargos_eventos")
+
+        # Top-N de órgãos e cargos por métrica, já ordenados por recorte
+        logger.info("Gerando rankings...")
+        self.save_to_parquet(build_rankings(df_dados), "rankings")
 
-        df_secretarias = self.create_df_secretarias(df)
+        # KPIs por célula de filtro, com bitsets de órgãos/eventos distintos
+        self.save_to_parquet(build_cubo(df_dados), "cubo_servidores")
+
+        # ministrantes.parquet vem da planilha de carga horária
+        # (processors/processor_ministrantes.py, executado pelo process_all.py
+        # ou por processar_dependentes)
+
+        df_secretarias = self._com_legado(self.create_df_secretarias(df), legado, "secretarias")
         self.save_to_parquet(df_secretarias, "secretarias")
 
         df_orgaos_parceiros = self.create_df_orgaos_parceiros(df)
@@ -345,9 +426,29 @@ class CapacitiaCSVProcessor:
         logger.info("Processamento concluído com sucesso!")
 
 
+def processar_dependentes(processed_path: Path, relatorio_path: Path):
+    """Refaz as tabelas de outros processadores que dependem de dados.parquet.
+
+    Para execuções que só regravam dados e seus agregados: o staging começa
+    com a cópia do snapshot publicado, e sem isto ministrantes e participações
+    da execução anterior sairiam junto com o dados novo. Sem a planilha de
+    ministrantes, as tabelas antigas são removidas em vez de publicadas.
+    """
+    try:
+        process_ministrantes(relatorio_path, processed_path)
+    except FileNotFoundError as e:
+        logger.warning(f"Ministrantes não refeitos ({e}); tabelas anteriores removidas do snapshot")
+        for nome in ("ministrantes", "ministrantes_turmas"):
+            (Path(processed_path) / f"{nome}.parquet").unlink(missing_ok=True)
+    process_participacoes(processed_path)
+
+
 def main():
-    processor = CapacitiaCSVProcessor()
-    processor.process_all()
+    base_path = Path(__file__).resolve().parent.parent
+    with snapshot_transaction(base_path / ".data" / "processed") as staging:
+        processor = CapacitiaCSVProcessor(base_path, processed_path=staging)
+        processor.process_all()
+        processar_dependentes(staging, base_path / "relatorio")
 
 if __name__ == "__main__":
     main()
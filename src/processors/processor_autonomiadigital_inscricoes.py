@@ -1,6 +1,17 @@
 from pathlib import Path
 import pandas as pd
 
+try:
+    from src.data.parquet_io import write_parquet
+    from src.data.participantes import carregar_chave, pseudonimizar_cpf
+    from src.data.schema import write_column_roles
+    from src.utils.helpers import parse_ptbr_series
+except ImportError:
+    from data.parquet_io import write_parquet
+    from data.participantes import carregar_chave, pseudonimizar_cpf
+    from data.schema import write_column_roles
+    from utils.helpers import parse_ptbr_series
+
 
 COLUNAS_INSCRICOES = {
     "Carimbo de data/hora": "data_inscricao",
@@ -13,12 +24,28 @@ COLUNAS_INSCRICOES = {
     "Dentre esses temas, qual(is) você tem mais dificuldade": "temas_dificuldade",
 }
 
-def process_autonomiadigital_inscricoes(raw_path: Path, processed_path: Path) -> pd.DataFrame:
+# Papéis consultados pelas páginas → schema_manifest.json (ver data/schema.py)
+PAPEIS_INSCRICOES = {
+    "data": ("data_inscricao", [("carimbo",), ("data",)]),
+    "ano": ("ano", []),
+    "mes": ("mes", []),
+    "genero": ("genero", [("genero",)]),
+    "idade": ("idade", [("idade",)]),
+    "cidade": ("cidade", [("cidade",)]),
+    "bairro": ("bairro", [("bairro",)]),
+    "aposentado": ("aposentado", [("aposentad",)]),
+    "projeto": ("projeto_extensao", [("projeto",)]),
+    "dificuldade": ("temas_dificuldade", [("dificuldade",)]),
+    "lgpd": ("lgpd", [("lgpd",), ("autorizo",)]),
+}
+
+def process_autonomiadigital_inscricoes(raw_path: Path, processed_path: Path, chave: bytes = None) -> pd.DataFrame:
     """
     Processa dados_inscricoes_capacitia_autonomiadigital.csv
     → autonomiadigital_inscricoes.parquet
 
-    Remove dados sensíveis (nome, CPF, telefone, e-mail).
+    Remove dados sensíveis (nome, CPF, telefone, e-mail); o CPF fica só como
+    ``cpf_id`` (hash com chave, ver data/participantes.py).
     Mantém informações demográficas e de participação.
     """
     csv_file = raw_path / "dados_inscricoes_capacitia_autonomiadigital.csv"
@@ -31,6 +58,10 @@ def process_autonomiadigital_inscricoes(raw_path: Path, processed_path: Path) ->
     for col in df.select_dtypes(include="object").columns:
         df[col] = df[col].str.strip()
 
+    # CPF → cpf_id (hash com chave) antes do descarte: junção inscrição → avaliação
+    if "CPF" in df.columns:
+        df["cpf_id"] = pseudonimizar_cpf(df["CPF"], chave or carregar_chave(raw_path.parent.parent))
+
     # Remover dados sensíveis antes de qualquer outra operação
     colunas_sensiveis = [
         "Digite seu nome sem abreviar",
@@ -50,10 +81,15 @@ def process_autonomiadigital_inscricoes(raw_path: Path, processed_path: Path) ->
     # Padronizar coluna de data (formato do Google Forms: MM/DD/YYYY HH:MM:SS)
     if "data_inscricao" in df.columns:
         df["data_inscricao"] = pd.to_datetime(df["data_inscricao"], format="%m/%d/%Y %H:%M:%S", errors="coerce")
+        df["ano"] = df["data_inscricao"].dt.year.astype("Int16")
+        df["mes"] = df["data_inscricao"].dt.month.astype("Int8")
 
     # Padronizar idade para numérico
     if "idade" in df.columns:
-        df["idade"] = pd.to_numeric(df["idade"], errors="coerce")
+        # "77 anos", "62anos " → 77, 62 (to_numeric devolvia NaN); datas e
+        # telefones digitados no campo ficam fora da faixa e viram NaN
+        idade = parse_ptbr_series(df["idade"])
+        df["idade"] = idade.where(idade.between(0, 120))
 
     # Padronizar coluna aposentado: Sim/Não → True/False
     if "aposentado" in df.columns:
@@ -62,7 +98,8 @@ def process_autonomiadigital_inscricoes(raw_path: Path, processed_path: Path) ->
     # Salvar
     processed_path.mkdir(parents=True, exist_ok=True)
     output = processed_path / "autonomiadigital_inscricoes.parquet"
-    df.to_parquet(output, index=False)
+    write_parquet(df, output)
+    write_column_roles(processed_path, "autonomiadigital_inscricoes", df.columns, PAPEIS_INSCRICOES)
     print(f"[inscricoes] ✓ {len(df)} registros → {output}")
     return df
 
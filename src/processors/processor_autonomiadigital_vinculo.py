@@ -0,0 +1,69 @@
+from pathlib import Path
+import pandas as pd
+
+try:
+    from src.data.parquet_io import write_parquet
+    from src.utils.helpers import faixa_etaria
+except ImportError:
+    from data.parquet_io import write_parquet
+    from utils.helpers import faixa_etaria
+
+
+COLUNAS_INSCRITO = ["cpf_id", "ano", "mes", "projeto_extensao", "genero", "idade", "aposentado"]
+
+
+def process_autonomiadigital_vinculo(processed_path: Path) -> pd.DataFrame:
+    """
+    Liga inscrições e avaliações de Autonomia Digital pelo ``cpf_id``
+    → autonomiadigital_vinculo.parquet
+
+    Uma linha por pessoa (``cpf_id``) × projeto: inscrições repetidas do
+    mesmo CPF no mesmo projeto ficam só na mais recente, para que as taxas
+    contem pessoas e não cadastros. Cada linha traz ``avaliou``, notas,
+    respostas ``aprendeu_*`` e ``n_aprendizados`` da avaliação da mesma pessoa
+    (a mais recente, se houver mais de uma). Uma única junção por hash sobre
+    inteiros; inscrições sem CPF válido ficam com ``avaliou`` nulo (não dá para
+    ligar). Uma pessoa em dois projetos aparece nos dois; taxas que não são por
+    projeto devem contar ``cpf_id`` distintos. Usa os Parquets já gravados em
+    processed_path.
+    """
+    inscricoes = pd.read_parquet(processed_path / "autonomiadigital_inscricoes.parquet")
+    avaliacoes = pd.read_parquet(processed_path / "autonomiadigital_avaliacoes.parquet")
+    if "cpf_id" not in inscricoes.columns or "cpf_id" not in avaliacoes.columns:
+        raise ValueError("inscrições/avaliações sem cpf_id — reprocesse os CSVs com a coluna CPF")
+
+    # Notas e aprendizados vêm do mapeamento de colunas do processador de avaliações
+    respostas = [c for c in avaliacoes.columns if c.startswith(("nota_", "aprendeu_"))]
+    aprendizados = [c for c in respostas if c.startswith("aprendeu_")]
+    avaliacoes = avaliacoes[avaliacoes["cpf_id"].notna()]
+    if "data_avaliacao" in avaliacoes.columns:
+        avaliacoes = avaliacoes.sort_values("data_avaliacao", kind="stable")
+    avaliacoes = avaliacoes.drop_duplicates("cpf_id", keep="last")[["cpf_id", *respostas]]
+
+    fato = inscricoes[[c for c in COLUNAS_INSCRITO if c in inscricoes.columns]]
+    ordem = [c for c in ("ano", "mes") if c in fato.columns]
+    if ordem:
+        fato = fato.sort_values(ordem, kind="stable")
+    chave = [c for c in ("cpf_id", "projeto_extensao") if c in fato.columns]
+    repetida = fato.duplicated(chave, keep="last") & fato["cpf_id"].notna()
+    fato = fato[~repetida].sort_index()
+    fato = fato.merge(avaliacoes, on="cpf_id", how="left", indicator="_origem")
+    avaliou = fato.pop("_origem").eq("both")
+    fato["avaliou"] = pd.array(avaliou, dtype="boolean")
+    fato.loc[fato["cpf_id"].isna(), "avaliou"] = pd.NA
+    fato["n_aprendizados"] = (fato[aprendizados] == True).sum(axis=1).where(avaliou).astype("Int8")
+    for col in aprendizados:
+        fato[col] = fato[col].astype("boolean")
+    if "idade" in fato.columns:
+        fato["faixa_etaria"] = faixa_etaria(fato["idade"])
+
+    pessoas = fato.loc[fato["cpf_id"].notna()].drop_duplicates("cpf_id")
+    sem_inscricao = (~avaliacoes["cpf_id"].isin(inscricoes["cpf_id"])).sum()
+    print(f"[vinculo] {int(repetida.sum())} inscrições repetidas (mesmo CPF e projeto) descartadas")
+    print(f"[vinculo] {int(pessoas['avaliou'].sum())} de {len(pessoas)} pessoas inscritas avaliaram; "
+          f"{int(sem_inscricao)} avaliações sem inscrição correspondente")
+
+    output = processed_path / "autonomiadigital_vinculo.parquet"
+    write_parquet(fato, output)
+    print(f"[vinculo] ✓ {len(fato)} registros → {output}")
+    return fato
@@ -0,0 +1,166 @@
+from pathlib import Path
+import re
+import pandas as pd
+
+try:
+    from src.data.parquet_io import write_parquet
+    from src.data.schema import write_column_roles
+except ImportError:
+    from data.parquet_io import write_parquet
+    from data.schema import write_column_roles
+
+ARQUIVO_PADRAO = "*ministrante*carga*horaria*.csv"
+
+# Papéis consultados pelas páginas → schema_manifest.json (ver data/schema.py)
+PAPEIS_MINISTRANTES = {
+    "ministrante": ("ministrante", []),
+    "carga_horaria": ("carga_horaria_total", [("carga_horaria",)]),
+}
+
+# "1º Curso: ...", "4° Curso: ...", "10ª MasterClass ..." → 1, 4, 10
+ORDINAL_EVENTO_RE = r"^\s*(\d+)\s*[ºª°]"
+
+
+def _ler_matriz(csv_file: Path) -> tuple:
+    """Localiza ano e cabeçalho da planilha larga Ministrantes × Turma."""
+    bruto = pd.read_csv(csv_file, header=None, dtype=str, encoding="utf-8").fillna("")
+    primeira = bruto.iloc[:, 0].str.strip()
+
+    ano = primeira.str.extract(r"TURMAS\s+(\d{4})", flags=re.IGNORECASE)[0].dropna()
+    if ano.empty:
+        ano = pd.Series(re.findall(r"(\d{4})", csv_file.name))
+    if ano.empty:
+        raise ValueError(f"Ano não encontrado em {csv_file.name}")
+
+    cabecalho = primeira.str.upper().eq("MINISTRANTES")
+    if not cabecalho.any():
+        raise ValueError(f"Linha 'Ministrantes' não encontrada em {csv_file.name}")
+    i = cabecalho.idxmax()
+
+    df = bruto.iloc[i + 1:].copy()
+    df.columns = bruto.iloc[i].str.strip()
+    df = df.loc[:, df.columns != ""]
+    return int(ano.iloc[0]), df
+
+
+def _horas(series: pd.Series) -> pd.Series:
+    """'4', '4h', '4,5' → 4.0, 4.0, 4.5; vazio → NaN."""
+    numero = series.str.replace(",", ".", regex=False).str.extract(r"(\d+(?:\.\d+)?)")[0]
+    return pd.to_numeric(numero, errors="coerce")
+
+
+def _eventos(processed_path: Path) -> pd.DataFrame:
+    """Um registro por evento de dados.parquet, com o número da turma."""
+    dados_file = processed_path / "dados.parquet"
+    if not dados_file.exists():
+        return pd.DataFrame(columns=["ano", "turma"])
+
+    dados = pd.read_parquet(
+        dados_file, columns=["ano", "evento", "formato", "eixo", "local_realizacao", "certificado"]
+    )
+    eventos = (
+        dados.groupby(["ano", "evento"], observed=True)
+        .agg(
+            formato=("formato", "first"),
+            eixo=("eixo", "first"),
+            local_realizacao=("local_realizacao", "first"),
+            participantes=("certificado", "size"),
+            certificados=("certificado", "sum"),
+        )
+        .reset_index()
+    )
+    eventos["ano"] = eventos["ano"].astype(int)
+    eventos["evento"] = eventos["evento"].astype(str)
+    eventos["turma"] = pd.to_numeric(
+        eventos["evento"].str.extract(ORDINAL_EVENTO_RE)[0], errors="coerce"
+    ).astype("Int64")
+    eventos = eventos.dropna(subset=["turma"])
+
+    # Se Masterclass e Curso dividem o mesmo número no ano, a turma é o Curso
+    eventos["_prioridade"] = eventos["formato"].astype(str).str.upper().ne("CURSO")
+    eventos = (
+        eventos.sort_values(["ano", "turma", "_prioridade"])
+        .drop_duplicates(["ano", "turma"])
+        .drop(columns="_prioridade")
+    )
+    return eventos
+
+
+def process_ministrantes(raw_path: Path, processed_path: Path) -> pd.DataFrame:
+    """
+    Processa AAAA_ministrantecarga_horaria.csv (matriz Ministrantes × Turma)
+    → ministrantes_turmas.parquet (uma linha por ministrante e turma)
+    → ministrantes.parquet (carga horária agregada por ministrante)
+
+    Cada "Turma N" é ligada ao N-ésimo evento do ano em dados.parquet, que
+    precisa já estar em processed_path.
+    """
+    arquivos = sorted(raw_path.glob(ARQUIVO_PADRAO))
+    if not arquivos:
+        raise FileNotFoundError(raw_path / ARQUIVO_PADRAO)
+
+    longos, totais = [], []
+    for csv_file in arquivos:
+        print(f"[ministrantes] Lendo {csv_file}...")
+        ano, df = _ler_matriz(csv_file)
+
+        df = df.rename(columns={df.columns[0]: "ministrante"})
+        df["ministrante"] = df["ministrante"].str.strip()
+        df = df[df["ministrante"].ne("") & ~df["ministrante"].str.upper().str.startswith("TOTAL")]
+
+        col_total = next((c for c in df.columns if c.upper().startswith("TOTAL")), None)
+        if col_total:
+            totais.append(pd.DataFrame({
+                "ano": ano,
+                "ministrante": df["ministrante"],
+                "carga_horaria_total": _horas(df[col_total]),
+            }))
+
+        turmas = [c for c in df.columns if re.match(r"(?i)^turma\s+\d+$", c)]
+        longo = df.melt(id_vars="ministrante", value_vars=turmas, var_name="turma", value_name="carga_horaria")
+        longo["turma"] = longo["turma"].str.extract(r"(\d+)")[0].astype(int)
+        longo["carga_horaria"] = _horas(longo["carga_horaria"])
+        longo = longo[longo["carga_horaria"] > 0]
+        longo.insert(0, "ano", ano)
+        longos.append(longo)
+
+    df_turmas = pd.concat(longos, ignore_index=True)
+    df_turmas["turma"] = df_turmas["turma"].astype("Int64")
+    df_turmas = df_turmas.merge(_eventos(processed_path), on=["ano", "turma"], how="left")
+    for col in ("participantes", "certificados"):
+        if col in df_turmas.columns:
+            df_turmas[col] = df_turmas[col].astype("Int64")
+
+    sem_evento = df_turmas.loc[df_turmas["evento"].isna(), "turma"].unique()
+    if len(sem_evento):
+        print(f"[ministrantes] ⚠️  Turmas sem evento correspondente: {sorted(sem_evento.tolist())}")
+
+    df_min = (
+        df_turmas.groupby(["ano", "ministrante"])
+        .agg(
+            turmas=("turma", "nunique"),
+            eventos=("evento", "nunique"),
+            carga_horaria_turmas=("carga_horaria", "sum"),
+            total_participantes=("participantes", "sum"),
+        )
+        .reset_index()
+    )
+    if totais:
+        # TOTAL C/H da planilha inclui horas não distribuídas por turma
+        df_min = pd.concat(totais, ignore_index=True).merge(df_min, on=["ano", "ministrante"], how="left")
+        df_min[["turmas", "eventos"]] = df_min[["turmas", "eventos"]].fillna(0).astype(int)
+        df_min[["carga_horaria_turmas", "total_participantes"]] = (
+            df_min[["carga_horaria_turmas", "total_participantes"]].fillna(0)
+        )
+    else:
+        df_min["carga_horaria_total"] = df_min["carga_horaria_turmas"]
+    df_min["total_participantes"] = df_min["total_participantes"].astype(int)
+
+    # Salvar
+    processed_path.mkdir(parents=True, exist_ok=True)
+    write_parquet(df_turmas, processed_path / "ministrantes_turmas.parquet")
+    output = processed_path / "ministrantes.parquet"
+    write_parquet(df_min, output)
+    write_column_roles(processed_path, "ministrantes", df_min.columns, PAPEIS_MINISTRANTES)
+    print(f"[ministrantes] ✓ {len(df_min)} ministrantes, {len(df_turmas)} turmas → {output}")
+    return df_min
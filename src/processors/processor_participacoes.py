@@ -0,0 +1,129 @@
+from pathlib import Path
+from typing import Optional
+import pandas as pd
+
+try:
+    from src.data.parquet_io import write_parquet
+    from src.data.schema import write_column_roles
+    from src.processors.processor_saude import parse_periodo, periodo_valido
+except ImportError:
+    from data.parquet_io import write_parquet
+    from data.schema import write_column_roles
+    from processors.processor_saude import parse_periodo, periodo_valido
+
+MODULOS = ["servidores", "saude", "autonomia_digital"]
+
+COLUNAS_PARTICIPACOES = ["modulo", "ano", "mes", "evento", "certificado", "orgao", "genero", "idade"]
+
+# Papéis consultados pelas páginas → schema_manifest.json (ver data/schema.py)
+PAPEIS_PARTICIPACOES = {c: (c, []) for c in COLUNAS_PARTICIPACOES}
+
+
+# Tipos finais de cada parte antes do concat: partes sem a coluna (ex.:
+# certificado em saúde) entram com nulos já tipados, não como object
+TIPOS_PARTE = {
+    "ano": "Int16", "mes": "Int8", "evento": "string", "certificado": "boolean",
+    "orgao": "string", "genero": "string", "idade": "Int16",
+}
+
+
+def _ler(processed_path: Path, nome: str) -> pd.DataFrame:
+    arquivo = processed_path / f"{nome}.parquet"
+    if not arquivo.exists():
+        print(f"[participacoes] ⚠️  {arquivo.name} ausente — módulo ignorado")
+        return None
+    return pd.read_parquet(arquivo)
+
+
+def _fato(df: pd.DataFrame, modulo: str, **colunas) -> pd.DataFrame:
+    """Monta as colunas da tabela fato a partir de ``colunas`` (nome → Series)."""
+    fato = pd.DataFrame(index=df.index)
+    fato["modulo"] = modulo
+    for col in COLUNAS_PARTICIPACOES[1:]:
+        tipo = TIPOS_PARTE[col]
+        valores = colunas.get(col)
+        if valores is None:
+            fato[col] = pd.Series(pd.NA, index=df.index, dtype=tipo)
+        elif tipo.startswith("Int"):
+            fato[col] = pd.to_numeric(valores, errors="coerce").round().astype(tipo)
+        else:
+            fato[col] = valores.astype(tipo)
+    return fato
+
+
+def build_participacoes(
+    dados: Optional[pd.DataFrame],
+    saude: Optional[pd.DataFrame],
+    inscricoes: Optional[pd.DataFrame],
+) -> pd.DataFrame:
+    """Tabela fato de participações a partir dos frames dos módulos (None = módulo ausente).
+
+    Aceita também os Parquets de snapshots antigos: ano/mês de saúde vêm do
+    período em ``data`` e os de inscrições de ``data_inscricao``.
+    """
+    partes = []
+
+    if dados is not None:
+        partes.append(_fato(
+            dados, "servidores",
+            ano=dados["ano"], evento=dados["evento"].astype(str),
+            certificado=dados["certificado"], orgao=dados["orgao"].astype(str),
+        ))
+
+    if saude is not None:
+        if "ano" not in saude.columns and "data" in saude.columns:
+            periodo = periodo_valido(parse_periodo(saude["data"]), saude.get("lote"))
+            saude = saude.assign(ano=periodo["ano"], mes=periodo["mes"])
+        partes.append(_fato(
+            saude, "saude",
+            ano=saude.get("ano"), mes=saude.get("mes"), evento=saude.get("lote"),
+        ))
+
+    if inscricoes is not None:
+        if "ano" not in inscricoes.columns and "data_inscricao" in inscricoes.columns:
+            data = pd.to_datetime(inscricoes["data_inscricao"], errors="coerce")
+            inscricoes = inscricoes.assign(ano=data.dt.year, mes=data.dt.month)
+        partes.append(_fato(
+            inscricoes, "autonomia_digital",
+            ano=inscricoes.get("ano"), mes=inscricoes.get("mes"), evento=inscricoes.get("projeto_extensao"),
+            genero=inscricoes.get("genero"), idade=inscricoes.get("idade"),
+        ))
+
+    if not partes:
+        raise FileNotFoundError("Nenhum módulo disponível para montar participacoes")
+
+    df = pd.concat(partes, ignore_index=True)
+    for col in ("evento", "orgao", "genero"):
+        df[col] = df[col].str.strip().replace("", pd.NA)
+
+    return df.astype({
+        "modulo": pd.CategoricalDtype(MODULOS),
+        "evento": "category",
+        "orgao": "category",
+        "genero": "category",
+    })
+
+
+def process_participacoes(processed_path: Path) -> pd.DataFrame:
+    """
+    Une servidores (dados), saúde e inscrições de Autonomia Digital
+    → participacoes.parquet
+
+    Tabela fato estreita, uma linha por participação:
+    modulo, ano, mes, evento (evento / lote / projeto), certificado
+    (só servidores), orgao, genero, idade. Usa os Parquets já gravados em
+    processed_path.
+    """
+    df = build_participacoes(
+        _ler(processed_path, "dados"),
+        _ler(processed_path, "saude"),
+        _ler(processed_path, "autonomiadigital_inscricoes"),
+    )
+
+    # Salvar
+    processed_path.mkdir(parents=True, exist_ok=True)
+    output = processed_path / "participacoes.parquet"
+    write_parquet(df, output)
+    write_column_roles(processed_path, "participacoes", df.columns, PAPEIS_PARTICIPACOES)
+    print(f"[participacoes] ✓ {len(df)} registros → {output}")
+    return df
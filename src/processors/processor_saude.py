@@ -1,12 +1,79 @@
 from pathlib import Path
 import pandas as pd
 
+try:
+    from src.data.parquet_io import write_parquet
+    from src.data.schema import write_column_roles
+except ImportError:
+    from data.parquet_io import write_parquet
+    from data.schema import write_column_roles
+
 COLUNAS_SAUDE = {
     "Nº ": "numero",
     "Data": "data",
     "Lote": "lote",
 }
 
+# Papéis consultados pelas páginas → schema_manifest.json (ver data/schema.py)
+PAPEIS_SAUDE = {
+    "numero": ("numero", []),
+    "data": ("data", [("data",)]),
+    "lote": ("lote", [("lote",)]),
+    "ano": ("ano", []),
+    "mes": ("mes", []),
+}
+
+MESES = {
+    "janeiro": 1, "fevereiro": 2, "março": 3, "marco": 3, "abril": 4, "maio": 5, "junho": 6,
+    "julho": 7, "agosto": 8, "setembro": 9, "outubro": 10, "novembro": 11, "dezembro": 12,
+}
+
+
+def parse_periodo(datas: pd.Series) -> pd.DataFrame:
+    """Extrai ano e mês (de início) de períodos em texto.
+
+    "19, 20, 23, 26 e 27 de maio de 2025" → ano 2025, mes 5
+    "datas 28, 29, 30 e 31 julho de 2025" → ano 2025, mes 7
+    Datas no formato dd/mm/aaaa também são aceitas.
+    """
+    texto = datas.astype(str).str.lower()
+    ano = pd.to_numeric(texto.str.extract(r"\b((?:19|20)\d{2})\b")[0], errors="coerce")
+    mes = texto.str.extract(r"\b(" + "|".join(MESES) + r")\b")[0].map(MESES)
+
+    datas_numericas = pd.to_datetime(
+        texto.str.extract(r"(\d{1,2}/\d{1,2}/\d{4})")[0], format="%d/%m/%Y", errors="coerce"
+    )
+    ano = ano.fillna(datas_numericas.dt.year)
+    mes = pd.to_numeric(mes, errors="coerce").fillna(datas_numericas.dt.month)
+    return pd.DataFrame({"ano": ano.astype("Int16"), "mes": mes.astype("Int8")}, index=datas.index)
+
+def _ano_referencia(anos: pd.Series):
+    """Ano mais frequente do lote; no empate, o da primeira linha."""
+    anos = anos.dropna()
+    if anos.empty:
+        return pd.NA
+    contagem = anos.map(anos.value_counts())
+    return anos[contagem == contagem.max()].iloc[0]
+
+
+def periodo_valido(periodo: pd.DataFrame, lote: pd.Series = None) -> pd.DataFrame:
+    """Anula ano e mês das linhas cujo ano destoa do restante do lote.
+
+    A planilha tem datas arrastadas ("... de maio de 2025", "... de 2026", ...),
+    uma linha por ano até 2045; o ano real é o que se repete no lote (ou o
+    primeiro, se todos aparecem uma vez só).
+    """
+    if lote is None:
+        return periodo
+    ano = periodo["ano"]
+    referencia = ano.groupby(lote, dropna=False).transform(_ano_referencia)
+    divergente = (ano.notna() & referencia.notna() & (ano != referencia)).fillna(False).astype(bool)
+    if divergente.any():
+        print(f"[saude] ⚠️  Ano/mês descartados em {int(divergente.sum())} registros "
+              "com ano diferente do restante do lote")
+    return periodo.mask(divergente, axis=0)
+
+
 def process_saude(raw_path: Path, processed_path: Path) -> pd.DataFrame:
     """
     Processa dados_capacitia_saude.csv
@@ -45,10 +112,19 @@ def process_saude(raw_path: Path, processed_path: Path) -> pd.DataFrame:
     if "lote" in df.columns:
         df["lote"] = df["lote"].str.strip()
 
+    # Ano/mês tipados a partir do período descritivo
+    if "data" in df.columns:
+        periodo = parse_periodo(df["data"])
+        sem_ano = int(periodo["ano"].isna().sum())
+        if sem_ano:
+            print(f"[saude] ⚠️  {sem_ano} registros sem ano reconhecido em 'data'")
+        df[["ano", "mes"]] = periodo_valido(periodo, df["lote"] if "lote" in df.columns else None)
+
     # Salvar
     processed_path.mkdir(parents=True, exist_ok=True)
     output = processed_path / "saude.parquet"
-    df.to_parquet(output, index=False)
+    write_parquet(df, output)
+    write_column_roles(processed_path, "saude", df.columns, PAPEIS_SAUDE)
     print(f"[saude] ✓ {len(df)} registros → {output}")
     return df
 
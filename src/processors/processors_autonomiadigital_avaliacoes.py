@@ -1,6 +1,19 @@
 from pathlib import Path
 import pandas as pd
 
+try:
+    from src.data.parquet_io import write_parquet
+    from src.data.participantes import carregar_chave, pseudonimizar_cpf
+    from src.data.pesquisa import ROTULOS_ITENS, build_cruzamentos, itens_pesquisa, respostas_longas
+    from src.data.schema import write_column_roles
+    from src.utils.helpers import parse_ptbr_series
+except ImportError:
+    from data.parquet_io import write_parquet
+    from data.participantes import carregar_chave, pseudonimizar_cpf
+    from data.pesquisa import ROTULOS_ITENS, build_cruzamentos, itens_pesquisa, respostas_longas
+    from data.schema import write_column_roles
+    from utils.helpers import parse_ptbr_series
+
 
 COLUNAS_AVALIACOES = {
     "Carimbo de data/hora": "data_avaliacao",
@@ -21,15 +34,36 @@ COLUNAS_AVALIACOES = {
     "Deixe uma sugestão, elogio ou reclamação.": "sugestao",
 }
 
+# Papéis consultados pelas páginas → schema_manifest.json (ver data/schema.py)
+PAPEIS_AVALIACOES = {
+    "data": ("data_avaliacao", [("carimbo",), ("data",)]),
+    "ano": ("ano", []),
+    "mes": ("mes", []),
+    "genero": ("genero", [("genero",)]),
+    "idade": ("idade", [("idade",)]),
+    "nota_evento": ("nota_evento", [("avalia", "esse evento")]),
+    "nota_conteudo": ("nota_conteudo", [("conteudo",)]),
+    "nota_local": ("nota_local", [("local",)]),
+    "nota_atendimento": ("nota_atendimento", [("atendimento",), ("acolhimento",)]),
+    "sugestao": ("sugestao", [("sugest",), ("elogio",), ("reclama",)]),
+    "extras": ("aprendizado_extra", [("registrar",), ("a mais",)]),
+    "aprendeu_celular_basico": ("aprendeu_celular_basico", [("funcoes", "celular")]),
+    "aprendeu_email": ("aprendeu_email", [("aprendeu", "e-mail"), ("aprendeu", "email")]),
+    "aprendeu_seguranca": ("aprendeu_seguranca", [("confiaveis",), ("golpes",)]),
+    "aprendeu_ia": ("aprendeu_ia", [("inteligencia artificial",)]),
+    "aprendeu_govpi": ("aprendeu_govpi", [("gov.pi",), ("gov", "cidad")]),
+    "aprendeu_saude_digital": ("aprendeu_saude_digital", [("saude digital",)]),
+    "aprendeu_bo_facil": ("aprendeu_bo_facil", [("bo facil",)]),
+}
 
 
-
-def process_autonomiadigital_avaliacoes(raw_path: Path, processed_path: Path) -> pd.DataFrame:
+def process_autonomiadigital_avaliacoes(raw_path: Path, processed_path: Path, chave: bytes = None) -> pd.DataFrame:
     """
     Processa dados_avaliacoes_capacitia_autonomiadigital.csv
     → autonomiadigital_avaliacoes.parquet
 
-    Remove dados sensíveis (nome, CPF, e-mail).
+    Remove dados sensíveis (nome, CPF, e-mail); o CPF fica só como ``cpf_id``
+    (hash com chave, ver data/participantes.py).
     Mantém avaliações, notas e dados demográficos.
     """
     csv_file = raw_path / "dados_avaliacoes_capacitia_autonomiadigital.csv"
@@ -42,6 +76,10 @@ def process_autonomiadigital_avaliacoes(raw_path: Path, processed_path: Path) ->
     for col in df.select_dtypes(include="object").columns:
         df[col] = df[col].str.strip()
 
+    # CPF → cpf_id (hash com chave) antes do descarte: junção inscrição → avaliação
+    if "CPF" in df.columns:
+        df["cpf_id"] = pseudonimizar_cpf(df["CPF"], chave or carregar_chave(raw_path.parent.parent))
+
     # Remover dados sensíveis
     colunas_sensiveis = [
         "Digite seu nome sem abreviar",
@@ -57,30 +95,37 @@ def process_autonomiadigital_avaliacoes(raw_path: Path, processed_path: Path) ->
     # Padronizar data (formato do Google Forms: MM/DD/YYYY HH:MM:SS)
     if "data_avaliacao" in df.columns:
         df["data_avaliacao"] = pd.to_datetime(df["data_avaliacao"], format="%m/%d/%Y %H:%M:%S", errors="coerce")
+        df["ano"] = df["data_avaliacao"].dt.year.astype("Int16")
+        df["mes"] = df["data_avaliacao"].dt.month.astype("Int8")
 
     # Padronizar idade
     if "idade" in df.columns:
-        df["idade"] = pd.to_numeric(df["idade"], errors="coerce")
-
-    # Padronizar notas para numérico (1-5)
-    colunas_nota = ["nota_evento", "nota_conteudo", "nota_local", "nota_atendimento"]
-    for col in colunas_nota:
-        if col in df.columns:
+        # "77 anos", "62anos " → 77, 62 (to_numeric devolvia NaN); datas e
+        # telefones digitados no campo ficam fora da faixa e viram NaN
+        idade = parse_ptbr_series(df["idade"])
+        df["idade"] = idade.where(idade.between(0, 120))
+
+    # Itens da pesquisa saem do mapeamento: nota_* → numérico (1-5),
+    # aprendeu_* → Sim/Não → True/False
+    itens = itens_pesquisa(df.columns, ROTULOS_ITENS)
+    for col, (tipo, _) in itens.items():
+        if tipo == "nota":
             df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # Padronizar colunas de aprendizado (Sim/Não → True/False)
-    colunas_aprendizado = [
-        "aprendeu_celular_basico", "aprendeu_email", "aprendeu_seguranca",
-        "aprendeu_ia", "aprendeu_govpi", "aprendeu_saude_digital", "aprendeu_bo_facil",
-    ]
-    for col in colunas_aprendizado:
-        if col in df.columns:
+        else:
             df[col] = df[col].str.lower().map({"sim": True, "não": False, "nao": False})
 
     # Salvar
     processed_path.mkdir(parents=True, exist_ok=True)
     output = processed_path / "autonomiadigital_avaliacoes.parquet"
-    df.to_parquet(output, index=False)
+    write_parquet(df, output)
+    write_column_roles(processed_path, "autonomiadigital_avaliacoes", df.columns, PAPEIS_AVALIACOES)
     print(f"[avaliacoes] ✓ {len(df)} registros → {output}")
+
+    # Pesquisa em formato longo + cruzamentos item × gênero × faixa etária × ano
+    longo = respostas_longas(df, ROTULOS_ITENS)
+    write_parquet(longo, processed_path / "autonomiadigital_pesquisa.parquet")
+    cruzamentos = build_cruzamentos(longo)
+    write_parquet(cruzamentos, processed_path / "autonomiadigital_pesquisa_cruzamentos.parquet")
+    print(f"[avaliacoes] ✓ {len(itens)} itens, {len(cruzamentos)} cruzamentos → autonomiadigital_pesquisa*.parquet")
     return df
 
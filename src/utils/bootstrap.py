@@ -0,0 +1,51 @@
+"""Inicialização comum de ``app.py`` e das páginas.
+
+CSS (arquivos de ``styles/`` + CSS dos componentes) e tema Plotly são
+montados uma vez por processo; em cada rerun a página emite um único
+``<style>``. O tema só é importado por páginas com gráficos, então a Home
+não carrega o Plotly.
+"""
+
+from pathlib import Path
+from typing import Sequence
+
+import streamlit as st
+
+from src.components.kpi_cards import KPI_CARD_CSS
+from src.components.module_cards import MODULE_CARD_CSS
+
+STYLES_DIR = Path("styles")
+
+
+@st.cache_resource(show_spinner=False)
+def _css(arquivos: tuple) -> str:
+    partes = []
+    for nome in arquivos:
+        try:
+            partes.append((STYLES_DIR / nome).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+    # CSS dos cards: uma vez por página, não um <style> por card
+    partes += [KPI_CARD_CSS, MODULE_CARD_CSS]
+    return "\n".join(partes)
+
+
+def iniciar_pagina(
+    page_title: str,
+    page_icon: str,
+    css: Sequence[str] = ("main.css",),
+    initial_sidebar_state: str = "collapsed",
+    tema: bool = True,
+) -> None:
+    """``set_page_config`` + tema Plotly (se ``tema``) + CSS em cache."""
+    st.set_page_config(
+        page_title=page_title,
+        page_icon=page_icon,
+        layout="wide",
+        initial_sidebar_state=initial_sidebar_state,
+    )
+    if tema:
+        from src.utils.theme import registrar_tema
+
+        registrar_tema()
+    st.markdown(f"<style>{_css(tuple(css))}</style>", unsafe_allow_html=True)
@@ -0,0 +1,66 @@
+"""Cache de figuras Plotly serializadas, compartilhado entre sessões.
+
+A chave é (id do gráfico, filtros, versão dos dados) e o valor é o JSON da
+figura já estilizada. Em um rerun com os mesmos filtros a página reidrata o
+JSON em vez de refazer ``px.*`` + ``style_fig``. Um novo snapshot publicado
+muda a versão, então figuras antigas nunca são reusadas; elas saem pela
+política LRU (no máximo ``MAX_FIGURAS`` por processo).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Sequence
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from src.data.loaders import current_data_version
+
+MAX_FIGURAS = 256
+
+_figuras: "OrderedDict[tuple, str]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _congelar(valor) -> Hashable:
+    """Listas/conjuntos de multiselects viram tuplas (chave hashable)."""
+    if isinstance(valor, (set, frozenset)):
+        return tuple(sorted(valor, key=str))
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def figura(
+    chart_id: str,
+    filtros: Sequence,
+    construir: Callable[[], Optional[go.Figure]],
+) -> Optional[go.Figure]:
+    """Figura de ``chart_id`` para ``filtros``; ``construir`` só roda em cache miss.
+
+    ``filtros`` deve conter tudo o que muda a figura além dos dados (seleções
+    de filtros, top-N, modo do gráfico). ``construir`` pode devolver None
+    (sem dados); nesse caso nada é guardado.
+    """
+    chave = (chart_id, _congelar(filtros), current_data_version())
+    with _lock:
+        spec = _figuras.get(chave)
+        if spec is not None:
+            _figuras.move_to_end(chave)
+    if spec is not None:
+        return pio.from_json(spec, skip_invalid=True)
+
+    fig = construir()
+    if fig is None:
+        return None
+    with _lock:
+        _figuras[chave] = fig.to_json()
+        _figuras.move_to_end(chave)
+        while len(_figuras) > MAX_FIGURAS:
+            _figuras.popitem(last=False)
+    return fig
+
+
+def limpar_figuras() -> None:
+    with _lock:
+        _figuras.clear()
@@ -2,9 +2,21 @@
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import unicodedata
 import re
 
+# Tudo que não é dígito, vírgula, ponto ou sinal (R$, %, espaços, NBSP...)
+_NAO_NUMERICO = r"[^0-9,.\-]"
+# "1.000", "12.345.678": ponto como separador de milhar, sem vírgula
+_SO_MILHAR = r"^-?\d{1,3}(\.\d{3})+$"
+_NUMERO = r"^-?\d+(\.\d+)?$"
+_ROTULOS_VAZIOS = ["", "nan", "none", "nat"]
+
+# Faixas etárias do público de Autonomia Digital (majoritariamente 60+)
+FAIXAS_ETARIAS = [(0, 59, "Até 59"), (60, 64, "60–64"), (65, 69, "65–69"), (70, 74, "70–74"), (75, 120, "75+")]
+
 def fmt_int_br(n: int) -> str:
     """Formata número inteiro no padrão brasileiro."""
     return str(f"{int(n):,}").replace(",", ".")
@@ -25,83 +37,76 @@ def _normalize_org(s: str) -> str:
     s = re.sub(r"\s+", " ", s).strip().upper()
     return s
 
+def _unicos_texto(valores: pd.Series):
+    """Códigos de ``pd.factorize`` + valores únicos como array Arrow de texto.
+
+    As operações de texto rodam só nos únicos (colunas de planilha repetem
+    muito) e voltam para as linhas por indexação; código -1 = ausente.
+    """
+    codigos, unicos = pd.factorize(valores)
+    unicos = np.asarray(unicos, dtype=object)
+    try:
+        texto = pa.array(unicos, type=pa.string())
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # Excel mistura números e textos na mesma coluna
+        texto = pa.array([str(v) for v in unicos], type=pa.string())
+    return codigos, texto
+
+def parse_ptbr_series(valores: pd.Series) -> pd.Series:
+    """Coluna inteira de números pt-BR → float ("1.234,56", "R$ 10", "12,5", NBSP).
+
+    Vírgula = decimal; ponto = milhar quando há vírgula ou só grupos de três
+    dígitos ("1.000"); caso contrário é decimal ("1.5"). Inválidos → NaN.
+    """
+    if pd.api.types.is_numeric_dtype(valores) and not pd.api.types.is_bool_dtype(valores):
+        return valores.astype(float)
+    codigos, texto = _unicos_texto(valores)
+    texto = pc.replace_substring_regex(texto, _NAO_NUMERICO, "")
+    ptbr = pc.or_(pc.match_substring(texto, ","), pc.match_substring_regex(texto, _SO_MILHAR))
+    decimal_ponto = pc.replace_substring(pc.replace_substring(texto, ".", ""), ",", ".")
+    texto = pc.if_else(ptbr, decimal_ponto, texto)
+    texto = pc.if_else(pc.match_substring_regex(texto, _NUMERO), texto, pa.scalar(None, pa.string()))
+    numeros = pc.cast(texto, pa.float64()).to_numpy(zero_copy_only=False)
+    # NaN no fim: código -1 (ausente) cai nele
+    return pd.Series(np.append(numeros, np.nan)[codigos], index=valores.index, name=valores.name)
+
+def empty_labels_mask(valores: pd.Series) -> np.ndarray:
+    """True onde o rótulo é vazio, ausente ou "nan"/"none"/"nat" (vetorizado)."""
+    codigos, texto = _unicos_texto(valores)
+    normal = pc.utf8_lower(pc.utf8_trim_whitespace(texto))
+    vazio = pc.is_in(normal, value_set=pa.array(_ROTULOS_VAZIOS)).to_numpy(zero_copy_only=False)
+    return np.append(vazio, True)[codigos]
+
+def faixa_etaria(idade: pd.Series) -> pd.Series:
+    """Idade → faixa de FAIXAS_ETARIAS (categoria ordenada); ausentes ficam nulos."""
+    limites = [FAIXAS_ETARIAS[0][0] - 1] + [fim for _, fim, _ in FAIXAS_ETARIAS]
+    rotulos = [rotulo for _, _, rotulo in FAIXAS_ETARIAS]
+    return pd.cut(pd.to_numeric(idade, errors="coerce"), bins=limites, labels=rotulos)
+
 def drop_empty_labels(df: pd.DataFrame, col: str):
     """Remove linhas com labels vazios ou inválidos."""
-    s = df[col].astype(str)
-    mask = s.str.strip().ne("") & ~s.str.lower().isin(["nan", "none", "nat"])
-    return df.loc[mask].copy()
+    return df.loc[~empty_labels_mask(df[col])]
 
 def nz(df: pd.DataFrame, required_cols):
-    """Remove linhas com NaN/±inf nas colunas exigidas."""
-    clean = df.replace([np.inf, -np.inf], pd.NA)
-    return clean.dropna(subset=required_cols)
-
-def _parse_ptbr_number(x):
-    """Parse número no formato brasileiro (1.234,56)."""
-    if x is None or (isinstance(x, float) and pd.isna(x)):
-        return np.nan
-    s = str(x).strip()
-    s = s.replace("\xa0", " ").replace(" ", "")
-    s = re.sub(r"[^\d,.\-]", "", s)
-    if re.match(r"^-?\d{1,3}(\.\d{3})*(,\d+)?$", s):
-        s = s.replace(".", "").replace(",", ".")
-    try:
-        return float(s)
-    except:
-        return np.nan
-
-def _find_header_row(df: pd.DataFrame) -> int:
-    """Encontra a linha de cabeçalho em DataFrame de secretarias."""
-    for i in range(min(15, len(df))):
-        row_txt = " ".join([str(v).upper() for v in df.iloc[i].tolist()])
-        if "SECRETARIA/ÓRGÃO" in row_txt and "INSCRITOS" in row_txt:
-            return i
-    return 0
+    """Remove linhas com NaN/±inf nas colunas exigidas (só elas são lidas)."""
+    ok = np.ones(len(df), dtype=bool)
+    for col in required_cols:
+        valores = df[col]
+        ok &= valores.notna().to_numpy()
+        if pd.api.types.is_float_dtype(valores):
+            ok &= ~np.isinf(valores.to_numpy(dtype=float, na_value=np.nan))
+    return df.loc[ok]
 
 def clean_secretarias(df_secretarias_raw: pd.DataFrame) -> pd.DataFrame:
-    """Limpa e padroniza DataFrame de secretarias."""
-    df = df_secretarias_raw.copy()
-    
-    # Verifica se já está no formato padronizado (Parquet)
-    if 'secretaria_orgao' in df.columns:
-        df = df.rename(columns={
-            'secretaria_orgao': 'SECRETARIA/ÓRGÃO',
-            'n_inscritos': 'Nº INSCRITOS',
-            'n_certificados': 'Nº CERTIFICADOS',
-            'n_evasao': 'Nº EVASÃO'
-        })
-        return df[["SECRETARIA/ÓRGÃO","Nº INSCRITOS","Nº CERTIFICADOS","Nº EVASÃO"] if "Nº EVASÃO" in df.columns else ["SECRETARIA/ÓRGÃO","Nº INSCRITOS","Nº CERTIFICADOS"]]
-    
-    # Formato original do Excel
-    hdr = _find_header_row(df)
-    df = df.iloc[hdr:].reset_index(drop=True)
-    df.columns = df.iloc[0]
-    df = df.iloc[1:].copy()
-
-    mask_meta = df.astype(str).apply(
-        lambda s: s.str.upper().str.contains("ATIVIDADE/EVENTO|TOTAL GERAL|^TOTAL$", na=False)
-    ).any(axis=1)
-    df = df[~mask_meta].dropna(how="all").copy()
-
-    col_ins = _col_like(df, "INSCRIT") or "Nº INSCRITOS"
-    col_cer = _col_like(df, "CERTIFIC") or "Nº CERTIFICADOS"
-    col_eva = _col_like(df, "EVAS") or "Nº EVASÃO"
-    for col in [col_ins, col_cer, col_eva]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-    org_cols = [c for c in df.columns if "SECRETARIA" in str(c).upper() or "ÓRGÃO" in str(c).upper()]
-    if not org_cols:
-        nome_org_col = df.columns[0]
-    else:
-        nome_org_col = org_cols[0]
-    df[nome_org_col] = df[nome_org_col].astype(str).str.strip()
-
-    df = df.rename(columns={
-        nome_org_col: "SECRETARIA/ÓRGÃO",
-        col_ins: "Nº INSCRITOS",
-        col_cer: "Nº CERTIFICADOS",
-        col_eva: "Nº EVASÃO"
-    })
-    return df[["SECRETARIA/ÓRGÃO","Nº INSCRITOS","Nº CERTIFICADOS","Nº EVASÃO"] if "Nº EVASÃO" in df.columns else ["SECRETARIA/ÓRGÃO","Nº INSCRITOS","Nº CERTIFICADOS"]]
+    """Renomeia secretarias.parquet para os rótulos exibidos nas páginas.
 
+    A planilha antiga (cabeçalho deslocado, linhas TOTAL GERAL, números pt-BR)
+    é normalizada na ingestão por ``src/data/legado.py``.
+    """
+    df = df_secretarias_raw.rename(columns={
+        'secretaria_orgao': 'SECRETARIA/ÓRGÃO',
+        'n_inscritos': 'Nº INSCRITOS',
+        'n_certificados': 'Nº CERTIFICADOS',
+        'n_evasao': 'Nº EVASÃO'
+    })
+    return df[["SECRETARIA/ÓRGÃO","Nº INSCRITOS","Nº CERTIFICADOS","Nº EVASÃO"]]
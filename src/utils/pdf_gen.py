@@ -207,7 +207,7 @@ def gerar_relatorio_capacitia(df_dados, df_visao, df_secretarias, df_cargos, df_
         
         # Calcular KPIs principais
         total_participantes = len(df_dados)
-        total_certificados = (df_dados['certificado'] == 'Sim').sum() if 'certificado' in df_dados.columns else 0
+        total_certificados = int(df_dados['certificado'].sum()) if 'certificado' in df_dados.columns else 0
         taxa_certificacao = (total_certificados / total_participantes * 100) if total_participantes > 0 else 0
         total_eventos = len(df_visao) if df_visao is not None else 0
         total_secretarias = df_dados['orgao'].nunique() if 'orgao' in df_dados.columns else 0
@@ -336,10 +336,10 @@ def gerar_relatorio_capacitia(df_dados, df_visao, df_secretarias, df_cargos, df_
         
         if 'orgao' in df_dados.columns:
             # Preparar dados para treemap
-            secretarias_data = df_dados.groupby('orgao').agg({
-                'orgao': 'count',
-                'certificado': lambda x: (x == 'Sim').sum()
-            }).rename(columns={'orgao': 'Participantes', 'certificado': 'Certificados'})
+            secretarias_data = df_dados.groupby('orgao', observed=True).agg(
+                Participantes=('certificado', 'size'),
+                Certificados=('certificado', 'sum'),
+            )
             secretarias_data['Taxa_Cert'] = (secretarias_data['Certificados'] / 
                                              secretarias_data['Participantes'] * 100).round(1)
             secretarias_data = secretarias_data.sort_values('Participantes', ascending=False).head(20)
@@ -545,10 +545,10 @@ def gerar_relatorio_capacitia(df_dados, df_visao, df_secretarias, df_cargos, df_
             elementos.append(Paragraph("<b>6.1. Distribuição Detalhada por Formato</b>", body_style))
             elementos.append(Spacer(1, 0.1*inch))
             
-            formato_stats = df_dados.groupby('formato').agg({
-                'nome': 'count',
-                'certificado': lambda x: (x == 'Sim').sum()
-            }).rename(columns={'nome': 'Total', 'certificado': 'Certificados'})
+            formato_stats = df_dados.groupby('formato', observed=True).agg({
+                'participante_id': 'size',
+                'certificado': 'sum'
+            }).rename(columns={'participante_id': 'Total', 'certificado': 'Certificados'})
             formato_stats['Taxa_Cert'] = (formato_stats['Certificados'] / formato_stats['Total'] * 100).round(1)
             formato_stats = formato_stats.reset_index()
             
@@ -613,10 +613,10 @@ def gerar_relatorio_capacitia(df_dados, df_visao, df_secretarias, df_cargos, df_
             elementos.append(Paragraph("<b>6.3. Análise por Local de Realização</b>", body_style))
             elementos.append(Spacer(1, 0.1*inch))
             
-            local_stats = df_dados.groupby('local_realizacao').agg({
-                'nome': 'count',
-                'certificado': lambda x: (x == 'Sim').sum()
-            }).rename(columns={'nome': 'Total', 'certificado': 'Certificados'})
+            local_stats = df_dados.groupby('local_realizacao', observed=True).agg({
+                'participante_id': 'size',
+                'certificado': 'sum'
+            }).rename(columns={'participante_id': 'Total', 'certificado': 'Certificados'})
             local_stats = local_stats.sort_values('Total', ascending=False).head(10).reset_index()
             
             local_table_data = [['Local de Realização', 'Total', 'Certificados']]
@@ -0,0 +1,34 @@
+"""Tema Plotly do CapacitIA (registrado uma vez por processo)."""
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+TEMPLATE = "capacit_dark"
+FONTE = "Inter, Segoe UI, Roboto, Arial"
+COLORWAY = ["#7DD3FC", "#34D399", "#FBBF24", "#F472B6", "#60A5FA", "#A78BFA", "#F87171"]
+
+
+def registrar_tema() -> None:
+    """Registra ``capacit_dark`` e o torna padrão; nos reruns é só um lookup."""
+    if TEMPLATE not in pio.templates:
+        # Cópia: alterar pio.templates["plotly_dark"] mudaria o tema original
+        template = go.layout.Template(pio.templates["plotly_dark"])
+        template.layout.font.family = FONTE
+        template.layout.colorway = COLORWAY
+        template.layout.paper_bgcolor = "#0f1220"
+        template.layout.plot_bgcolor = "#11142a"
+        template.layout.hoverlabel = dict(bgcolor="#0f1220", font_size=12, font_family=FONTE)
+        pio.templates[TEMPLATE] = template
+    pio.templates.default = TEMPLATE
+
+
+def style_fig(fig, height=420):
+    """Layout padrão dos gráficos das páginas."""
+    fig.update_layout(
+        height=height,
+        margin=dict(l=10, r=10, t=50, b=10),
+        xaxis_title=None,
+        yaxis_title=None,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
+    )
+    return fig
@@ -4,9 +4,11 @@
 import pandas as pd
 from pathlib import Path
 
+from data.snapshots import resolve_processed_path
+
 def main():
     base_path = Path.cwd()
-    processed_path = base_path / ".data" / "processed"
+    processed_path = resolve_processed_path(base_path / ".data" / "processed")
     raw_path = base_path / ".data" / "raw"
     
     print("=" * 80)
@@ -70,7 +72,8 @@ def main():
     
     colunas_sensiveis_avaliacoes = ['nome', 'cpf', 'email', 'genero', 'idade', 'digite seu nome']
     colunas_presentes_sensiveis = [col for col in colunas_sensiveis_avaliacoes 
-                                   if any(col in str(col_df).lower() for col_df in df_avaliacoes.columns)]
+                                   if any(col in str(col_df).lower() for col_df in df_avaliacoes.columns
+                                          if not str(col_df).endswith('_id'))]  # cpf_id = hash
     if colunas_presentes_sensiveis:
         print(f"[ATENCAO] Colunas sensiveis ainda presentes: {colunas_presentes_sensiveis}")
     else:
@@ -87,7 +90,8 @@ def main():
     
     colunas_sensiveis_inscricoes = ['nome', 'cpf', 'email', 'telefone', 'cidade', 'bairro', 'genero', 'idade']
     colunas_presentes_sensiveis = [col for col in colunas_sensiveis_inscricoes 
-                                   if any(col in str(col_df).lower() for col_df in df_inscricoes.columns)]
+                                   if any(col in str(col_df).lower() for col_df in df_inscricoes.columns
+                                          if not str(col_df).endswith('_id'))]  # cpf_id = hash
     if colunas_presentes_sensiveis:
         print(f"[ATENCAO] Colunas sensiveis ainda presentes: {colunas_presentes_sensiveis}")
     else: